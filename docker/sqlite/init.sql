@@ -39,6 +39,35 @@ CREATE TABLE IF NOT EXISTS chunk (
 CREATE INDEX IF NOT EXISTS idx_document_id ON chunk(document_id);
 CREATE INDEX IF NOT EXISTS idx_has_embedding ON chunk(has_embedding);
 
+-- Document Fingerprint Table
+CREATE TABLE IF NOT EXISTS document_fingerprints (
+    document_id INTEGER PRIMARY KEY,
+    content_hash VARCHAR(64) NOT NULL,
+    chunk_params VARCHAR(100),
+    embedding_model VARCHAR(500),
+    chunk_fingerprint VARCHAR(64),
+    embedding_fingerprint VARCHAR(64),
+    l1_fingerprint VARCHAR(64),
+    update_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (document_id) REFERENCES document(id)
+);
+
+-- Training Step Queue Table
+CREATE TABLE IF NOT EXISTS train_step_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    model_name VARCHAR(200) NOT NULL,
+    step VARCHAR(100) NOT NULL,
+    status VARCHAR(50) NOT NULL DEFAULT 'pending',  -- pending, in_progress, completed, failed, suspended
+    depends_on TEXT NOT NULL DEFAULT '[]',  -- JSON array of step names
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker VARCHAR(200),
+    error TEXT,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    update_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (model_name, step)
+);
+
 -- L1 Version Table
 CREATE TABLE IF NOT EXISTS l1_versions (
     version INTEGER PRIMARY KEY,
@@ -70,6 +99,8 @@ CREATE TABLE IF NOT EXISTS l1_shades (
     content_third_view TEXT,
     desc_second_view TEXT,
     content_second_view TEXT,
+    embedding TEXT,  -- JSON data stored as TEXT
+    embedding_model VARCHAR(500),  -- "endpoint|model name" the embedding was computed with
     create_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (version) REFERENCES l1_versions(version)
 );
@@ -81,6 +112,7 @@ CREATE TABLE IF NOT EXISTS l1_clusters (
     cluster_id VARCHAR(100),
     memory_ids TEXT,  -- JSON data stored as TEXT
     cluster_center TEXT,  -- JSON data stored as TEXT
+    shade TEXT,  -- JSON data stored as TEXT, the cluster's shade before merging
     create_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (version) REFERENCES l1_versions(version)
 );
@@ -201,6 +233,12 @@ CREATE TABLE IF NOT EXISTS user_llm_configs (
 -- User LLM Configuration table indexes
 CREATE INDEX IF NOT EXISTS idx_user_llm_configs_created_at ON user_llm_configs(created_at);
 
+-- Configuration change counters, bumped with every write of a configuration
+CREATE TABLE IF NOT EXISTS config_versions (
+    name VARCHAR(100) PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
 -- Spaces Table
 CREATE TABLE IF NOT EXISTS spaces (
     id VARCHAR(255) PRIMARY KEY,
@@ -6,7 +6,7 @@ import os
 import time
 import traceback
 
-from openai import OpenAI
+from lpm_kernel.common.http_client import GENERATOR_POOL, OpenAIClientRegistry
 import tiktoken
 
 from lpm_kernel.api.services.user_llm_config_service import UserLLMConfigService
@@ -61,9 +61,10 @@ class L0Generator:
             self.client = None
             self.model_name = None
         else:
-            self.client = OpenAI(
+            self.client = OpenAIClientRegistry.get_instance().get(
                 api_key=self.user_llm_config.chat_api_key,
                 base_url=self.user_llm_config.chat_endpoint,
+                pool=GENERATOR_POOL,
             )
             self.model_name = self.user_llm_config.chat_model_name
         
@@ -437,9 +438,10 @@ class L0Generator:
 
             if self.model_name is None:
                 self.user_llm_config = self.user_llm_config_service.get_available_llm()
-                self.client = OpenAI(
+                self.client = OpenAIClientRegistry.get_instance().get(
                     api_key=self.user_llm_config.chat_api_key,
                     base_url=self.user_llm_config.chat_endpoint,
+                    pool=GENERATOR_POOL,
                 )
                 self.model_name = self.user_llm_config.chat_model_name
 
@@ -765,9 +767,10 @@ class L0Generator:
             )
             if self.model_name is None:
                 self.user_llm_config = self.user_llm_config_service.get_available_llm()
-                self.client = OpenAI(
+                self.client = OpenAIClientRegistry.get_instance().get(
                     api_key=self.user_llm_config.chat_api_key,
                     base_url=self.user_llm_config.chat_endpoint,
+                    pool=GENERATOR_POOL,
                 )
                 self.model_name = self.user_llm_config.chat_model_name
 
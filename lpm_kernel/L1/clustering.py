@@ -0,0 +1,308 @@
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+from scipy.cluster.hierarchy import linkage
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import breadth_first_order, connected_components
+from scipy.spatial.distance import cdist
+from sklearn.cluster import MiniBatchKMeans
+
+from lpm_kernel.L1.bio import Chunk, Cluster, Memory, Note
+
+
+# Above this many points a single complete linkage needs several GB for its distance matrix
+EXACT_LINKAGE_MAX_POINTS = 20000
+
+
+def stack_embeddings(embeddings: List[np.ndarray], dtype=np.float64) -> np.ndarray:
+    """
+    Stacks embedding vectors into one contiguous matrix.
+
+    Args:
+        embeddings: List of 1-D embedding vectors of equal dimension.
+        dtype: Element type of the matrix, float64 by default.
+
+    Returns:
+        np.ndarray: C-contiguous matrix with one row per embedding.
+    """
+    # vstack writes straight into a new array of the requested type
+    return np.vstack(embeddings, dtype=dtype)
+
+
+def group_note_chunks(notes_list: List[Note]) -> List[Chunk]:
+    """
+    Lists the chunks with embedding of every note, ordered by note.
+
+    Chunks are grouped by document id in one pass, so the cost is linear in the
+    number of chunks instead of scanning all chunks once per note.
+
+    Args:
+        notes_list: Notes whose chunks are collected.
+
+    Returns:
+        List[Chunk]: Chunks whose document id matches a note, in note order.
+    """
+    chunks_by_note_id = defaultdict(list)
+    for note in notes_list:
+        for chunk in note.chunks:
+            if chunk.embedding is not None:
+                chunks_by_note_id[chunk.document_id].append(chunk)
+
+    clean_chunks = []
+    for note in notes_list:
+        clean_chunks.extend(chunks_by_note_id.get(note.id, []))
+    return clean_chunks
+
+
+def pairwise_within_distance(matrix: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Marks every pair of rows whose Euclidean distance is below a threshold.
+
+    Distances come from one matrix product (|a|^2 + |b|^2 - 2ab). Pairs whose rounded
+    distance is too close to the threshold to be decided reliably are recomputed
+    exactly, so the result matches comparing np.linalg.norm(a - b) pair by pair.
+
+    Args:
+        matrix: Matrix with one vector per row.
+        threshold: Distance below which two rows are connected.
+
+    Returns:
+        np.ndarray: Symmetric N x N boolean matrix.
+    """
+    squared_norms = np.einsum("ij,ij->i", matrix, matrix)
+    scale = squared_norms[:, None] + squared_norms[None, :]
+    squared_distances = scale - 2.0 * (matrix @ matrix.T)
+    np.maximum(squared_distances, 0.0, out=squared_distances)
+
+    squared_threshold = threshold * threshold
+    within = squared_distances < squared_threshold
+    uncertain = np.abs(squared_distances - squared_threshold) <= 1e-9 * (scale + 1.0)
+    for i, j in zip(*np.nonzero(uncertain)):
+        within[i, j] = np.linalg.norm(matrix[i] - matrix[j]) < threshold
+    return within
+
+
+def connected_component_indices(adjacency: np.ndarray) -> List[List[int]]:
+    """
+    Finds connected components of a symmetric boolean adjacency matrix.
+
+    Components are ordered by their smallest index and their members are listed in
+    breadth-first order starting from it, visiting neighbors by increasing index.
+
+    Args:
+        adjacency: Symmetric N x N boolean adjacency matrix.
+
+    Returns:
+        List[List[int]]: Node indices of each connected component.
+    """
+    graph = csr_matrix(adjacency)
+    graph.sort_indices()
+    component_n, labels = connected_components(graph, directed=False)
+
+    # np.unique returns the first occurrence, i.e. the smallest index of each label
+    _, first_indices = np.unique(labels, return_index=True)
+    components = []
+    for start in sorted(first_indices.tolist()):
+        order = breadth_first_order(graph, start, directed=True, return_predecessors=False)
+        components.append(order.tolist())
+    return components
+
+
+def assign_memories_to_clusters(
+    cluster_list: List[Cluster],
+    memory_list: List[Memory],
+    outlier_cutoff_distance: float,
+) -> Tuple[Set, List[Memory]]:
+    """
+    Adds each memory to its nearest cluster, or marks it as outlier if too far away.
+
+    Memories are processed in order and cluster centers move as memories are added,
+    so only the distance column of the cluster that changed is recomputed per step.
+
+    Args:
+        cluster_list: Clusters to assign memories to, updated in place.
+        memory_list: Memories to assign, memories without embedding are skipped.
+        outlier_cutoff_distance: Distance from which a memory is an outlier.
+
+    Returns:
+        Tuple[Set, List[Memory]]: Ids of the clusters that got new memories, and outlier memories.
+    """
+    updated_cluster_ids = set()
+    outlier_memory_list = []
+
+    memory_list = [memory for memory in memory_list if memory.embedding is not None]
+    if not memory_list:
+        return updated_cluster_ids, outlier_memory_list
+
+    memory_matrix = stack_embeddings([memory.embedding for memory in memory_list])
+    center_matrix = stack_embeddings([cluster.cluster_center for cluster in cluster_list])
+    distances = cdist(memory_matrix, center_matrix, metric="euclidean")
+
+    for i, memory in enumerate(memory_list):
+        nearest_cluster_idx = int(np.argmin(distances[i]))
+        if distances[i, nearest_cluster_idx] < outlier_cutoff_distance:
+            nearest_cluster = cluster_list[nearest_cluster_idx]
+            nearest_cluster.add_memory(memory)
+            updated_cluster_ids.add(nearest_cluster.cluster_id)
+            # Only the center of the nearest cluster moved
+            distances[i + 1:, nearest_cluster_idx] = np.linalg.norm(
+                memory_matrix[i + 1:] - nearest_cluster.cluster_center, axis=1
+            )
+        else:
+            outlier_memory_list.append(memory)
+
+    return updated_cluster_ids, outlier_memory_list
+
+
+def collect_cluster_indices(Z: np.ndarray, threshold: float) -> Dict[int, List[int]]:
+    """
+    Collects the leaf indices of each cluster from a linkage matrix.
+
+    Only merges below the threshold form clusters, points never merged are left out.
+
+    Args:
+        Z: Linkage matrix from hierarchical clustering.
+        threshold: Distance threshold for forming clusters.
+
+    Returns:
+        Dict[int, List[int]]: Cluster ids from 0 to len(clusters) mapped to point indices.
+    """
+    clusters = defaultdict(list)
+    n = Z.shape[0] + 1
+    cluster_id = n
+    for i, merge in enumerate(Z):
+        left, right, dist, _ = merge
+        if dist < threshold:
+            if left < n:
+                clusters[cluster_id].append(int(left))
+            else:
+                clusters[cluster_id].extend(clusters.pop(left))
+
+            if right < n:
+                clusters[cluster_id].append(int(right))
+            else:
+                clusters[cluster_id].extend(clusters.pop(right))
+
+            cluster_id += 1
+
+    # change the cluster_id to 0~len(clusters)
+    return {new_id: indices for new_id, indices in enumerate(clusters.values())}
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    Scales every row to unit length, zero rows are left unchanged.
+
+    Args:
+        matrix: Matrix with one vector per row.
+
+    Returns:
+        np.ndarray: Row-normalized float64 matrix.
+    """
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def partitioned_complete_linkage_clusters(
+    embedding_matrix: np.ndarray,
+    threshold: float,
+    partition_size: int = 2000,
+    neighbor_partitions: int = 3,
+) -> Dict[int, List[int]]:
+    """
+    Approximates complete-linkage cosine clustering for large inputs.
+
+    Points are pre-partitioned with mini-batch k-means, complete linkage runs within
+    every partition and a merge pass then joins clusters of neighboring partitions
+    whose members are all within the threshold of each other. Memory stays bounded
+    by the partition size instead of growing with the square of all points.
+
+    Args:
+        embedding_matrix: Matrix with one embedding per row.
+        threshold: Cosine distance threshold for forming clusters.
+        partition_size: Target number of points per partition.
+        neighbor_partitions: Number of nearest partitions searched in the merge pass.
+
+    Returns:
+        Dict[int, List[int]]: Cluster ids from 0 to len(clusters) mapped to point indices.
+    """
+    unit_matrix = normalize_rows(np.asarray(embedding_matrix, dtype=np.float64))
+    n = unit_matrix.shape[0]
+    partition_n = max(1, int(np.ceil(n / partition_size)))
+
+    if partition_n == 1:
+        labels = np.zeros(n, dtype=int)
+        partition_centers = unit_matrix.mean(axis=0, keepdims=True)
+    else:
+        kmeans = MiniBatchKMeans(
+            n_clusters=partition_n,
+            batch_size=min(n, max(1024, partition_size)),
+            n_init=3,
+            random_state=0,
+        )
+        labels = kmeans.fit_predict(unit_matrix)
+        partition_centers = kmeans.cluster_centers_
+    partition_centers = normalize_rows(partition_centers)
+
+    # Complete linkage inside every partition
+    groups: List[List[int]] = []
+    group_partitions: List[int] = []
+    for partition in range(partition_n):
+        members = np.flatnonzero(labels == partition)
+        if len(members) < 2:
+            continue
+        Z = linkage(unit_matrix[members], method="complete", metric="cosine")
+        for indices in collect_cluster_indices(Z, threshold).values():
+            groups.append(members[indices].tolist())
+            group_partitions.append(partition)
+
+    if not groups:
+        return {}
+
+    # Merge pass: candidate pairs are clusters in neighboring partitions with close centroids
+    centroids = normalize_rows(np.vstack([unit_matrix[g].mean(axis=0) for g in groups]))
+    group_partitions = np.asarray(group_partitions)
+    neighbor_n = min(neighbor_partitions, partition_n)
+    nearest_partitions = np.argsort(
+        -(centroids @ partition_centers.T), axis=1
+    )[:, :neighbor_n]
+
+    candidate_pairs = []
+    for i in range(len(groups)):
+        candidates = np.flatnonzero(
+            np.isin(group_partitions, nearest_partitions[i])
+            & (group_partitions != group_partitions[i])
+        )
+        candidates = candidates[candidates > i]
+        if len(candidates) == 0:
+            continue
+        distances = 1.0 - centroids[candidates] @ centroids[i]
+        for j, distance in zip(candidates, distances):
+            if distance < threshold:
+                candidate_pairs.append((distance, i, int(j)))
+    candidate_pairs.sort()
+
+    parent = list(range(len(groups)))
+    merged_members = {i: list(g) for i, g in enumerate(groups)}
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for _, i, j in candidate_pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j:
+            continue
+        members_i, members_j = merged_members[root_i], merged_members[root_j]
+        # Complete linkage: every cross pair must be within the threshold
+        max_distance = 1.0 - np.min(unit_matrix[members_i] @ unit_matrix[members_j].T)
+        if max_distance < threshold:
+            parent[root_j] = root_i
+            merged_members[root_i] = members_i + members_j
+            del merged_members[root_j]
+
+    return {new_id: indices for new_id, indices in enumerate(merged_members.values())}
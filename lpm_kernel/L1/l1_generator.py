@@ -5,7 +5,7 @@ from typing import Dict, Any, List, Optional
 import logging
 import os
 
-from openai import OpenAI
+from lpm_kernel.common.http_client import GENERATOR_POOL, OpenAIClientRegistry
 
 from lpm_kernel.L1.bio import (
     Bio,
@@ -188,9 +188,10 @@ class L1Generator:
             self.client = None
             self.model_name = None
         else:
-            self.client = OpenAI(
+            self.client = OpenAIClientRegistry.get_instance().get(
                 api_key=self.user_llm_config.chat_api_key,
                 base_url=self.user_llm_config.chat_endpoint,
+                pool=GENERATOR_POOL,
             )
             self.model_name = self.user_llm_config.chat_model_name
         self._top_p_adjusted = False  # Flag to track if top_p has been adjusted
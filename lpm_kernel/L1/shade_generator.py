@@ -3,7 +3,7 @@ import json
 import re
 import traceback
 
-from openai import OpenAI
+from lpm_kernel.common.http_client import GENERATOR_POOL, OpenAIClientRegistry
 import numpy as np
 
 from lpm_kernel.L1.bio import (
@@ -48,9 +48,10 @@ class ShadeGenerator:
             self.client = None
             self.model_name = None
         else:
-            self.client = OpenAI(
+            self.client = OpenAIClientRegistry.get_instance().get(
                 api_key=self.user_llm_config.chat_api_key,
                 base_url=self.user_llm_config.chat_endpoint,
+                pool=GENERATOR_POOL,
             )
             self.model_name = self.user_llm_config.chat_model_name
         self._top_p_adjusted = False  # Flag to track if top_p has been adjusted
@@ -441,9 +442,10 @@ class ShadeMerger:
             self.client = None
             self.model_name = None
         else:
-            self.client = OpenAI(
+            self.client = OpenAIClientRegistry.get_instance().get(
                 api_key=self.user_llm_config.chat_api_key,
                 base_url=self.user_llm_config.chat_endpoint,
+                pool=GENERATOR_POOL,
             )
             self.model_name = self.user_llm_config.chat_model_name
         
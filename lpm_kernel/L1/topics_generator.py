@@ -1,4 +1,3 @@
-from collections import defaultdict
 from typing import Any, Dict, List, Optional, Union
 import copy
 import itertools
@@ -6,7 +5,7 @@ import json
 import math
 import traceback
 
-from openai import OpenAI
+from lpm_kernel.common.http_client import GENERATOR_POOL, OpenAIClientRegistry
 from scipy.cluster.hierarchy import fcluster, linkage
 import numpy as np
 
@@ -17,8 +16,17 @@ from lpm_kernel.L1.prompt import (
     SYS_COMB,
     USR_COMB,
 )
+from lpm_kernel.L1.clustering import (
+    EXACT_LINKAGE_MAX_POINTS,
+    assign_memories_to_clusters,
+    collect_cluster_indices,
+    group_note_chunks,
+    partitioned_complete_linkage_clusters,
+    stack_embeddings,
+)
 from lpm_kernel.L1.utils import find_connected_components
 from lpm_kernel.api.services.user_llm_config_service import UserLLMConfigService
+from lpm_kernel.configs.config import Config
 from lpm_kernel.configs.logging import get_train_process_logger
 logger = get_train_process_logger()
 
@@ -44,13 +52,18 @@ class TopicsGenerator:
             self.client = None
             self.model_name = None
         else:
-            self.client = OpenAI(
+            self.client = OpenAIClientRegistry.get_instance().get(
                 api_key=self.user_llm_config.chat_api_key,
                 base_url=self.user_llm_config.chat_endpoint,
+                pool=GENERATOR_POOL,
             )
             self.model_name = self.user_llm_config.chat_model_name
         logger.info(f"user_llm_config: {self.user_llm_config}")
         self.threshold = 0.85
+        # Cold start clustering mode: "exact", "partitioned" or "auto" (partitioned for large inputs)
+        config = Config.from_env()
+        self.cold_start_mode = config.get("L1_COLD_START_MODE", "auto")
+        self.cold_start_partition_size = int(config.get("L1_COLD_START_PARTITION_SIZE", 2000))
         self._top_p_adjusted = False  # Flag to track if top_p has been adjusted
 
     def _fix_top_p_param(self, error_message: str) -> bool:
@@ -117,25 +130,6 @@ class TopicsGenerator:
             # Re-raise the exception
             raise
 
-    def __find_nearest_cluster(self, cluster_list: List[Cluster], memory: Memory) -> tuple:
-        """
-        Find the nearest cluster to a memory based on embedding distance.
-        
-        Args:
-            cluster_list: List of clusters to search
-            memory: Memory to find nearest cluster for
-            
-        Returns:
-            A tuple containing (nearest_cluster, distance_to_cluster)
-        """
-        distances = [
-            np.linalg.norm(memory.embedding - cluster.cluster_center)
-            for cluster in cluster_list
-        ]
-        nearest_cluster_idx = np.argmin(distances)
-        return cluster_list[nearest_cluster_idx], distances[nearest_cluster_idx]
-
-
     def __merge_closed_clusters(
         self, cluster_list: List[Cluster], cluster_merge_distance: float
     ) -> tuple:
@@ -203,32 +197,20 @@ class TopicsGenerator:
         Returns:
             A tuple containing (updated_clusters, new_outlier_memories)
         """
-        updated_cluster_ids = set()
-
-        for memory in new_memory_list:
-            if memory.embedding is None:
-                continue
-            nearest_cluster, distance = self.__find_nearest_cluster(
-                cluster_list, memory
-            )
-            if distance < outlier_cutoff_distance:
-                nearest_cluster.add_memory(memory)
-                updated_cluster_ids.add(nearest_cluster.cluster_id)
-            else:
-                outlier_memory_list.append(memory)
+        updated_cluster_ids, new_outlier_memory_list = assign_memories_to_clusters(
+            cluster_list, new_memory_list, outlier_cutoff_distance
+        )
+        outlier_memory_list.extend(new_outlier_memory_list)
 
         merge_cluster_ids_list, merge_cluster_list = self.__merge_closed_clusters(
             cluster_list, cluster_merge_distance
         )
+        merged_cluster_ids = set(itertools.chain(*merge_cluster_ids_list))
         updated_cluster_list = [
             cluster
             for cluster in cluster_list
-            if cluster.cluster_id in list(updated_cluster_ids)
-        ]
-        updated_cluster_list = [
-            cluster
-            for cluster in updated_cluster_list
-            if cluster.cluster_id not in list(itertools.chain(*merge_cluster_ids_list))
+            if cluster.cluster_id in updated_cluster_ids
+            and cluster.cluster_id not in merged_cluster_ids
         ]
 
         # Initial calculation of size_threshold using updated_cluster_list
@@ -275,12 +257,9 @@ class TopicsGenerator:
         Returns:
             A tuple containing (generated_clusters, outlier_memories)
         """
-        for memory in memory_list:
-            logger.info(f"memory embedding shape: {memory.embedding.shape}")
-            logger.info(f"memory: {memory}")
-        memory_embeddings = [memory.embedding for memory in memory_list]
+        memory_embeddings = stack_embeddings([memory.embedding for memory in memory_list])
 
-        logger.info(f"memory_embeddings: {memory_embeddings}")
+        logger.info(f"memory_embeddings shape: {memory_embeddings.shape}")
 
         if len(memory_embeddings) == 1:
             clusters = np.array([1])
@@ -303,15 +282,15 @@ class TopicsGenerator:
         # For initial strategy, we need remove some nodes near the cluster boundary, retaining the main components of the cluster.
         for cluster in cluster_list:
             cluster.prune_outliers_from_cluster()
-        in_cluster_memory_list = [
+        in_cluster_memory_ids = {
             memory.memory_id
             for cluster in cluster_list
             for memory in cluster.memory_list
-        ]
+        }
         outlier_memory_list = [
             memory
             for memory in memory_list
-            if memory.memory_id not in in_cluster_memory_list
+            if memory.memory_id not in in_cluster_memory_ids
         ]
 
         logger.info(f"cluster_list: {cluster_list}")
@@ -461,7 +440,7 @@ class TopicsGenerator:
             notes_list
         )
         logger.info(
-            f"embedding_matrix shape: {len(embedding_matrix)}, clean_chunks length: {len(clean_chunks)}"
+            f"embedding_matrix shape: {embedding_matrix.shape}, clean_chunks length: {len(clean_chunks)}"
         )
 
         if len(embedding_matrix) == 0:
@@ -472,7 +451,7 @@ class TopicsGenerator:
         return cluster_data
 
 
-    def __cold_clusters(self, clean_chunks: List, embedding_matrix: List) -> dict:
+    def __cold_clusters(self, clean_chunks: List, embedding_matrix: np.ndarray) -> dict:
         """
         Generate clusters from scratch using hierarchical clustering.
         
@@ -503,49 +482,36 @@ class TopicsGenerator:
             }
             return cluster_data
 
-        Z = linkage(embedding_matrix, method="complete", metric="cosine")
-        clusters = self.__collect_cluster_indices(Z, self.threshold)
+        if self.__use_partitioned_cold_start(len(embedding_matrix)):
+            logger.info(
+                f"Using partitioned cold start clustering for {len(embedding_matrix)} chunks"
+            )
+            clusters = partitioned_complete_linkage_clusters(
+                embedding_matrix, self.threshold, self.cold_start_partition_size
+            )
+        else:
+            Z = linkage(embedding_matrix, method="complete", metric="cosine")
+            clusters = collect_cluster_indices(Z, self.threshold)
         cluster_data = self.__gen_cluster_data(clusters, chunks_with_topics)
 
         return cluster_data
 
 
-    def __collect_cluster_indices(self, Z: np.ndarray, threshold: float) -> dict:
+    def __use_partitioned_cold_start(self, chunk_n: int) -> bool:
         """
-        Collect the leaf indices of each cluster from the linkage matrix.
+        Decide whether cold start clustering runs partitioned or as one exact linkage.
         
         Args:
-            Z: Linkage matrix from hierarchical clustering
-            threshold: Distance threshold for forming clusters
+            chunk_n: Number of chunks to cluster
             
         Returns:
-            A dictionary mapping cluster IDs to lists of point indices in each cluster
-        """
-        clusters = defaultdict(list)
-        n = Z.shape[0] + 1
-        cluster_id = n
-        for i, merge in enumerate(Z):
-            left, right, dist, _ = merge
-            if dist < threshold:
-                if left < n:
-                    clusters[cluster_id].append(int(left))
-                else:
-                    clusters[cluster_id].extend(clusters.pop(left))
-
-                if right < n:
-                    clusters[cluster_id].append(int(right))
-                else:
-                    clusters[cluster_id].extend(clusters.pop(right))
-
-                cluster_id += 1
-
-        # change the cluster_id to 0~len(clusters)
-        new_cluster_id = 0
-        new_clusters = {}
-        for tmp_id, indices in clusters.items():
-            new_clusters[new_cluster_id] = indices
-            new_cluster_id += 1
-        return new_clusters
+            True if the partitioned clustering should be used
+        """
+        if self.cold_start_mode == "partitioned":
+            return True
+        if self.cold_start_mode == "auto":
+            return chunk_n > EXACT_LINKAGE_MAX_POINTS
+        return False
 
 
     def __gen_cluster_data(self, clusters: dict, chunks_with_topics: List) -> dict:
@@ -693,36 +659,19 @@ class TopicsGenerator:
             notes_list: List of Note objects to process
             
         Returns:
-            A tuple containing (embedding_matrix, clean_chunks, all_note_ids)
+            A tuple containing (embedding_matrix, clean_chunks, all_note_ids), the
+            embedding matrix is a contiguous float32 array with one row per clean chunk
         """
-        all_chunks = [chunk for note in notes_list for chunk in note.chunks]
-        all_chunks = [chunk for chunk in all_chunks if chunk.embedding is not None]
         all_note_ids = [note.id for note in notes_list]
-        clean_chunks = []
-        clean_ids = []
-        clean_notes_lst = []
         # use content chunk
-        for note_id in all_note_ids:
-            tmp_chunks_set = [
-                chunk for chunk in all_chunks if chunk.document_id == note_id
-            ]
-            if len(tmp_chunks_set) == 0:
-                continue
-            elif len(tmp_chunks_set) == 1:
-                clean_chunks.append(tmp_chunks_set[0])
-                clean_ids.append(note_id)
-                clean_notes_lst.append(
-                    [note for note in notes_list if note.id == note_id][0]
-                )
-            else:
-                clean_ids.append(note_id)
-                clean_notes_lst.append(
-                    [note for note in notes_list if note.id == note_id][0]
-                )
-                for chunk in tmp_chunks_set:
-                    clean_chunks.append(chunk)
+        clean_chunks = group_note_chunks(notes_list)
 
         # form the embedding matrix
-        embedding_matrix = [clean_chunk.embedding for clean_chunk in clean_chunks]
+        if clean_chunks:
+            embedding_matrix = stack_embeddings(
+                [clean_chunk.embedding for clean_chunk in clean_chunks], dtype=np.float32
+            )
+        else:
+            embedding_matrix = np.empty((0, 0), dtype=np.float32)
 
         return embedding_matrix, clean_chunks, all_note_ids
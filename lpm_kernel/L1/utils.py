@@ -1,11 +1,13 @@
-from collections import deque
 from datetime import datetime
 from typing import List, Dict, Any
 import json
 
-import numpy as np
-
 from lpm_kernel.L1.bio import Cluster
+from lpm_kernel.L1.clustering import (
+    connected_component_indices,
+    pairwise_within_distance,
+    stack_embeddings,
+)
 import logging
 
 
@@ -36,40 +38,12 @@ def find_connected_components(
     Returns:
         List[List[Cluster]]: List of connected components, where each component is a list of clusters.
     """
-    adjacency_matrix = np.array(
-        [
-            [
-                np.linalg.norm(cluster1.cluster_center - cluster2.cluster_center)
-                for cluster2 in cluster_list
-            ]
-            for cluster1 in cluster_list
-        ]
-    )
-
-    cluster_n = len(cluster_list)
-    visited = [False] * cluster_n
-    components = []
-
-    def bfs(start: int):
-        queue = deque([start])
-        component = []
-        visited[start] = True
-
-        while queue:
-            node = queue.popleft()
-            component.append(node)
-            for neighbor in range(cluster_n):
-                if (
-                    not visited[neighbor]
-                    and adjacency_matrix[node, neighbor] < cluster_merge_distance
-                ):
-                    visited[neighbor] = True
-                    queue.append(neighbor)
-        return component
-
-    for i in range(cluster_n):
-        if not visited[i]:
-            components.append(bfs(i))
+    if not cluster_list:
+        return []
+
+    center_matrix = stack_embeddings([cluster.cluster_center for cluster in cluster_list])
+    adjacency_matrix = pairwise_within_distance(center_matrix, cluster_merge_distance)
+    components = connected_component_indices(adjacency_matrix)
 
     return [[cluster_list[i] for i in component] for component in components]
 
@@ -25,6 +25,7 @@ from lpm_kernel.L1.bio import (
     OBJECT_NOTE_TYPE,
     SUBJECT_NOTE_TYPE
 )
+from lpm_kernel.L2.data_pipeline.data_prep.checkpoint import iter_json_items, write_json_array
 from lpm_kernel.L2.data_pipeline.data_prep.context_data.context_generator import ContextGenerator
 from lpm_kernel.L2.data_pipeline.data_prep.diversity.diversity_data_generator import DiversityDataGenerator
 from lpm_kernel.L2.data_pipeline.data_prep.preference.preference_QA_generate import PreferenceQAGenerator
@@ -199,7 +200,6 @@ class L2DataProcessor:
             self._merge_context_data(data_output_base_dir, "context_merged.json")
 
         # Merge the four specified JSON files
-        merged_data = []
         if do_context:
             json_files_to_merge = [
                 preference_output_path,
@@ -216,30 +216,27 @@ class L2DataProcessor:
 
         logger.info("---" * 30 + "\nMerging JSON files\n" + "---" * 30)
 
-        for file_path in json_files_to_merge:
-            if file_path and os.path.exists(file_path):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_data = json.load(f)
-                        if isinstance(file_data, list):
-                            merged_data.extend(file_data)
-                            logger.info(f"Added {len(file_data)} items from {file_path}")
-                        else:
-                            merged_data.append(file_data)
-                            logger.info(f"Added 1 item from {file_path}")
-                except Exception as e:
-                    logger.error(f"Error merging file {file_path}: {str(e)}")
-            else:
-                if file_path == context_output_path and do_context == False:
-                    continue
-                logger.warning(f"File not found or path is None: {file_path}")
+        def merged_items():
+            for file_path in json_files_to_merge:
+                if file_path and os.path.exists(file_path):
+                    count = 0
+                    try:
+                        for item in iter_json_items(file_path):
+                            count += 1
+                            yield item
+                    except Exception as e:
+                        logger.error(f"Error merging file {file_path}: {str(e)}")
+                    logger.info(f"Added {count} items from {file_path}")
+                else:
+                    if file_path == context_output_path and do_context == False:
+                        continue
+                    logger.warning(f"File not found or path is None: {file_path}")
 
-        # Save the merged data
+        # Save the merged data, streamed so no input file is loaded as a whole
         merged_output_path = os.path.join(data_output_base_dir, "merged.json")
-        with open(merged_output_path, 'w', encoding='utf-8') as f:
-            json.dump(merged_data, f, ensure_ascii=False, indent=2)
+        total = write_json_array(merged_output_path, merged_items())
 
-        logger.info(f"Merged data saved to {merged_output_path} with {len(merged_data)} total items")
+        logger.info(f"Merged data saved to {merged_output_path} with {total} total items")
         logger.info("---" * 30 + "\nJSON files merged\n" + "---" * 30)
 
     def _merge_context_data(self, data_output_base_dir: str, context_merged_file_name: str):
@@ -706,9 +703,7 @@ class L2DataProcessor:
             user_global_bio=bio,
             preferred_language=self.preferred_lang,
         )
-        q_a_list = selfqa.generate_qa()
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(q_a_list, f, ensure_ascii=False, indent=4)
+        selfqa.generate_qa(output_path)
 
     def _gen_context_data(
             self,
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import random
+import threading
+from typing import Any, Iterable, Iterator, List, Optional
+
+from lpm_kernel.configs.logging import get_train_process_logger
+
+logger = get_train_process_logger()
+
+
+def checkpoint_path(output_path: str) -> str:
+    """JSONL checkpoint kept next to a generator output, e.g. preference.json -> preference.jsonl"""
+    return os.path.splitext(output_path)[0] + ".jsonl"
+
+
+def item_key(*parts: Any) -> str:
+    """Stable key of a work item from the inputs that define it"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JsonlCheckpoint:
+    """Append-only record of the finished work items of a data generator
+
+    The first line holds the seed of the run's random sampling, every further
+    line the key and generated items of one finished work item. A run that
+    was interrupted is resumed with the same seed, so it plans the same work
+    items and skips the ones already recorded. Once the output is complete a
+    final marker line is written and the next run starts over.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.seed: Optional[int] = None
+        self.resumed = False
+        self._done = {}
+        self._lock = threading.Lock()
+        self._file = None
+        self._open()
+
+    def __enter__(self) -> "JsonlCheckpoint":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _open(self) -> None:
+        header, records, complete = None, [], False
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # The line being written when the run died
+                        break
+                    if "seed" in record and header is None:
+                        header = record
+                    elif record.get("complete"):
+                        complete = True
+                    elif "key" in record:
+                        records.append(record)
+
+        if header is not None and not complete:
+            self.seed = header["seed"]
+            self._done = {record["key"]: record["items"] for record in records}
+            self.resumed = True
+            logger.info(f"Resuming {self.path} with {len(self._done)} finished items")
+        else:
+            self.seed = random.randrange(2 ** 32)
+
+        # Rewrite instead of appending, which also drops a partially written last line
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._write({"seed": self.seed})
+        for key, items in self._done.items():
+            self._write({"key": key, "items": items})
+        self._file.flush()
+
+    def rng(self) -> random.Random:
+        """Random generator that makes the same choices when the run is resumed"""
+        return random.Random(self.seed)
+
+    def is_done(self, key: str) -> bool:
+        with self._lock:
+            return key in self._done
+
+    def add(self, key: str, items: List[dict]) -> None:
+        """Record the items generated for a work item, durable once this returns"""
+        with self._lock:
+            self._done[key] = items
+            self._write({"key": key, "items": items})
+            self._file.flush()
+
+    def items(self, keys: Optional[Iterable[str]] = None) -> Iterator[dict]:
+        """Yield the recorded items, only those of the given keys if keys are passed"""
+        with self._lock:
+            done = list(self._done.items())
+        wanted = set(keys) if keys is not None else None
+        for key, items in done:
+            if wanted is None or key in wanted:
+                yield from items
+
+    def finish(self) -> None:
+        """Mark the output complete, the next run then generates everything again"""
+        with self._lock:
+            self._write({"complete": True})
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def write_json_array(path: str, items: Iterable[Any]) -> int:
+    """Write items as a JSON array one at a time, returns the number of items
+
+    The file is written under a temporary name and moved in place, so readers
+    never see a partial array.
+    """
+    tmp_path = path + ".tmp"
+    count = 0
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for item in items:
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(item, ensure_ascii=False, indent=4))
+            count += 1
+        f.write("\n]" if count else "]")
+    os.replace(tmp_path, path)
+    return count
+
+
+def iter_json_items(path: str, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of a JSON array file one at a time
+
+    Only the element being decoded is held in memory. A file that does not
+    hold an array is loaded and yielded as a single item.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(chunk_size)
+        # Leading whitespace can fill whole chunks
+        while buffer and not buffer.strip():
+            more = f.read(chunk_size)
+            if not more:
+                break
+            buffer += more
+        start = len(buffer) - len(buffer.lstrip())
+        if not buffer[start:].startswith("["):
+            yield json.loads(buffer + f.read())
+            return
+        pos = start + 1
+        eof = False
+        while True:
+            # Skip separators between elements
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    break
+                buffer, pos = f.read(chunk_size), 0
+                eof = not buffer
+            if pos >= len(buffer) or buffer[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # A number cut in the chunk, e.g. "1." of "1.5e10", decodes as a shorter
+                # value, so an element only counts once the separator after it was read
+                after = end
+                while after < len(buffer) and buffer[after] in " \t\r\n":
+                    after += 1
+                if after == len(buffer) and not eof:
+                    raise ValueError("element may continue in the next chunk")
+                if after < len(buffer) and buffer[after] not in ",]":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, after)
+            except ValueError:
+                if eof:
+                    raise
+                more = f.read(chunk_size)
+                eof = not more
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+            yield item
+            pos = end
@@ -9,7 +9,7 @@ import os
 import random
 import traceback
 
-from openai import OpenAI
+from lpm_kernel.common.http_client import GENERATOR_POOL, OpenAIClientRegistry
 from tqdm import tqdm
 
 from lpm_kernel.L1.bio import Note
@@ -25,6 +25,7 @@ from lpm_kernel.L2.data_pipeline.data_prep.context_data.utils import (
 )
 from lpm_kernel.api.services.user_llm_config_service import UserLLMConfigService
 from lpm_kernel.configs.config import Config
+from lpm_kernel.L2.data_pipeline.data_prep.synthesis_scheduler import SynthesisScheduler, synthesis_workers
 
 
 def parse_model_response(response_content: str) -> List[str]:
@@ -71,10 +72,12 @@ class ContextGenerator:
         else:
             self.model_name = user_llm_config.chat_model_name
     
-            self.client = OpenAI(
+            self.client = OpenAIClientRegistry.get_instance().get(
                 api_key=user_llm_config.api_key,
                 base_url=user_llm_config.endpoint,
+                pool=GENERATOR_POOL,
             )
+            self.client = SynthesisScheduler.get_instance().wrap(self.client, "context")
         self.preferred_language = preferred_language
         self.critic_checkpoint_path = "./critic_task_checkpoint.json"
         
@@ -381,7 +384,7 @@ class ContextGenerator:
         # Multi-process the COT task
         trying_limit = len(all_cot_messages)
         
-        cot_results = multi_process_request(all_cot_messages[:trying_limit], 16, self._process_request)
+        cot_results = multi_process_request(all_cot_messages[:trying_limit], synthesis_workers(), self._process_request)
         all_notes_todos = all_notes
         needsAndRelatedNotesTodos_res = []
         
@@ -6,12 +6,16 @@ import random
 import re
 import traceback
 
-import openai
+from lpm_kernel.common.http_client import GENERATOR_POOL, OpenAIClientRegistry
 import pandas as pd
 from tqdm import tqdm
 from enum import Enum
 from lpm_kernel.api.services.user_llm_config_service import UserLLMConfigService
 from lpm_kernel.configs.config import Config
+from lpm_kernel.L2.data_pipeline.data_prep.checkpoint import (
+    JsonlCheckpoint, checkpoint_path, item_key, write_json_array
+)
+from lpm_kernel.L2.data_pipeline.data_prep.synthesis_scheduler import SynthesisScheduler, synthesis_workers
 from lpm_kernel.L2.data_pipeline.data_prep.diversity.utils import remove_similar_dicts
 import lpm_kernel.L2.data_pipeline.data_prep.diversity.template_diversity as template_diversity
 
@@ -59,12 +63,13 @@ class DiversityDataGenerator:
         else:
             self.model_name = user_llm_config.chat_model_name
     
-            self.client = openai.OpenAI(
+            self.client = OpenAIClientRegistry.get_instance().get(
                 api_key=user_llm_config.chat_api_key,
                 base_url=user_llm_config.chat_endpoint,
+                pool=GENERATOR_POOL,
             )
         self.preference_language = preference_language
-        self.max_workers = os.environ.get("concurrency_threads", 2)
+        self.max_workers = synthesis_workers()
         self.data_synthesis_mode = os.environ.get("DATA_SYNTHESIS_MODE", "low")
         self.is_cot = is_cot
         if self.is_cot:
@@ -73,10 +78,11 @@ class DiversityDataGenerator:
             self.api_key = user_llm_config.thinking_api_key
             self.base_url = user_llm_config.thinking_endpoint
             if self.model_name.startswith("deepseek"):
-                self.client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
+                self.client = OpenAIClientRegistry.get_instance().get(api_key=self.api_key, base_url=self.base_url, pool=GENERATOR_POOL)
             else:
                 logger.error(f"Error model_name, longcot data generating model_name: deepseek series")
                 raise
+        self.client = SynthesisScheduler.get_instance().wrap(self.client, "diversity")
 
 
     def _preprocess(self, entities_path: str, note_list: list, config_path: str, graph_path: str, user_name: str):
@@ -235,9 +241,21 @@ class DiversityDataGenerator:
             graph_path: Path to graph data file.
             user_name: Name of the user.
             global_bio: User biography text.
-            output_path: Path to save the generated data.
+            output_path: Path to save the generated data. Finished items are
+                recorded in a JSONL checkpoint next to it, a rerun after a
+                failure only generates the remaining ones.
         """
+        with JsonlCheckpoint(checkpoint_path(output_path)) as checkpoint:
+            self._generate_data(
+                entities_path, note_list, config_path, graph_path, user_name, global_bio,
+                output_path, checkpoint
+            )
+
+    def _generate_data(self, entities_path: str, note_list: list, config_path: str,
+                       graph_path: str, user_name: str, global_bio: str, output_path: str,
+                       checkpoint: JsonlCheckpoint):
         language_desc = f"Keep your response in {self.preference_language}"
+        rng = checkpoint.rng()
 
         entity2desc, entity2type, QA_config = self._preprocess(
             entities_path, note_list, config_path, graph_path, user_name
@@ -277,7 +295,7 @@ class DiversityDataGenerator:
             notes_and_ids = list(zip(sub_dict["note"], sub_dict["doc_id"]))
             for _ in range(len(sub_dict["note"]) // 10 + 1):
                 tmp_dict = sub_dict.copy()
-                sampled_notes_and_ids = random.sample(
+                sampled_notes_and_ids = rng.sample(
                     notes_and_ids, min(10, len(notes_and_ids))
                 )
                 tmp_dict["note"], tmp_dict["doc_id"] = zip(
@@ -311,7 +329,7 @@ class DiversityDataGenerator:
         if len(exploded_clusters) > 0:
             logger.info("Execute large cluster generation")
             data_large = self._pipline(exploded_clusters, DataSynthesisMode[self.data_synthesis_mode.upper()].value["large_aug_para"], 
-                                       q_dict, templater, language_desc, user_name)
+                                       q_dict, templater, language_desc, user_name, checkpoint, rng, "large")
         else:
             logger.info("Large cluster number is 0")
             data_large = []
@@ -319,7 +337,7 @@ class DiversityDataGenerator:
         if len(mini_clusters) > 0:
             logger.info("Execute small cluster generation")
             data_mini = self._pipline(mini_clusters, DataSynthesisMode[self.data_synthesis_mode.upper()].value["mini_aug_para"], 
-                                      q_dict, templater, language_desc, user_name)
+                                      q_dict, templater, language_desc, user_name, checkpoint, rng, "mini")
         else:
             logger.info("Small cluster number is 0")
             data_mini = []
@@ -329,24 +347,24 @@ class DiversityDataGenerator:
             q_dict.pop("unanswerable")
             q_dict.pop("global")
             data_tiny = self._pipline(filtered_tiny_clusters, DataSynthesisMode[self.data_synthesis_mode.upper()].value["tiny_aug_para"], 
-                                      q_dict, templater, language_desc, user_name)
+                                      q_dict, templater, language_desc, user_name, checkpoint, rng, "tiny")
         else:
             logger.info("Single entity cluster number is 0")
             data_tiny = []
 
-        combined_list = data_large + data_mini + data_tiny
-        # calculate total entries
-        total_entries = len(combined_list)
+        # store data, data_* hold the checkpoint keys of each cluster size
+        total_entries = write_json_array(
+            output_path, checkpoint.items(data_large + data_mini + data_tiny)
+        )
+        checkpoint.finish()
         logger.info(f"Total entries: {total_entries}")
-        # store data
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(combined_list, f, ensure_ascii=False, indent=4)
 
         logger.info(f"Data has been stored to {output_path}")
 
 
     def _pipline(self, clusters: list, aug_para: int, q_dict: dict, 
-                templater, language_desc: str, user_name: str) -> list:
+                templater, language_desc: str, user_name: str,
+                checkpoint: JsonlCheckpoint, rng: random.Random, stage: str) -> list:
         """Execute the pipeline for data generation.
         
         Args:
@@ -356,9 +374,12 @@ class DiversityDataGenerator:
             templater: Template handler object.
             language_desc: Language description string.
             user_name: Name of the user.
+            checkpoint: Checkpoint the generated QA data is recorded in.
+            rng: Random generator used to pick the question types.
+            stage: Name of the cluster size, part of the item keys.
             
         Returns:
-            List of generated QA data.
+            List of the checkpoint keys of the generated QA data.
         """
         explode_clusters = []
         explode_questions_types = []
@@ -367,102 +388,101 @@ class DiversityDataGenerator:
             explode_clusters.extend([item] * aug_para)
             # randomly select different types based on weights
             weights = [v["weight"] for v in q_dict.values()]
-            random_types = random.choices(list(q_dict.keys()), weights, k=aug_para)
+            random_types = rng.choices(list(q_dict.keys()), weights, k=aug_para)
             explode_questions_types.extend(random_types)
 
         logger.info("Start generating data")
         logger.info(f"Explode clusters: {len(explode_clusters)}")
         logger.info(f"Explode questions types: {len(explode_questions_types)}")
 
-        questions, answers, answer_types, flat_question_types, flat_clusters = self._generate(
-            explode_clusters, explode_questions_types, templater, q_dict, language_desc, user_name
+        keys = [
+            item_key("diversity", stage, i, cluster["entity_name"], list(cluster["doc_id"]), question_type)
+            for i, (cluster, question_type) in enumerate(zip(explode_clusters, explode_questions_types))
+        ]
+        self._generate(
+            [
+                (key, cluster, question_type)
+                for key, cluster, question_type in zip(keys, explode_clusters, explode_questions_types)
+                if not checkpoint.is_done(key)
+            ],
+            templater, q_dict, language_desc, user_name, checkpoint
         )
-
-        # store data
-        data = []
-        for cluster, question, answer, question_type, answer_type in zip(
-            flat_clusters, questions, answers, flat_question_types, answer_types
-        ):
-            if len(question) == 0 or len(answer) == 0:
-                continue
-            data.append(
-                {
-                    "user": question,
-                    "assistant": answer,
-                    "entity_name": cluster["entity_name"],
-                    "question_type": question_type,
-                    "answer_type": answer_type,
-                    "doc_id": cluster["doc_id"],
-                }
-            )
-        return data
+        return keys
 
 
-    def _generate(self, explode_clusters: list, explode_questions_types: list, 
-                 templater, q_dict: dict, language_desc: str, user_name: str) -> tuple:
-        """Generate questions and answers using ThreadPoolExecutor.
+    def _generate(self, items: list, templater, q_dict: dict, language_desc: str,
+                 user_name: str, checkpoint: JsonlCheckpoint) -> None:
+        """Generate questions and their answers using ThreadPoolExecutor.
+        
+        Each item is a cluster and question type, its QA data is recorded in
+        the checkpoint as soon as all its questions are answered.
         
         Args:
-            explode_clusters: List of expanded data clusters.
-            explode_questions_types: List of question types to generate.
+            items: List of (checkpoint key, cluster, question type) to generate.
             templater: Template handler object.
             q_dict: Dictionary of question types.
             language_desc: Language description string.
             user_name: Name of the user.
-            
-        Returns:
-            Tuple of (questions, answers, answer_types, flat_question_types, flat_clusters).
+            checkpoint: Checkpoint the generated QA data is recorded in.
         """
+        def generate(item: tuple) -> int:
+            key, cluster, question_type = item
+            data = self._QA_generate(cluster, question_type, templater, q_dict, language_desc, user_name)
+            # Items without data stay unrecorded and are retried by the next run
+            if data:
+                checkpoint.add(key, data)
+            return len(data)
+
+        cnt = 0
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [
-                executor.submit(self._Q_generate, cluster, question_type, templater, q_dict, language_desc, user_name)
-                for cluster, question_type in zip(
-                    explode_clusters, explode_questions_types
-                )
-            ]
-            questions = []
-            flat_clusters = []
-            flat_question_types = []
-            cnt = 0
-            for future, cluster, question_type in zip(
-                tqdm(futures, total=len(futures), desc="Q_generate", file=tqdm_handler),
-                explode_clusters,
-                explode_questions_types,
-            ):
+            futures = [executor.submit(generate, item) for item in items]
+            for future in tqdm(futures, total=len(futures), desc="QA_generate", file=tqdm_handler):
                 try:
-                    result = future.result()
-                    cnt += 1 if result else 0
-                    # Assuming result is a list of questions
-                    questions.extend(result)
-                    # Extend clusters and question types to match the number of questions
-                    flat_clusters.extend([cluster] * len(result))
-                    flat_question_types.extend([question_type] * len(result))
+                    cnt += 1 if future.result() else 0
                 except Exception as e:
                     logger.error(traceback.format_exc())
 
         # safety check
-        logger.info(f"Count: {cnt}, len(explode_clusters): {len(explode_clusters)}")
+        logger.info(f"Count: {cnt}, items: {len(items)}")
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [
-                executor.submit(self._A_generate, cluster, question, question_type, templater, language_desc, user_name)
-                for cluster, question, question_type in zip(
-                    flat_clusters, questions, flat_question_types
-                )
-            ]
-
-            answers = []
-            answer_types = []
-
-            for future in tqdm(futures, total=len(futures), desc="A_generate", file=tqdm_handler):
-                try:
-                    result, answer_type = future.result()
-                    answers.append(result)
-                    answer_types.append(answer_type)
-                except Exception as e:
-                    logger.error(traceback.format_exc())
 
-        return questions, answers, answer_types, flat_question_types, flat_clusters
+    def _QA_generate(self, cluster: dict, question_type: str, templater,
+                    q_dict: dict, language_desc: str, user_name: str) -> list:
+        """Generate the questions of a cluster and type, then answer each of them.
+        
+        Args:
+            cluster: The data cluster containing entity information.
+            question_type: Type of questions to generate.
+            templater: Template handler object.
+            q_dict: Dictionary of question types.
+            language_desc: Language description string.
+            user_name: Name of the user.
+            
+        Returns:
+            List of generated QA data.
+        """
+        data = []
+        for question in self._Q_generate(cluster, question_type, templater, q_dict, language_desc, user_name):
+            try:
+                answer, answer_type = self._A_generate(
+                    cluster, question, question_type, templater, language_desc, user_name
+                )
+            except Exception as e:
+                logger.error(traceback.format_exc())
+                continue
+            if len(question) == 0 or not answer:
+                continue
+            data.append(
+                {
+                    "user": question,
+                    "assistant": answer,
+                    "entity_name": cluster["entity_name"],
+                    "question_type": question_type,
+                    "answer_type": answer_type,
+                    "doc_id": list(cluster["doc_id"]),
+                }
+            )
+        return data
 
 
     def _Q_generate(self, cluster: dict, question_type: str, templater, 
@@ -2,6 +2,8 @@ from difflib import SequenceMatcher
 from typing import Dict, List, Tuple, Any
 import logging
 
+from lpm_kernel.L2.data_pipeline.data_prep.near_duplicates import remove_near_duplicates
+
 
 def string_similarity(str1: str, str2: str) -> float:
     """Calculate the edit distance similarity between two strings.
@@ -28,27 +30,17 @@ def remove_similar_dicts(dict_list: List[Dict[str, Any]], similarity_threshold:
             - List of dictionaries after removing similar items.
             - Count of similar items found.
     """
-    unique_dicts = []
-    cnt = 0
-    for i, current_dict in enumerate(dict_list):
-        if not current_dict["content"]:
-            continue
-        is_similar = False
-        for j in range(len(unique_dicts)):
-            if not unique_dicts[j]["content"]:
-                continue
-            if (
-                string_similarity(current_dict["content"], unique_dicts[j]["content"])
-                > similarity_threshold
-            ):
-                is_similar = True
-                logging.info(
-                    f" {current_dict['content'][-100:]}\n is similar to: \n{unique_dicts[j]['content'][-100:]}\n____________________"
-                )
-                cnt += 1
-                break
-
-        if not is_similar:
-            unique_dicts.append(current_dict)
-
-    return unique_dicts, cnt
\ No newline at end of file
+    def log_match(current_dict: Dict[str, Any], similar_dict: Dict[str, Any]) -> None:
+        logging.info(
+            f" {current_dict['content'][-100:]}\n is similar to: \n{similar_dict['content'][-100:]}\n____________________"
+        )
+
+    # MinHash LSH picks the pairs worth comparing and each is checked with the
+    # exact ratio, so a dropped item is always a near duplicate, but with a small
+    # probability a near duplicate is missed and kept
+    return remove_near_duplicates(
+        dict_list,
+        key=lambda item: item["content"],
+        threshold=similarity_threshold,
+        on_duplicate=log_match,
+    )
@@ -0,0 +1,247 @@
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lpm_kernel.configs.config import Config
+from lpm_kernel.configs.logging import get_train_process_logger
+
+logger = get_train_process_logger()
+
+
+# Mersenne prime 2**61 - 1 of the hash functions (a * x + b) % P that stand in for
+# permutations, the product wraps around 2**64 first, which only adds mixing
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+# Odd constant of the multiplicative hash folding packed shingles to 32 bits
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+# Unicode code points fit in 21 bits, so shingles of up to 3 characters pack into a uint64
+_CODE_POINT_BITS = 21
+_WHITESPACE = re.compile(r"\s+")
+# Texts this short have too few shingles for MinHash and are compared directly
+SHORT_TEXT_CHARS = 16
+
+
+def dedup_threshold() -> float:
+    """Similarity above which generated QA pairs count as duplicates, 1 or more disables it"""
+    return float(Config.from_env().get("L2_DEDUP_THRESHOLD", 0.9))
+
+
+def is_similar(
+    text1: str,
+    text2: str,
+    threshold: float,
+    counts1: Optional[Counter] = None,
+    counts2: Optional[Counter] = None,
+) -> bool:
+    """Whether SequenceMatcher(None, text1, text2).ratio() is above the threshold
+
+    The upper bounds real_quick_ratio and quick_ratio of SequenceMatcher are
+    checked first without building the matcher, which indexes text2 on
+    creation. Character counts of the texts can be passed in when they are
+    compared repeatedly.
+    """
+    length = len(text1) + len(text2)
+    if not length:
+        return 1.0 > threshold
+    if 2.0 * min(len(text1), len(text2)) / length <= threshold:
+        return False
+    if counts1 is None:
+        counts1 = Counter(text1)
+    if counts2 is None:
+        counts2 = Counter(text2)
+    if 2.0 * sum((counts1 & counts2).values()) / length <= threshold:
+        return False
+    return SequenceMatcher(None, text1, text2).ratio() > threshold
+
+
+def threshold_jaccard(threshold: float) -> float:
+    """Jaccard index corresponding to a SequenceMatcher ratio
+
+    The ratio is a Dice coefficient of matched characters, a Dice coefficient
+    d corresponds to the Jaccard index d / (2 - d).
+    """
+    threshold = min(max(threshold, 0.0), 1.0)
+    return threshold / (2 - threshold)
+
+
+def band_rows(threshold: float, num_perm: int, recall: float = 0.99) -> int:
+    """Most selective rows per band that still find pairs at the similarity threshold
+
+    One edit breaks several shingles, so pairs down to 3/4 of the Jaccard
+    index of the threshold have to become candidates with the given probability.
+    """
+    jaccard = 0.75 * threshold_jaccard(threshold)
+    for rows in range(8, 1, -1):
+        if 1 - (1 - jaccard ** rows) ** (num_perm // rows) >= recall:
+            return rows
+    return 1
+
+
+class NearDuplicateIndex:
+    """MinHash LSH index that finds texts similar to those already added
+
+    Texts are reduced to MinHash signatures of their character shingles and
+    split into bands, texts sharing a band bucket become candidates. Each
+    candidate is then checked with the SequenceMatcher ratio, so a text is
+    only reported similar when the exhaustive pairwise comparison would
+    report it too. The index only decides which pairs are worth comparing,
+    which keeps deduplication near linear in the number of texts. Similar
+    pairs become candidates with high probability rather than certainty,
+    scripts/benchmark_near_duplicates.py compares the kept texts with the
+    exhaustive comparison.
+
+    Rows per band follow from the threshold, see band_rows: lower thresholds
+    use fewer rows to keep recall, at the cost of more candidates to check.
+    Candidates whose signatures agree on less than about a third of the
+    Jaccard index of the threshold are dropped before the costly ratio. Texts shorter than
+    SHORT_TEXT_CHARS are compared with every short text.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        num_perm: int = 128,
+        rows: Optional[int] = None,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        if not 1 <= shingle_size <= 3:
+            raise ValueError("shingle_size must be between 1 and 3")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.rows = rows or band_rows(threshold, num_perm)
+        self.bands = num_perm // self.rows
+        self.min_jaccard = 0.35 * threshold_jaccard(threshold)
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        self._texts: List[str] = []
+        self._char_counts: List[Counter] = []
+        self._short: List[int] = []
+        # Low 32 bits of the signatures are plenty to estimate agreement
+        self._signatures = np.empty((1024, num_perm), dtype=np.uint32)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of the character shingles of a text"""
+        normalized = _WHITESPACE.sub(" ", text).strip()
+        codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        if not len(codes):
+            codes = np.zeros(1, dtype=np.uint64)
+        k = min(self.shingle_size, len(codes))
+        count = len(codes) - k + 1
+        shingles = np.zeros(count, dtype=np.uint64)
+        for offset in range(k):
+            shingles <<= np.uint64(_CODE_POINT_BITS)
+            shingles |= codes[offset:offset + count]
+        hashes = (np.unique(shingles) * _MIX) >> np.uint64(32)
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    def find_similar(self, text: str, signature: Optional[np.ndarray] = None) -> Optional[int]:
+        """Position of the first added text more similar than the threshold, None if there is none"""
+        if signature is None:
+            signature = self.signature(text)
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        if candidates:
+            positions = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            agreement = (self._signatures[positions] == signature.astype(np.uint32)).mean(axis=1)
+            candidates = set(positions[agreement >= self.min_jaccard].tolist())
+        # A ratio above the threshold needs the shorter text to be at least
+        # threshold / (2 - threshold) as long as the longer one
+        if len(text) * self.threshold < SHORT_TEXT_CHARS * (2 - self.threshold):
+            candidates.update(self._short)
+        counts = Counter(text)
+        # Added order, the same match the exhaustive scan would return first
+        for position in sorted(candidates):
+            if is_similar(text, self._texts[position], self.threshold, counts, self._char_counts[position]):
+                return position
+        return None
+
+    def add(self, text: str, signature: Optional[np.ndarray] = None) -> int:
+        """Add a text and return its position"""
+        if signature is None:
+            signature = self.signature(text)
+        position = len(self._texts)
+        if position == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+        self._signatures[position] = signature.astype(np.uint32)
+        self._texts.append(text)
+        self._char_counts.append(Counter(text))
+        if len(text) < SHORT_TEXT_CHARS:
+            self._short.append(position)
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(position)
+        return position
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+
+def remove_near_duplicates(
+    items: Sequence[Any],
+    key: Callable[[Any], Optional[str]],
+    threshold: float = 0.6,
+    on_duplicate: Optional[Callable[[Any, Any], None]] = None,
+) -> Tuple[List[Any], int]:
+    """Keep the first of every group of items whose texts are more similar than the threshold
+
+    Args:
+        items: Items in priority order, earlier items are kept.
+        key: Text of an item, items without text are dropped.
+        threshold: SequenceMatcher ratio above which two texts are duplicates.
+        on_duplicate: Called with each dropped item and the kept item it matched.
+
+    Returns:
+        Tuple of the kept items and the number of duplicates dropped.
+    """
+    index = NearDuplicateIndex(threshold=threshold)
+    kept = []
+    duplicates = 0
+    for item in items:
+        text = key(item)
+        if not text:
+            continue
+        signature = index.signature(text)
+        match = index.find_similar(text, signature)
+        if match is not None:
+            duplicates += 1
+            if on_duplicate is not None:
+                on_duplicate(item, kept[match])
+            continue
+        index.add(text, signature)
+        kept.append(item)
+    return kept, duplicates
+
+
+def _pair_text(pair: dict) -> str:
+    return f"{pair.get('user') or ''}\n{pair.get('assistant') or ''}"
+
+
+def remove_duplicate_pairs(pairs: Iterable[dict], threshold: Optional[float] = None) -> List[dict]:
+    """Drop QA pairs whose question and answer together nearly repeat an earlier pair
+
+    Args:
+        pairs: Generated pairs with 'user' and 'assistant' fields.
+        threshold: Similarity above which pairs are duplicates, L2_DEDUP_THRESHOLD if not given.
+
+    Returns:
+        The pairs that were kept, in their original order.
+    """
+    threshold = dedup_threshold() if threshold is None else threshold
+    pairs = list(pairs)
+    if threshold >= 1:
+        return pairs
+    kept, duplicates = remove_near_duplicates(pairs, key=_pair_text, threshold=threshold)
+    if duplicates:
+        logger.info(f"Removed {duplicates} near duplicate QA pairs of {len(pairs)}")
+    return kept
@@ -5,10 +5,15 @@ import os
 import random
 import re
 from tqdm import tqdm
-import openai
+from lpm_kernel.common.http_client import GENERATOR_POOL, OpenAIClientRegistry
 from enum import Enum
 from lpm_kernel.api.services.user_llm_config_service import UserLLMConfigService
 from lpm_kernel.configs.config import Config
+from lpm_kernel.L2.data_pipeline.data_prep.checkpoint import (
+    JsonlCheckpoint, checkpoint_path, item_key, write_json_array
+)
+from lpm_kernel.L2.data_pipeline.data_prep.near_duplicates import remove_duplicate_pairs
+from lpm_kernel.L2.data_pipeline.data_prep.synthesis_scheduler import SynthesisScheduler, synthesis_workers
 from lpm_kernel.L2.data_pipeline.data_prep.preference.prompts import (
     CH_USR_TEMPLATES, CH_USR_COT_TEMPLATES,
     EN_USR_TEMPLATES, EN_USR_COT_TEMPLATES,
@@ -77,9 +82,10 @@ class PreferenceQAGenerator:
         else:
             self.model_name = user_llm_config.chat_model_name
     
-            self.client = openai.OpenAI(
+            self.client = OpenAIClientRegistry.get_instance().get(
                 api_key=user_llm_config.chat_api_key,
                 base_url=user_llm_config.chat_endpoint,
+                pool=GENERATOR_POOL,
             )
         if self.is_cot:
             logger.info("generate pereference data in longcot pattern!!!")
@@ -87,18 +93,18 @@ class PreferenceQAGenerator:
             self.api_key = user_llm_config.thinking_api_key
             self.base_url = user_llm_config.thinking_endpoint
             if self.model_name.startswith("deepseek"):
-                self.client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
+                self.client = OpenAIClientRegistry.get_instance().get(api_key=self.api_key, base_url=self.base_url, pool=GENERATOR_POOL)
             else:
                 logger.error(f"Error model_name, longcot data generating model_name: deepseek series")
                 raise
+        self.client = SynthesisScheduler.get_instance().wrap(self.client, "preference")
             
         
         self.bio = bio
-        self.question_list = []
         self.preference_language = preference_language
         self.prompt_templates = self._get_prompt_templates(preference_language)
         self.sys_templates = self._get_sys_templates(preference_language)
-        self.max_workers = 1
+        self.max_workers = synthesis_workers()
         self.data_synthesis_mode = os.environ.get("DATA_SYNTHESIS_MODE", "low")
 
 
@@ -216,71 +222,109 @@ class PreferenceQAGenerator:
     def process_clusters(self, output_filename: str) -> None:
         """Process clusters and generate questions and answers.
         
+        Finished clusters are recorded in a JSONL checkpoint next to the
+        output, a rerun after a failure only processes the remaining ones.
+        
         Args:
             output_filename: Path to save the generated Q&A pairs.
         """
         cluster_items = list(self.pre_msg.items())
-        count = 0
         
-        if self.data_synthesis_mode == "low":
-            sample_num = max(1, len(cluster_items) // LowMode.cluster_nums.value) if 0 < len(cluster_items) < 3 else len(cluster_items) // LowMode.cluster_nums.value
-            new_cluster_items = random.sample(cluster_items, sample_num)
-        elif self.data_synthesis_mode == "medium":
-            sample_num = max(1, len(cluster_items) // MediumMode.cluster_nums.value) if 0 < len(cluster_items) < 2 else len(cluster_items) // MediumMode.cluster_nums.value
-            new_cluster_items = random.sample(cluster_items, sample_num)
-        else: # high or other case
-            new_cluster_items = cluster_items
-            
-        for _, cluster in tqdm(new_cluster_items, desc="preference_generate", file=tqdm_handler):
-            chunk_concat = self._get_chunk_concat(cluster["contents"])
+        with JsonlCheckpoint(checkpoint_path(output_filename)) as checkpoint:
+            rng = checkpoint.rng()
+            if self.data_synthesis_mode == "low":
+                sample_num = max(1, len(cluster_items) // LowMode.cluster_nums.value) if 0 < len(cluster_items) < 3 else len(cluster_items) // LowMode.cluster_nums.value
+                new_cluster_items = rng.sample(cluster_items, sample_num)
+            elif self.data_synthesis_mode == "medium":
+                sample_num = max(1, len(cluster_items) // MediumMode.cluster_nums.value) if 0 < len(cluster_items) < 2 else len(cluster_items) // MediumMode.cluster_nums.value
+                new_cluster_items = rng.sample(cluster_items, sample_num)
+            else: # high or other case
+                new_cluster_items = cluster_items
+                
+            keys = []
+            clusters = []
+            for _, cluster in new_cluster_items:
+                chunk_concat = self._get_chunk_concat(cluster["contents"])
+                if len(chunk_concat) < 20:
+                    continue
+                key = item_key("preference", len(keys), chunk_concat)
+                keys.append(key)
+                if not checkpoint.is_done(key):
+                    clusters.append((key, cluster, chunk_concat))
+            logger.info(f"Preference clusters: {len(keys)}, already generated: {len(keys) - len(clusters)}")
+
+            def process(item: tuple) -> None:
+                key, cluster, chunk_concat = item
+                # generate_response returns None for failed requests
+                pairs = [
+                    pair for pair in self._process_cluster((cluster, chunk_concat))
+                    if pair["user"] and pair["assistant"]
+                ]
+                # Failed clusters stay unrecorded and are retried by the next run
+                if pairs:
+                    checkpoint.add(key, pairs)
+
+            # Clusters are independent, their requests share the provider quota through the client
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = executor.map(process, clusters)
+                for count, _ in enumerate(
+                    tqdm(results, total=len(clusters), desc="preference_generate", file=tqdm_handler), 1
+                ):
+                    if count % 5 == 0:
+                        logger.info(f"Processed {count} clusters")
 
-            tags = " ".join(cluster["tags"])
+            total = write_json_array(output_filename, remove_duplicate_pairs(checkpoint.items(keys)))
+            checkpoint.finish()
+        logger.info(f"Stored {total} preference pairs to {output_filename}")
 
-            if len(chunk_concat) < 20:
-                continue
-            count += 1
+
+    def _process_cluster(self, item: tuple) -> list:
+        """Generate the Q&A pairs of one cluster.
+        
+        Args:
+            item: The cluster and its concatenated chunks.
             
-            n_cluster = len(cluster["contents"])
-            if n_cluster > 1:
-                logger.info(f"Cluster has {str(n_cluster)} chunks")
+        Returns:
+            List of generated Q&A pairs, empty if generation failed.
+        """
+        cluster, chunk_concat = item
+        n_cluster = len(cluster["contents"])
+        if n_cluster > 1:
+            logger.info(f"Cluster has {str(n_cluster)} chunks")
 
-            prompt_question_template = self.prompt_templates["query"]
-            prompt_answer_template = self.prompt_templates["answer"]
-            sys_question = self.sys_templates["query"]
-            sys_answer = self.sys_templates["answer"]
+        prompt_question_template = self.prompt_templates["query"]
+        prompt_answer_template = self.prompt_templates["answer"]
+        sys_question = self.sys_templates["query"]
+        sys_answer = self.sys_templates["answer"]
 
-            try:
-                gen_question = self.generate_response(
-                    sys_question,
-                    prompt_question_template.format(
-                        bio=self.bio, chunks_concat=chunk_concat
-                    ),
-                )
-                if self.is_cot:
-                    question_match = re.search(r"<question>(.*?)</question>", gen_question, re.DOTALL)
-                    gen_question = question_match.group(1).strip() if question_match else gen_question
-            except Exception as e:
-                logger.error(traceback.format_exc())
-                continue
-            try:
-                gen_answer = self.generate_response(
-                    sys_answer,
-                    prompt_answer_template.format(
-                        question=gen_question, bio=self.bio, chunks_concat=chunk_concat
-                    ),
-                )
-            except Exception as e:
-                logger.error(traceback.format_exc())
-                continue
-            
-            self.question_list.append({"user": gen_question, "assistant": gen_answer})
-            if n_cluster >= 20:
-                self._generate_multiple_questions(cluster["contents"], chunk_concat)
-            if count % 5 == 0:
-                logger.info(f"Processed {count} clusters")
+        try:
+            gen_question = self.generate_response(
+                sys_question,
+                prompt_question_template.format(
+                    bio=self.bio, chunks_concat=chunk_concat
+                ),
+            )
+            if self.is_cot:
+                question_match = re.search(r"<question>(.*?)</question>", gen_question, re.DOTALL)
+                gen_question = question_match.group(1).strip() if question_match else gen_question
+        except Exception as e:
+            logger.error(traceback.format_exc())
+            return []
+        try:
+            gen_answer = self.generate_response(
+                sys_answer,
+                prompt_answer_template.format(
+                    question=gen_question, bio=self.bio, chunks_concat=chunk_concat
+                ),
+            )
+        except Exception as e:
+            logger.error(traceback.format_exc())
+            return []
 
-        with open(output_filename, "w") as json_file:
-            json.dump(self.question_list, json_file, indent=4, ensure_ascii=False)
+        pairs = [{"user": gen_question, "assistant": gen_answer}]
+        if n_cluster >= 20:
+            pairs.extend(self._generate_multiple_questions(cluster["contents"], chunk_concat))
+        return pairs
 
 
     def _get_chunk_concat(self, contents: list) -> str:
@@ -300,13 +344,17 @@ class PreferenceQAGenerator:
         return chunk_concat
 
 
-    def _generate_multiple_questions(self, contents: list, chunk_concat: str) -> None:
+    def _generate_multiple_questions(self, contents: list, chunk_concat: str) -> list:
         """Generate multiple questions and answers for larger clusters.
         
         Args:
             contents: List of content chunks.
             chunk_concat: Concatenated text chunks.
+            
+        Returns:
+            List of generated Q&A pairs.
         """
+        pairs = []
         num_chunk_referred = 30
         n_repeat = max(1, int(len(contents) * 1 / num_chunk_referred))
         chunk_content_list = [
@@ -348,5 +396,5 @@ class PreferenceQAGenerator:
             except Exception as e:
                 logger.error(traceback.format_exc())
                 continue
-            self.question_list.append({"user": gen_question, "assistant": gen_answer})
-        return
+            pairs.append({"user": gen_question, "assistant": gen_answer})
+        return pairs
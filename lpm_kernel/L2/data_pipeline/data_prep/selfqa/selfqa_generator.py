@@ -2,7 +2,8 @@ import concurrent.futures
 import traceback
 import os
 import random
-import openai
+from typing import Callable, Optional
+from lpm_kernel.common.http_client import GENERATOR_POOL, OpenAIClientRegistry
 from tqdm import tqdm
 from enum import Enum
 from lpm_kernel.L2.data_pipeline.data_prep.selfqa.selfqa_prompt import (
@@ -11,6 +12,11 @@ from lpm_kernel.L2.data_pipeline.data_prep.selfqa.selfqa_prompt import (
 )
 from lpm_kernel.api.services.user_llm_config_service import UserLLMConfigService
 from lpm_kernel.configs.config import Config
+from lpm_kernel.L2.data_pipeline.data_prep.checkpoint import (
+    JsonlCheckpoint, checkpoint_path, item_key, write_json_array
+)
+from lpm_kernel.L2.data_pipeline.data_prep.near_duplicates import remove_duplicate_pairs
+from lpm_kernel.L2.data_pipeline.data_prep.synthesis_scheduler import SynthesisScheduler, synthesis_workers
 from lpm_kernel.configs.logging import get_train_process_logger
 logger = get_train_process_logger()
 
@@ -75,11 +81,12 @@ class SelfQA:
         else:
             self.model_name = user_llm_config.chat_model_name
     
-            self.client = openai.OpenAI(
+            self.client = OpenAIClientRegistry.get_instance().get(
                 api_key=user_llm_config.chat_api_key,
                 base_url=user_llm_config.chat_endpoint,
+                pool=GENERATOR_POOL,
             )
-        self.max_workers = os.environ.get("concurrency_threads", 2)
+        self.max_workers = synthesis_workers()
         self.data_synthesis_mode = os.environ.get("DATA_SYNTHESIS_MODE", "low")
         if self.is_cot:
             logger.info("generate selfQA data in longcot pattern!!!")
@@ -87,18 +94,23 @@ class SelfQA:
             self.api_key = user_llm_config.thinking_api_key
             self.base_url = user_llm_config.thinking_endpoint
             if self.model_name.startswith("deepseek"):
-                self.client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
+                self.client = OpenAIClientRegistry.get_instance().get(api_key=self.api_key, base_url=self.base_url, pool=GENERATOR_POOL)
             else:
                 logger.error(f"Error model_name, longcot data generating model_name: deepseek series")
                 raise
+        self.client = SynthesisScheduler.get_instance().wrap(self.client, "selfqa")
 
 
-    def _get_question_list(self) -> list:
+    def _get_question_list(self, rng: Optional[random.Random] = None) -> list:
         """Generate a list of questions based on preferred language.
         
+        Args:
+            rng: Random generator used to sample the questions, an unseeded one if not given.
+            
         Returns:
             A list of questions in the preferred language.
         """
+        rng = rng or random.Random()
         question_list_en = [
             "Who am I?",
             "How would you describe who I am?",
@@ -156,20 +168,50 @@ class SelfQA:
             f"{self.user_name}这个名字对你来说有印象吗？",
         ]
         if self.preferred_language != "Chinese":
-            return random.sample(question_list_en, len(question_list_en) // DataSynthesisMode[self.data_synthesis_mode.upper()].value["user_question_nums"]) + \
-                   random.sample(user_bind_question_en, len(user_bind_question_en) // DataSynthesisMode[self.data_synthesis_mode.upper()].value["user_bind_question_nums"])
+            return rng.sample(question_list_en, len(question_list_en) // DataSynthesisMode[self.data_synthesis_mode.upper()].value["user_question_nums"]) + \
+                   rng.sample(user_bind_question_en, len(user_bind_question_en) // DataSynthesisMode[self.data_synthesis_mode.upper()].value["user_bind_question_nums"])
         else:
-            return random.sample(question_list_cn, len(question_list_cn) // DataSynthesisMode[self.data_synthesis_mode.upper()].value["user_question_nums"]) + \
-                   random.sample(user_bind_question_cn, len(user_bind_question_cn) // DataSynthesisMode[self.data_synthesis_mode.upper()].value["user_bind_question_nums"])
+            return rng.sample(question_list_cn, len(question_list_cn) // DataSynthesisMode[self.data_synthesis_mode.upper()].value["user_question_nums"]) + \
+                   rng.sample(user_bind_question_cn, len(user_bind_question_cn) // DataSynthesisMode[self.data_synthesis_mode.upper()].value["user_bind_question_nums"])
 
 
-    def generate_qa(self) -> list:
+    def generate_qa(self, output_path: Optional[str] = None) -> list:
         """Generate question and answer pairs.
         
+        Args:
+            output_path: Optional path to save the pairs to. Answered questions
+                are then recorded in a JSONL checkpoint next to it, and a rerun
+                after a failure only asks the remaining questions.
+        
+        Returns:
+            A list of dictionaries containing question and answer pairs.
+        """
+        if output_path is None:
+            return remove_duplicate_pairs(self._generate_qa(self._get_question_list()))
+
+        with JsonlCheckpoint(checkpoint_path(output_path)) as checkpoint:
+            q_list = self._get_question_list(checkpoint.rng())
+            keys = [item_key("selfqa", q) for q in q_list]
+            remaining = [q for q, key in zip(q_list, keys) if not checkpoint.is_done(key)]
+            logger.info(f"SelfQA questions: {len(q_list)}, already answered: {len(q_list) - len(remaining)}")
+            self._generate_qa(
+                remaining, on_result=lambda result: checkpoint.add(item_key("selfqa", result["user"]), [result])
+            )
+            q_a_list = remove_duplicate_pairs(checkpoint.items(keys))
+            write_json_array(output_path, q_a_list)
+            checkpoint.finish()
+        return q_a_list
+
+    def _generate_qa(self, q_list: list, on_result: Optional[Callable[[dict], None]] = None) -> list:
+        """Answer the questions concurrently.
+        
+        Args:
+            q_list: The questions to answer.
+            on_result: Optional callback invoked with every answered pair.
+            
         Returns:
             A list of dictionaries containing question and answer pairs.
         """
-        q_list = self._get_question_list()
         logger.info(f"q_list : {q_list}")
 
         q_a_list = []
@@ -223,6 +265,8 @@ class SelfQA:
                 result = future.result()
                 if result is not None:
                     q_a_list.append(result)
+                    if on_result is not None:
+                        on_result(result)
 
         return q_a_list
 
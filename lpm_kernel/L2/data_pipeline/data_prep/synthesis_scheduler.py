@@ -0,0 +1,300 @@
+import itertools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from lpm_kernel.configs.config import Config
+from lpm_kernel.configs.logging import get_train_process_logger
+
+logger = get_train_process_logger()
+
+
+# Share of the provider quota each generator gets while several wait at once
+DEFAULT_PRIORITIES = {
+    "preference": 2,
+    "selfqa": 1,
+    "diversity": 1,
+    "context": 1,
+}
+
+# Completion size assumed until a response reports its real usage
+DEFAULT_COMPLETION_TOKENS = 512
+
+
+# Threads per generator when the training parameters set none, the former fixed pool size
+DEFAULT_CONCURRENCY_THREADS = 2
+
+
+def synthesis_workers() -> int:
+    """Number of threads a generator uses for its LLM requests
+
+    Follows the concurrency_threads training parameter, which the training
+    process exports as CONCURRENCY_THREADS when it starts data synthesis.
+    L2_SYNTHESIS_WORKERS can raise it only while an L2_LLM_RPM or L2_LLM_TPM
+    limit is configured, the rate limiter then bounds the requests actually
+    sent. Without a limit, more threads would only queue on the provider and
+    the connection pool.
+    """
+    config = Config.from_env()
+    try:
+        workers = int(os.environ.get("CONCURRENCY_THREADS") or DEFAULT_CONCURRENCY_THREADS)
+    except ValueError:
+        workers = DEFAULT_CONCURRENCY_THREADS
+    workers = max(1, workers)
+    rate_limited = (
+        float(config.get("L2_LLM_RPM", 0)) > 0
+        or float(config.get("L2_LLM_TPM", 0)) > 0
+        or bool(config.get("L2_LLM_PROVIDER_LIMITS"))
+    )
+    if rate_limited:
+        workers = max(workers, int(config.get("L2_SYNTHESIS_WORKERS", workers)))
+    return workers
+
+
+def estimate_tokens(messages: List[dict], max_tokens: Optional[int] = None) -> int:
+    """Rough token count of a chat request, about four characters per token"""
+    prompt_chars = sum(len(str(message.get("content") or "")) for message in messages)
+    return prompt_chars // 4 + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """Budget of units per minute that refills continuously, unlimited if per_minute <= 0"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be taken, a request larger than the bucket waits for a full one"""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) * 60.0 / self.capacity
+
+    def take(self, amount: float) -> None:
+        if not self.unlimited:
+            self._refill()
+            self.level -= amount
+
+    def give_back(self, amount: float) -> None:
+        """Return units, negative amounts charge units used on top of the estimate"""
+        if not self.unlimited:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60.0)
+        self.updated = now
+
+
+class _Ticket:
+    __slots__ = ("generator", "seq")
+
+    def __init__(self, generator: str, seq: int):
+        self.generator = generator
+        self.seq = seq
+
+
+class ProviderLimiter:
+    """Requests and tokens per minute limit of one provider shared by all generators
+
+    Waiting requests are granted in weighted fair order: the next request
+    comes from the generator with the least requests granted relative to its
+    priority, ties go to the request that waited longest.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, priorities: Dict[str, float]):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.priorities = priorities
+        self._granted: Dict[str, float] = defaultdict(float)
+        self._waiting: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.requests.unlimited and self.tokens.unlimited
+
+    def acquire(self, generator: str, tokens: int) -> None:
+        """Block until the provider quota allows a request of about this many tokens"""
+        if self.unlimited:
+            return
+        with self._cond:
+            if generator not in self._granted:
+                # A generator joining late starts level with the others instead of far behind
+                active = [self._share(ticket.generator) for ticket in self._waiting]
+                self._granted[generator] = min(active, default=0.0) * self._priority(generator)
+            ticket = _Ticket(generator, next(self._seq))
+            self._waiting.append(ticket)
+            try:
+                while True:
+                    head = min(self._waiting, key=lambda t: (self._share(t.generator), t.seq))
+                    if head is not ticket:
+                        self._cond.wait()
+                        continue
+                    delay = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                    if delay <= 0:
+                        self.requests.take(1)
+                        self.tokens.take(tokens)
+                        self._granted[generator] += 1
+                        return
+                    self._cond.wait(delay)
+            finally:
+                self._waiting.remove(ticket)
+                self._cond.notify_all()
+
+    def settle(self, estimated_tokens: int, used_tokens: int) -> None:
+        """Correct the token budget once the real usage of a request is known"""
+        if self.tokens.unlimited:
+            return
+        with self._cond:
+            self.tokens.give_back(estimated_tokens - used_tokens)
+            self._cond.notify_all()
+
+    def _priority(self, generator: str) -> float:
+        return max(float(self.priorities.get(generator, 1)), 1e-6)
+
+    def _share(self, generator: str) -> float:
+        return self._granted[generator] / self._priority(generator)
+
+
+class _RateLimitedCompletions:
+    def __init__(self, completions, limiter: ProviderLimiter, generator: str):
+        self._completions = completions
+        self._limiter = limiter
+        self._generator = generator
+
+    def create(self, *args, **kwargs):
+        estimated = estimate_tokens(kwargs.get("messages") or [], kwargs.get("max_tokens"))
+        self._limiter.acquire(self._generator, estimated)
+        response = self._completions.create(*args, **kwargs)
+        usage = getattr(response, "usage", None)
+        if usage is not None and getattr(usage, "total_tokens", None):
+            self._limiter.settle(estimated, usage.total_tokens)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+
+
+class _RateLimitedChat:
+    def __init__(self, chat, limiter: ProviderLimiter, generator: str):
+        self._chat = chat
+        self.completions = _RateLimitedCompletions(chat.completions, limiter, generator)
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+
+class RateLimitedClient:
+    """OpenAI client whose chat completions wait for the provider quota"""
+
+    def __init__(self, client, limiter: ProviderLimiter, generator: str):
+        self._client = client
+        self.chat = _RateLimitedChat(client.chat, limiter, generator)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class SynthesisScheduler:
+    """Process-wide rate limits for the L2 data synthesis generators
+
+    The preference, self-QA, diversity and context generators run at the same
+    time and send their requests through one limiter per provider base URL.
+    L2_LLM_RPM and L2_LLM_TPM set the requests and tokens per minute of every
+    provider, 0 means unlimited. L2_LLM_PROVIDER_LIMITS overrides them per base
+    URL, e.g. {"https://api.openai.com/v1": {"rpm": 500, "tpm": 200000}}.
+    L2_SYNTHESIS_PRIORITIES sets the share of each generator.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        provider_limits: Optional[Dict[str, dict]] = None,
+        priorities: Optional[Dict[str, float]] = None,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.provider_limits = {
+            base_url.rstrip("/"): limits for base_url, limits in (provider_limits or {}).items()
+        }
+        self.priorities = {**DEFAULT_PRIORITIES, **(priorities or {})}
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "SynthesisScheduler":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    config = Config.from_env()
+                    cls._instance = cls(
+                        requests_per_minute=float(config.get("L2_LLM_RPM", 0)),
+                        tokens_per_minute=float(config.get("L2_LLM_TPM", 0)),
+                        provider_limits=cls._parse_json(config.get("L2_LLM_PROVIDER_LIMITS")),
+                        priorities=cls._parse_json(config.get("L2_SYNTHESIS_PRIORITIES")),
+                    )
+        return cls._instance
+
+    def limiter(self, base_url: str) -> ProviderLimiter:
+        """Get the limiter of a provider, created on first use"""
+        key = str(base_url).rstrip("/")
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limits = self.provider_limits.get(key, {})
+                limiter = ProviderLimiter(
+                    float(limits.get("rpm", self.requests_per_minute)),
+                    float(limits.get("tpm", self.tokens_per_minute)),
+                    self.priorities,
+                )
+                self._limiters[key] = limiter
+                logger.info(
+                    f"Synthesis rate limit for {key}: "
+                    f"{limiter.requests.capacity:g} rpm, {limiter.tokens.capacity:g} tpm"
+                )
+            return limiter
+
+    def wrap(self, client, generator: str):
+        """Route the chat completions of an OpenAI client through the limiter of its provider
+
+        Generators wrap their client once, so all generators running concurrently
+        against the same provider share its request quota.
+
+        Args:
+            client: OpenAI client of a generator, None is passed through
+            generator: Name of the generator, its share follows L2_SYNTHESIS_PRIORITIES
+        """
+        if client is None:
+            return None
+        return RateLimitedClient(client, self.limiter(client.base_url), generator)
+
+    @staticmethod
+    def _parse_json(value) -> Optional[dict]:
+        if not value:
+            return None
+        if isinstance(value, dict):
+            return value
+        try:
+            return json.loads(value)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring invalid synthesis scheduler setting: {value}")
+            return None
@@ -16,6 +16,7 @@ import logging
 from lpm_kernel.L2.data_pipeline.data_prep.preference.preference_QA_generate import PreferenceQAGenerator
 from lpm_kernel.L2.data_pipeline.data_prep.diversity.diversity_data_generator import DiversityDataGenerator
 from lpm_kernel.L2.data_pipeline.data_prep.selfqa.selfqa_generator import SelfQA
+from lpm_kernel.L2.data_pipeline.data_prep.checkpoint import iter_json_items, write_json_array
 import json
 
 class L2Generator:
@@ -172,9 +173,7 @@ class L2Generator:
             preferred_language=self.preferred_lang,
             is_cot=self.is_cot
         )
-        q_a_list = selfqa.generate_qa()
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(q_a_list, f, ensure_ascii=False, indent=4)
+        selfqa.generate_qa(output_path)
     
     def merge_json_files(self, data_output_base_dir: str):
         preference_output_path = os.path.join(data_output_base_dir, "preference.json")
@@ -187,24 +186,17 @@ class L2Generator:
                 selfqa_output_path,
         ]
 
-        merged_data = []
-
-        for file_path in json_files_to_merge:
-            if file_path and os.path.exists(file_path):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_data = json.load(f)
-                        if isinstance(file_data, list):
-                            merged_data.extend(file_data)
-                        else:
-                            merged_data.append(file_data)
-                except Exception as e:
-                    logging.error(f"Error merging file {file_path}: {str(e)}")
-
-        # Save the merged data
+        def merged_items():
+            for file_path in json_files_to_merge:
+                if file_path and os.path.exists(file_path):
+                    try:
+                        yield from iter_json_items(file_path)
+                    except Exception as e:
+                        logging.error(f"Error merging file {file_path}: {str(e)}")
+
+        # Save the merged data, streamed so no input file is loaded as a whole
         merged_output_path = os.path.join(data_output_base_dir, "merged.json")
-        with open(merged_output_path, 'w', encoding='utf-8') as f:
-            json.dump(merged_data, f, ensure_ascii=False, indent=2)
+        write_json_array(merged_output_path, merged_items())
     
     def _release_ollama_models(self):
         """Release Ollama models from memory to free up VRAM for training.
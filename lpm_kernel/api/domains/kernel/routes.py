@@ -12,6 +12,7 @@ from lpm_kernel.L1.serializers import NotesStorage, NoteSerializer
 from lpm_kernel.L1.utils import save_true_topics
 from lpm_kernel.api.common.responses import APIResponse
 from lpm_kernel.common.repository.database_session import DatabaseSession
+from lpm_kernel.file_data.document_manifest import DocumentManifest
 from lpm_kernel.kernel.chunk_service import ChunkService
 from lpm_kernel.kernel.l1.l1_manager import (
     generate_l1_from_l0,
@@ -19,6 +20,8 @@ from lpm_kernel.kernel.l1.l1_manager import (
     get_latest_status_bio,
     extract_notes_from_documents,
     document_service,
+    compute_shade_embeddings,
+    current_embedding_model,
 )
 from lpm_kernel.kernel.note_service import NoteService
 from lpm_kernel.models.l1 import (
@@ -75,7 +78,11 @@ def __store_shades(session, new_version: int, shades_list: list) -> None:
         logger.warning("No shades data found")
         return
 
-    for shade in shades_list:
+    # Embed shades once here so chat retrieval does not have to
+    embedding_model = current_embedding_model()
+    embeddings = compute_shade_embeddings(shades_list)
+
+    for shade, embedding in zip(shades_list, embeddings):
         shade_data = L1Shade(
             version=new_version,
             name=shade.name,
@@ -85,6 +92,8 @@ def __store_shades(session, new_version: int, shades_list: list) -> None:
             content_third_view=shade.content_third_view,
             desc_second_view=shade.desc_second_view,
             content_second_view=shade.content_second_view,
+            embedding=embedding,
+            embedding_model=embedding_model if embedding is not None else None,
             create_time=datetime.now(),
         )
         session.add(shade_data)
@@ -96,12 +105,15 @@ def __store_clusters(session, new_version: int, cluster_list: list) -> None:
         logger.warning("No clusters data found")
         return
 
-    for cluster in cluster_list:
+    for index, cluster in enumerate(cluster_list):
+        cluster_id = cluster.get("clusterId")
         cluster_data = L1Cluster(
             version=new_version,
-            cluster_id=cluster.get("clusterId"),
+            # New clusters have no id yet, give them one so later versions can refer to them
+            cluster_id=str(cluster_id) if cluster_id is not None else f"{new_version}-{index}",
             memory_ids=[m.get("memoryId") for m in cluster.get("memoryList", [])],
-            cluster_center=cluster.get("clusterCenter"),
+            cluster_center=cluster.get("centerEmbedding"),
+            shade=cluster.get("shade"),
             create_time=datetime.now(),
         )
         session.add(cluster_data)
@@ -201,6 +213,7 @@ def generate_l1():
         # 2. Store L1 data
         with DatabaseSession.session() as session:
             version_number = store_l1_data(session, result)
+        DocumentManifest().mark_in_l1(result.document_ids, result.embedding_model)
 
         # 3. Convert result to serializable format
         serializable_result = serialize_value(result.to_dict())
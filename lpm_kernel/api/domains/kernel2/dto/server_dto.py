@@ -22,6 +22,7 @@ class ServerStatus:
 
     is_running: bool  # if service is running
     process_info: Optional[ProcessInfo] = None  # process info
+    healthy: Optional[bool] = None  # if /health answered OK, None if not probed
 
     @classmethod
     def not_running(cls) -> "ServerStatus":
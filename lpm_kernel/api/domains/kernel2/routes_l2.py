@@ -63,6 +63,7 @@ def health_check():
                     "cpu_percent": status.process_info.cpu_percent,
                     "memory_percent": status.process_info.memory_percent,
                     "uptime": time.time() - status.process_info.create_time,
+                    "healthy": status.healthy,
                 }
             )
         )
@@ -2,9 +2,17 @@
 service about knowledge retrieve
 """
 import logging
+import threading
 from typing import List, Tuple, Dict, Any, Optional
+import numpy as np
 from lpm_kernel.file_data.embedding_service import EmbeddingService, ChunkDTO
-from lpm_kernel.kernel.l1.l1_manager import get_latest_global_bio
+from lpm_kernel.kernel.l1.l1_manager import (
+    current_embedding_model,
+    get_latest_l1_version,
+    get_shades_with_embeddings,
+    update_shade_embeddings,
+    shade_embedding_text,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +76,81 @@ class L0KnowledgeRetriever:
             return ""
 
 
+class ShadeEmbeddingIndex:
+    """In-memory index of the latest L1 version's shade embeddings
+
+    Stored embeddings of another embedding model than the configured one are
+    computed again, so the index can be compared with query embeddings.
+    """
+
+    def __init__(self, embedding_service: EmbeddingService):
+        """
+        init shade embedding index
+
+        Args:
+            embedding_service: Embedding service instance, used for shades stored without embedding
+        """
+        self.embedding_service = embedding_service
+        self.version: Optional[int] = None
+        self.embedding_model: Optional[str] = None
+        self.shades: List[Dict] = []
+        self.matrix: Optional[np.ndarray] = None  # row-normalized shade embeddings
+        self._lock = threading.Lock()
+
+    def get(self) -> Tuple[List[Dict], Optional[np.ndarray]]:
+        """
+        get shades and their normalized embedding matrix, reloading when a new L1 version
+        exists or the embedding model changed
+
+        Returns:
+            Tuple[List[Dict], Optional[np.ndarray]]: shades and matrix with one row per shade
+        """
+        latest_version = get_latest_l1_version()
+        embedding_model = current_embedding_model()
+        with self._lock:
+            if latest_version != self.version or embedding_model != self.embedding_model:
+                # Only a successful load is recorded, a failed one is retried on the next call
+                self.shades, self.matrix = self._load(latest_version, embedding_model)
+                self.version = latest_version
+                self.embedding_model = embedding_model
+            return self.shades, self.matrix
+
+    def _load(
+        self, version: Optional[int], embedding_model: str
+    ) -> Tuple[List[Dict], Optional[np.ndarray]]:
+        if version is None:
+            return [], None
+
+        shades, embeddings, embedding_models = get_shades_with_embeddings(version)
+        if not shades:
+            logger.info(f"No shades found for L1 version {version}")
+            return [], None
+
+        # Shades stored without embedding, or embedded with another model, are embedded once and saved
+        missing = [
+            i
+            for i, embedding in enumerate(embeddings)
+            if embedding is None or embedding_models[i] != embedding_model
+        ]
+        if missing:
+            texts = [
+                shade_embedding_text(shades[i]["name"], shades[i]["desc_third_view"])
+                for i in missing
+            ]
+            computed = self.embedding_service.llm_client.get_embedding(texts)
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding.tolist()
+            update_shade_embeddings(
+                {shades[i]["id"]: embeddings[i] for i in missing}, embedding_model
+            )
+
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        logger.info(f"Loaded {len(shades)} shade embeddings for L1 version {version}")
+        return shades, matrix / norms
+
+
 class L1KnowledgeRetriever:
     """L1 knowledge retriever"""
 
@@ -88,6 +171,7 @@ class L1KnowledgeRetriever:
         self.embedding_service = embedding_service
         self.similarity_threshold = similarity_threshold
         self.max_shades = max_shades
+        self.shade_index = ShadeEmbeddingIndex(embedding_service)
 
     def retrieve(self, query: str) -> str:
         """
@@ -100,44 +184,38 @@ class L1KnowledgeRetriever:
             str: structured knowledge content, or empty string if no relevant knowledge found
         """
         try:
-            # get global bio shades
-            global_bio = get_latest_global_bio()
-            if not global_bio or not global_bio.shades:
+            # get shade embeddings of the latest L1 version
+            shades, shade_matrix = self.shade_index.get()
+            if not shades or shade_matrix is None:
                 logger.info("Global Bio not found or Shades is empty")
                 return ""
 
             # get query embedding
-            query_embedding = self.embedding_service.get_embedding(query)
-            if not query_embedding:
+            query_embedding = self.embedding_service.llm_client.get_embedding([query])
+            if query_embedding is None or len(query_embedding) == 0:
                 logger.error("Failed to get embedding for query text")
                 return ""
 
-            # get all shades' embeddings
-            shade_embeddings = []
-            for shade in global_bio.shades:
-                shade_text = (
-                    f"{shade.get('title', '')} - {shade.get('description', '')}"
+            query_vector = np.asarray(query_embedding[0], dtype=np.float32)
+            if query_vector.shape[0] != shade_matrix.shape[1]:
+                # The embedding model changed since the index was loaded, reloaded on the next call
+                logger.warning(
+                    f"Query embedding dimension {query_vector.shape[0]} does not match "
+                    f"shade embedding dimension {shade_matrix.shape[1]}"
                 )
-                embedding = self.embedding_service.get_embedding(shade_text)
-                if embedding:
-                    shade_embeddings.append((shade, embedding))
-
-            if not shade_embeddings:
-                logger.info("No available Shades embeddings found")
+                return ""
+            query_norm = np.linalg.norm(query_vector)
+            if query_norm == 0:
                 return ""
 
-            # calculate similarity and sort
-            similar_shades = []
-            for shade, embedding in shade_embeddings:
-                similarity = self.embedding_service.calculate_similarity(
-                    query_embedding, embedding
-                )
-                if similarity >= self.similarity_threshold:
-                    similar_shades.append((shade, similarity))
-
-            # sort according to similarity and limit the number of returned shades
-            similar_shades.sort(key=lambda x: x[1], reverse=True)
-            similar_shades = similar_shades[: self.max_shades]
+            # cosine similarity against all shades at once, then top-k
+            similarities = shade_matrix @ (query_vector / query_norm)
+            top_indices = np.argsort(-similarities)[: self.max_shades]
+            similar_shades = [
+                (shades[i], float(similarities[i]))
+                for i in top_indices
+                if similarities[i] >= self.similarity_threshold
+            ]
 
             if not similar_shades:
                 return ""
@@ -145,8 +223,8 @@ class L1KnowledgeRetriever:
             # structured output
             shade_parts = []
             for shade, similarity in similar_shades:
-                shade_text = f"Shade: {shade.get('title', '')}\n"
-                shade_text += f"Description: {shade.get('description', '')}\n"
+                shade_text = f"Shade: {shade.get('name', '')}\n"
+                shade_text += f"Description: {shade.get('desc_third_view', '')}\n"
                 shade_text += f"Similarity: {similarity:.2f}"
                 shade_parts.append(shade_text)
 
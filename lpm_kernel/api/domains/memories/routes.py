@@ -1,12 +1,14 @@
 from flask import Blueprint, request, jsonify
 from lpm_kernel.api.common.responses import APIResponse
 from lpm_kernel.file_data.memory_service import StorageService
+from lpm_kernel.file_data.upload_queue import UploadQueue
 from lpm_kernel.configs.config import Config
 from lpm_kernel.common.logging import logger
 from lpm_kernel.file_data.document_service import DocumentService
 
 memories_bp = Blueprint("memories", __name__)
 storage_service = StorageService(Config.from_env())
+upload_queue = UploadQueue.get_instance(storage_service)
 
 # Allowed file formats
 ALLOWED_EXTENSIONS = {"txt", "pdf", "md"}
@@ -17,10 +19,35 @@ def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def validate_upload(file):
+    """Return an error message if the uploaded file cannot be accepted, None otherwise"""
+    if file.filename == "":
+        return "No file was selected"
+    if not allowed_file(file.filename):
+        return f'Unsupported file format. Only the following formats are allowed: {", ".join(ALLOWED_EXTENSIONS)}'
+    return None
+
+
+def enqueue_upload(file, metadata):
+    """Store an upload and queue its extraction, returns the memory dict and the job
+
+    Raises:
+        ValueError: if file already exists
+    """
+    memory = storage_service.store_upload(file, metadata)
+    job = upload_queue.submit(memory.id, memory.name, metadata)
+    result = memory.to_dict()
+    result["job"] = job.to_dict()
+    return result, job
+
+
 @memories_bp.route("/api/memories/file", methods=["POST"])
 def upload_file():
     """
     File upload API
+
+    The file is stored and registered right away, its document is created by a
+    background job whose status is available from /api/memories/jobs/<job_id>
     """
     try:
         logger.info("Starting to process file upload request")
@@ -31,27 +58,20 @@ def upload_file():
             return APIResponse.error(message="No file was uploaded", code=400)
 
         file = request.files["file"]
-        if file.filename == "":
-            logger.warning("Filename is empty")
-            return APIResponse.error(message="No file was selected", code=400)
-
         logger.info(f"Received file: {file.filename}")
 
-        # Validate file format
-        if not allowed_file(file.filename):
-            logger.warning(f"Unsupported file format: {file.filename}")
-            return APIResponse.error(
-                message=f'Unsupported file format. Only the following formats are allowed: {", ".join(ALLOWED_EXTENSIONS)}',
-                code=400,
-            )
+        # Validate file name and format
+        error = validate_upload(file)
+        if error:
+            logger.warning(f"Invalid upload {file.filename}: {error}")
+            return APIResponse.error(message=error, code=400)
 
         # Get metadata
         metadata = request.form.to_dict() if request.form else None
         logger.info(f"File metadata: {metadata}")
 
         try:
-            # Save file and process document
-            memory, document = storage_service.save_file(file, metadata)
+            result, job = enqueue_upload(file, metadata)
         except ValueError as e:
             # Handle case where file already exists
             logger.warning(f"File upload failed: {str(e)}")
@@ -60,28 +80,14 @@ def upload_file():
                 code=409,  # Use 409 Conflict status code to indicate resource conflict
             )
 
-        # Prepare response data
-        result = memory.to_dict()
-        if document:
-            result["document"] = {
-                "id": document.id,
-                "name": document.name,
-                "title": document.title,
-                "mime_type": document.mime_type,
-                "document_size": document.document_size,
-                "extract_status": document.extract_status.value
-                if document.extract_status
-                else None,
-                "embedding_status": document.embedding_status.value
-                if document.embedding_status
-                else None,
-                "create_time": document.create_time.isoformat()
-                if document.create_time
-                else None,
-            }
-
-        logger.info("File upload processing completed")
-        return APIResponse.success(data=result, message="Upload successful")
+        # Small files are usually done within a moment, answer with the finished job then
+        wait_seconds = float(Config.from_env().get("UPLOAD_WAIT_SECONDS", 2))
+        if wait_seconds > 0 and upload_queue.wait(job, wait_seconds):
+            result = storage_service.get_memory(job.memory_id).to_dict()
+            result["job"] = job.to_dict()
+
+        logger.info(f"File upload accepted, job {job.job_id} {job.status.value}")
+        return APIResponse.success(data=result, message="Upload accepted")
 
     except ValueError as e:
         logger.error(f"Request parameter error: {str(e)}")
@@ -91,6 +97,68 @@ def upload_file():
         return APIResponse.error(message=f"Internal server error: {str(e)}", code=500)
 
 
+@memories_bp.route("/api/memories/files", methods=["POST"])
+def upload_files():
+    """
+    Batch file upload API, every file gets its own job in the upload queue
+    """
+    try:
+        files = request.files.getlist("files")
+        if not files:
+            logger.warning("No files in request")
+            return APIResponse.error(message="No file was uploaded", code=400)
+
+        metadata = request.form.to_dict() if request.form else None
+        logger.info(f"Received {len(files)} files for batch upload")
+
+        results = []
+        for file in files:
+            error = validate_upload(file)
+            if error:
+                results.append({"name": file.filename, "error": error, "code": 400})
+                continue
+            try:
+                result, _ = enqueue_upload(file, metadata)
+                results.append(result)
+            except ValueError as e:
+                results.append({"name": file.filename, "error": str(e), "code": 409})
+
+        accepted = sum(1 for result in results if "job" in result)
+        logger.info(f"Batch upload accepted {accepted}/{len(files)} files")
+        return APIResponse.success(
+            data=results, message=f"Accepted {accepted} of {len(files)} files"
+        )
+
+    except Exception as e:
+        logger.error(f"Internal server error: {str(e)}", exc_info=True)
+        return APIResponse.error(message=f"Internal server error: {str(e)}", code=500)
+
+
+@memories_bp.route("/api/memories/jobs/<job_id>", methods=["GET"])
+def get_upload_job(job_id):
+    """
+    Upload job status API
+    """
+    job = upload_queue.get(job_id)
+    if job is None:
+        return APIResponse.error(message=f"Upload job '{job_id}' not found", code=404)
+    return APIResponse.success(data=job.to_dict())
+
+
+@memories_bp.route("/api/memories/jobs", methods=["GET"])
+def get_upload_jobs():
+    """
+    Status of several upload jobs, ids are passed comma separated in ?ids=
+    """
+    job_ids = [job_id for job_id in request.args.get("ids", "").split(",") if job_id]
+    if not job_ids:
+        return APIResponse.error(message="No job ids were given", code=400)
+    jobs = upload_queue.get_many(job_ids)
+    return APIResponse.success(
+        data={job_id: job.to_dict() if job else None for job_id, job in jobs.items()}
+    )
+
+
 @memories_bp.route("/api/memories/file/<filename>", methods=["DELETE"])
 def delete_file(filename):
     """
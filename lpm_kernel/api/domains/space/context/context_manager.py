@@ -103,6 +103,27 @@ class SpaceContextManager:
         self.save_message(message_dto)
         return message_dto
 
+    def participant_view(self, participant: str) -> "SpaceContextManager":
+        """
+        Get a read-only view of the discussion for one participant's turn
+
+        The view holds its own current participant and a snapshot of the
+        messages so far, so turns of one round can build their prompts
+        concurrently. Messages must still be created on this manager.
+
+        Args:
+            participant: Participant endpoint
+
+        Returns:
+            Context manager view for the participant
+        """
+        view = SpaceContextManager.__new__(SpaceContextManager)
+        view.space_dto = self.space_dto.model_copy(update={"messages": list(self.space_dto.messages)})
+        view.participant_positions = dict(self.participant_positions)
+        view.current_round = self.current_round
+        view.current_participant = participant
+        return view
+
     def advance_round(self) -> None:
         """Advance to next discussion round"""
         self.current_round += 1
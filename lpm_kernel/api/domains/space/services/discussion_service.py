@@ -3,8 +3,10 @@ Discussion service implementation
 """
 from calendar import c
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Optional, Any
 from datetime import datetime
+import time
 import uuid
 
 from lpm_kernel.api.domains.kernel2.dto.chat_dto import ChatRequest
@@ -13,7 +15,7 @@ from lpm_kernel.api.domains.kernel2.services.chat_service import chat_service
 from lpm_kernel.api.domains.kernel2.services.prompt_builder import BasePromptStrategy, KnowledgeEnhancedStrategy
 from lpm_kernel.configs.config import Config
 from urllib.parse import urlparse, urlunparse
-from openai import OpenAI
+from lpm_kernel.common.http_client import OpenAIClientRegistry
 
 
 from ..context.context_manager import SpaceContextManager
@@ -39,6 +41,13 @@ class DiscussionService:
         """
         self._context_manager_factory = SpaceContextManagerFactory()
         self.max_rounds = 3  # Fixed 3 rounds of discussion
+
+        config = Config.from_env()
+        # "sequential": participants answer in turn and see the replies given earlier in the round
+        # "concurrent": participants of a round answer at once, each seeing the previous rounds
+        self.mode = str(config.get("SPACE_DISCUSSION_MODE", "sequential")).lower()
+        self.participant_timeout = float(config.get("SPACE_PARTICIPANT_TIMEOUT", 120))
+        self.max_concurrent_turns = int(config.get("SPACE_MAX_CONCURRENT_TURNS", 8))
         
     def start_discussion(self, space_dto: SpaceDTO) -> dict:
         """
@@ -95,6 +104,10 @@ class DiscussionService:
                 context_manager.advance_round()
                 logger.info(f"Starting discussion round {round_num + 1}" + "="*20)
                 
+                if self.mode == "concurrent":
+                    self._run_concurrent_round(space_dto, context_manager)
+                    continue
+
                 # Each participant speaks in turn
                 for participant in space_dto.participants:
                     message = self._process_participant_discussion(
@@ -116,12 +129,70 @@ class DiscussionService:
             logger.error(f"Discussion failed: {str(e)}")
             return False
             
-    def _get_client_for_endpoint(self, endpoint: str) -> Optional[Any]:
+    def _run_concurrent_round(self, space_dto: SpaceDTO, context_manager: SpaceContextManager) -> None:
+        """
+        Ask all participants of the current round at once
+
+        Every participant answers to the discussion as it stood at the start
+        of the round. Replies are saved as they arrive, so the Space status
+        shows the round's progress. Participants that do not answer within
+        participant_timeout seconds are skipped for this round, their late
+        replies are discarded.
+
+        Args:
+            space_dto: Space DTO object
+            context_manager: Context manager
+        """
+        round_num = context_manager.get_current_round()
+        participants = list(space_dto.participants)
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_concurrent_turns, len(participants))),
+            thread_name_prefix="space-turn",
+        )
+        try:
+            futures = {
+                executor.submit(
+                    self._request_participant_reply,
+                    context_manager.participant_view(participant),
+                    participant,
+                    self.participant_timeout,
+                ): participant
+                for participant in participants
+            }
+            deadline = time.monotonic() + self.participant_timeout
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    participant = futures[future]
+                    content = future.result()
+                    if not content:
+                        logger.warning(f"Participant {participant} failed to respond in round {round_num}")
+                        continue
+                    # Messages are created here only, the turns never write to the context
+                    context_manager.create_message(
+                        sender_endpoint=participant,
+                        content=content,
+                        message_type="discussion",
+                        round=round_num
+                    )
+            for future in pending:
+                logger.warning(
+                    f"Participant {futures[future]} did not respond within {self.participant_timeout}s in round {round_num}"
+                )
+        finally:
+            # Turns still running finish in the background, their results are not used
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_client_for_endpoint(self, endpoint: str, timeout: Optional[float] = None) -> Optional[Any]:
         """
         Get corresponding client based on endpoint
         
         Args:
             endpoint: Endpoint URL
+            timeout: Optional request timeout in seconds for remote endpoints
             
         Returns:
             Client for the corresponding endpoint, returns None for local endpoint (uses default client)
@@ -172,9 +243,10 @@ class DiscussionService:
         
         # Create a new client connection to the specified endpoint
         try:
-            client = OpenAI(
+            client = OpenAIClientRegistry.get_instance().get(
                 base_url=api_endpoint,
-                api_key="sk-no-key-required"
+                api_key="sk-no-key-required",
+                timeout=timeout
             )
             return client
         except Exception as e:
@@ -264,10 +336,40 @@ class DiscussionService:
         Returns:
             Created discussion message, returns None if failed
         """
+        # Set the current participant
+        context_manager.current_participant = participant
+
+        content = self._request_participant_reply(context_manager, participant)
+        if not content:
+            return None
+
         try:
-            # Set the current participant
-            context_manager.current_participant = participant
+            # Create and save the discussion message
+            return context_manager.create_message(
+                sender_endpoint=participant,
+                content=content,
+                message_type="discussion",
+                round=context_manager.get_current_round()
+            )
+        except Exception as e:
+            logger.error(f"Participant discussion failed for {participant}: {str(e)}", exc_info=True)
+            return None
+
+    def _request_participant_reply(
+        self, context_manager, participant: str, timeout: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Ask a participant for its reply without saving it
+        
+        Args:
+            context_manager: Context manager, or a participant view of it
+            participant: Participant endpoint
+            timeout: Optional request timeout in seconds
             
+        Returns:
+            Reply content, returns None if failed
+        """
+        try:
             # Create a chat request
             request = ChatRequest(
                 messages=[{"role": "user", "content": "Please share your thoughts"}],
@@ -275,14 +377,8 @@ class DiscussionService:
             )
             
             # Get the participant endpoint's corresponding client
-            client = self._get_client_for_endpoint(participant)
+            client = self._get_client_for_endpoint(participant, timeout=timeout)
             
-            # Log the context for this conversation round
-            # visible_messages = context_manager.get_context_for_participant(participant)
-            # logger.info(f"Context for participant {participant} in round {context_manager.get_current_round()}:")
-            # for msg in visible_messages:
-            #     logger.info(f"  Message from {msg.sender_endpoint}: {msg.content}..." if len(msg.content) > 100 else f"  Message from {msg.sender_endpoint}: {msg.content}")
-
             # Use chat_service to process the request, passing in ParticipantStrategy as the strategy chain
             response = chat_service.collect_stream_response(chat_service.chat(
                 request, 
@@ -308,13 +404,7 @@ class DiscussionService:
                 return None
             
             logger.info(f"Participant {participant} discussion content: {content}")
-            # Create and save the discussion message
-            return context_manager.create_message(
-                sender_endpoint=participant,
-                content=content,
-                message_type="discussion",
-                round=context_manager.get_current_round()
-            )
+            return content
             
         except Exception as e:
             logger.error(f"Participant discussion failed for {participant}: {str(e)}", exc_info=True)
@@ -139,27 +139,9 @@ class SpaceService:
                 return
 
             if result.get("success", False):
-                messages_dict = result.get("messages", [])
+                # Messages were saved one by one while the discussion ran,
+                # only the conclusion and the status are left to update
                 summary = result.get("summary", None)
-                
-                # Convert dictionaries to SpaceMessageDTO objects
-                messages = []
-                for msg_dict in messages_dict:
-                    msg = SpaceMessageDTO(
-                        id=msg_dict.get("id"),
-                        space_id=msg_dict.get("space_id"),
-                        sender_endpoint=msg_dict.get("sender_endpoint"),
-                        content=msg_dict.get("content"),
-                        message_type=msg_dict.get("message_type"),
-                        round=msg_dict.get("round"),
-                        create_time=datetime.fromisoformat(msg_dict.get("create_time")),
-                        role=msg_dict.get("role")
-                    )
-                    messages.append(msg)
-                
-                # Update Space messages and conclusion
-                if messages:
-                    space_dto.messages = messages
                 if summary:
                     space_dto.conclusion = summary
                     
@@ -197,11 +179,17 @@ class SpaceService:
             raise ValueError(f"Space not found: {space_id}")
 
         messages = self._repository.get_messages(space_id)
+        total_rounds = self._discussion_service.max_rounds
+        current_round = max([msg.round for msg in messages]) if messages else 0
 
         return {
-            "current_round": max([msg.round for msg in messages]) if messages else 0,
-            "total_rounds": 3,  # Fixed 3 rounds of discussion
+            "current_round": current_round,
+            "total_rounds": total_rounds,
             "message_count": len(messages),
+            # Opening, one reply per participant and round, and the summary
+            "expected_message_count": len(space_dto.participants) * total_rounds + 2,
+            "round_message_count": len([msg for msg in messages if current_round and msg.round == current_round]),
+            "status": space_dto.status,
             "is_completed": space_dto.status == SpaceDTO.STATUS_FINISHED,
             "last_message_time": messages[-1].create_time if messages else None
         }
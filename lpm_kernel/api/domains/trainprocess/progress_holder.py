@@ -1,6 +1,7 @@
 from enum import Enum
 import json
 import os
+import threading
 from typing import Dict, List, Optional
 
 from lpm_kernel.api.domains.trainprocess.progress_enum import Status
@@ -27,6 +28,8 @@ class TrainProgressHolder:
         if not self.progress_file.startswith(progress_dir):
             raise ValueError("Invalid progress file path")
         self.progress = TrainProgress()
+        # Steps of the training pipeline update and save progress from several threads
+        self._lock = threading.RLock()
 
         # Stage mapping for process steps
         self._stage_mapping = {
@@ -112,9 +115,10 @@ class TrainProgressHolder:
 
     def _save_progress(self):
         """Save progress"""
-        progress_dict = self.progress.to_dict()
-        with open(self.progress_file, "w") as f:
-            json.dump(progress_dict, f, indent=2)
+        with self._lock:
+            progress_dict = self.progress.to_dict()
+            with open(self.progress_file, "w") as f:
+                json.dump(progress_dict, f, indent=2)
 
     def is_step_completed(self, step: ProcessStep) -> bool:
         """Check if a step is completed"""
@@ -132,13 +136,38 @@ class TrainProgressHolder:
         """
         stage_name = self._stage_mapping[step]
         step_name = step.value
-        self.progress.update_progress(stage_name, step_name, status)
-        self._save_progress()
+        with self._lock:
+            self.progress.update_progress(stage_name, step_name, status)
+            self._save_progress()
+
+    def mark_step_progress(self, step: ProcessStep, finished: int, total: int):
+        """Mark a step as in progress and report how far it has got
+
+        The stage progress covers the completed steps plus the finished
+        fraction of this step.
+
+        Args:
+            step: The process step being worked on
+            finished: Number of finished work items of the step
+            total: Total number of work items of the step
+        """
+        stage_name = self._stage_mapping[step]
+        with self._lock:
+            stage_data = self.progress.stage_map[stage_name]
+            step_data = self.progress.steps_map[stage_name][step.value]
+            completed_steps = sum(
+                1 for s in stage_data["steps"] if s["completed"] and s is not step_data
+            )
+            fraction = finished / total if total else 1.0
+            stage_progress = (completed_steps + fraction) / len(stage_data["steps"]) * 100.0
+            self.progress.update_progress(stage_name, step.value, Status.IN_PROGRESS, stage_progress)
+            self._save_progress()
 
     def reset_progress(self):
         """Reset all progress"""
-        self.progress = TrainProgress()
-        self._save_progress()
+        with self._lock:
+            self.progress = TrainProgress()
+            self._save_progress()
 
     def get_last_successful_step(self) -> Optional[ProcessStep]:
         """Get the last successfully completed step"""
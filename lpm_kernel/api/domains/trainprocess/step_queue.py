@@ -0,0 +1,161 @@
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import update
+
+from lpm_kernel.api.domains.trainprocess.process_step import ProcessStep
+from lpm_kernel.api.domains.trainprocess.progress_enum import Status
+from lpm_kernel.common.repository.database_session import DatabaseSession
+from lpm_kernel.models.train_step_job import TrainStepJob
+
+from lpm_kernel.configs.logging import get_train_process_logger
+logger = get_train_process_logger()
+
+
+# Steps each step needs to have completed before it can run. The L2 data
+# synthesis steps only share the prepared notes, so they run side by side,
+# and the base model download overlaps with everything before training.
+STEP_DEPENDENCIES: Dict[ProcessStep, List[ProcessStep]] = {
+    ProcessStep.MODEL_DOWNLOAD: [],
+    ProcessStep.LIST_DOCUMENTS: [],
+    ProcessStep.GENERATE_DOCUMENT_EMBEDDINGS: [ProcessStep.LIST_DOCUMENTS],
+    ProcessStep.CHUNK_DOCUMENT: [ProcessStep.GENERATE_DOCUMENT_EMBEDDINGS],
+    ProcessStep.CHUNK_EMBEDDING: [ProcessStep.CHUNK_DOCUMENT],
+    ProcessStep.EXTRACT_DIMENSIONAL_TOPICS: [ProcessStep.CHUNK_EMBEDDING],
+    ProcessStep.GENERATE_BIOGRAPHY: [ProcessStep.EXTRACT_DIMENSIONAL_TOPICS],
+    ProcessStep.MAP_ENTITY_NETWORK: [ProcessStep.GENERATE_BIOGRAPHY],
+    ProcessStep.DECODE_PREFERENCE_PATTERNS: [ProcessStep.MAP_ENTITY_NETWORK],
+    ProcessStep.REINFORCE_IDENTITY: [ProcessStep.MAP_ENTITY_NETWORK],
+    ProcessStep.AUGMENT_CONTENT_RETENTION: [ProcessStep.MAP_ENTITY_NETWORK],
+    ProcessStep.TRAIN: [
+        ProcessStep.MODEL_DOWNLOAD,
+        ProcessStep.DECODE_PREFERENCE_PATTERNS,
+        ProcessStep.REINFORCE_IDENTITY,
+        ProcessStep.AUGMENT_CONTENT_RETENTION,
+    ],
+    ProcessStep.MERGE_WEIGHTS: [ProcessStep.TRAIN],
+    ProcessStep.CONVERT_MODEL: [ProcessStep.MERGE_WEIGHTS],
+}
+
+
+class TrainStepQueue:
+    """SQLite backed queue of the training steps of one model
+
+    Every step is a job row with the steps it depends on. Workers claim a
+    pending step whose dependencies are completed with a conditional update,
+    so a step is never handed out twice. Rows survive restarts: a run that
+    was interrupted resumes with exactly the steps that had not completed.
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        # Serializes claims of this process, the conditional update guards across processes
+        self._claim_lock = threading.Lock()
+
+    def prepare(self, completed_steps: Iterable[ProcessStep]) -> None:
+        """Create the step jobs of the model and reset every step not completed to pending
+
+        Args:
+            completed_steps: Steps whose results are already in place and are skipped,
+                a step is only skipped if everything it depends on is skipped too
+        """
+        completed_steps = set(completed_steps)
+        completed = set()
+        # STEP_DEPENDENCIES lists every step after its dependencies
+        for step, dependencies in STEP_DEPENDENCIES.items():
+            if step in completed_steps and all(d.value in completed for d in dependencies):
+                completed.add(step.value)
+        with DatabaseSession.session() as session:
+            jobs = {
+                job.step: job
+                for job in session.query(TrainStepJob)
+                .filter(TrainStepJob.model_name == self.model_name)
+                .all()
+            }
+            for step, dependencies in STEP_DEPENDENCIES.items():
+                job = jobs.get(step.value)
+                if job is None:
+                    job = TrainStepJob(model_name=self.model_name, step=step.value, attempts=0)
+                    session.add(job)
+                elif job.status == Status.IN_PROGRESS.value:
+                    logger.info(f"Step {step.value} was interrupted, it will run again")
+                job.depends_on = [dependency.value for dependency in dependencies]
+                if step.value in completed:
+                    job.status = Status.COMPLETED.value
+                else:
+                    job.status = Status.PENDING.value
+                    job.worker = None
+                    job.error = None
+                    job.started_at = None
+                    job.finished_at = None
+            session.commit()
+
+    def ready_steps(self) -> List[ProcessStep]:
+        """Pending steps whose dependencies are all completed, in pipeline order"""
+        statuses = self.statuses()
+        ready = [
+            step
+            for step, dependencies in STEP_DEPENDENCIES.items()
+            if statuses.get(step) == Status.PENDING
+            and all(statuses.get(dependency) == Status.COMPLETED for dependency in dependencies)
+        ]
+        order = ProcessStep.get_ordered_steps()
+        return sorted(ready, key=order.index)
+
+    def claim(self, worker: Optional[str] = None) -> Optional[ProcessStep]:
+        """Mark the first ready step in progress and return it, None if no step is ready"""
+        worker = worker or f"{os.getpid()}:{threading.current_thread().name}"
+        with self._claim_lock:
+            for step in self.ready_steps():
+                with DatabaseSession.session() as session:
+                    result = session.execute(
+                        update(TrainStepJob)
+                        .where(
+                            TrainStepJob.model_name == self.model_name,
+                            TrainStepJob.step == step.value,
+                            TrainStepJob.status == Status.PENDING.value,
+                        )
+                        .values(
+                            status=Status.IN_PROGRESS.value,
+                            worker=worker,
+                            attempts=TrainStepJob.attempts + 1,
+                            started_at=datetime.now(),
+                            finished_at=None,
+                            error=None,
+                        )
+                    )
+                    session.commit()
+                if result.rowcount == 1:
+                    return step
+        return None
+
+    def complete(self, step: ProcessStep) -> None:
+        self._finish(step, Status.COMPLETED)
+
+    def fail(self, step: ProcessStep, error: Optional[str] = None) -> None:
+        self._finish(step, Status.FAILED, error)
+
+    def suspend(self, step: ProcessStep) -> None:
+        """Return a step to the queue, it runs again on the next start"""
+        self._finish(step, Status.PENDING)
+
+    def statuses(self) -> Dict[ProcessStep, Status]:
+        with DatabaseSession.session() as session:
+            rows = session.query(TrainStepJob.step, TrainStepJob.status).filter(
+                TrainStepJob.model_name == self.model_name
+            )
+            return {ProcessStep(step): Status(status) for step, status in rows}
+
+    def _finish(self, step: ProcessStep, status: Status, error: Optional[str] = None) -> None:
+        with DatabaseSession.session() as session:
+            session.execute(
+                update(TrainStepJob)
+                .where(
+                    TrainStepJob.model_name == self.model_name,
+                    TrainStepJob.step == step.value,
+                )
+                .values(status=status.value, error=error, finished_at=datetime.now())
+            )
+            session.commit()
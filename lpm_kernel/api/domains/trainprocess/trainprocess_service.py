@@ -9,7 +9,7 @@ from lpm_kernel.L2.l2_generator import L2Generator
 from lpm_kernel.L2.utils import save_hf_model
 from lpm_kernel.api.common.responses import APIResponse
 from lpm_kernel.api.domains.loads.services import LoadService
-from lpm_kernel.kernel.chunk_service import ChunkService
+from lpm_kernel.kernel.chunk_service import ChunkBatchWriter, ChunkService
 from lpm_kernel.kernel.l1.l1_manager import (
     extract_notes_from_documents,
     document_service,
@@ -19,11 +19,16 @@ from lpm_kernel.kernel.l1.l1_manager import (
 from lpm_kernel.api.common.script_executor import ScriptExecutor
 from lpm_kernel.configs.config import Config
 from lpm_kernel.file_data.chunker import DocumentChunker
+from lpm_kernel.file_data.document_manifest import DocumentManifest
+from lpm_kernel.api.services.user_llm_config_service import UserLLMConfigService
+from lpm_kernel.common.llm import embedding_model_key
 from lpm_kernel.kernel.l1.l1_manager import generate_l1_from_l0
 import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from lpm_kernel.api.domains.trainprocess.progress_enum import Status
 from lpm_kernel.api.domains.trainprocess.process_step import ProcessStep
 from lpm_kernel.api.domains.trainprocess.progress_holder import TrainProgressHolder
+from lpm_kernel.api.domains.trainprocess.step_queue import TrainStepQueue
 from lpm_kernel.api.domains.trainprocess.training_params_manager import TrainingParamsManager
 from lpm_kernel.common.repository.database_session import DatabaseSession
 from lpm_kernel.api.domains.kernel.routes import store_l1_data
@@ -32,6 +37,15 @@ import subprocess
 from lpm_kernel.configs.logging import get_train_process_logger, TRAIN_LOG_FILE
 logger = get_train_process_logger()
 
+# Output directory of the L2 data synthesis steps, relative to the working directory
+L2_DATA_OUTPUT_DIR = "resources/L2/data"
+
+
+def l2_data_output_dir() -> str:
+    """Absolute path of the L2 data synthesis output directory"""
+    return os.path.join(os.getcwd(), L2_DATA_OUTPUT_DIR)
+
+
 class TrainProcessService:
     """Training process service (singleton pattern)"""
     
@@ -56,6 +70,8 @@ class TrainProcessService:
             # Initialize stop flag
             self.is_stopped = False
             self.current_step = None
+            # Steps currently running, several run at once
+            self.running_steps = set()
             
             # Initialize L2 data dictionary
             self.l2_data = {
@@ -68,6 +84,8 @@ class TrainProcessService:
                 "config_path": None
             }
             self.l2_data_prepared = False
+            # The L2 synthesis steps run concurrently and share the prepared data
+            self._l2_data_lock = threading.Lock()
         
         # Update model name and progress instance if model name changes
         if current_model_name != self.model_name:
@@ -140,39 +158,81 @@ class TrainProcessService:
             return False
 
     def process_chunks(self) -> bool:
-        """Process document chunks"""
+        """Process document chunks, skipping documents unchanged since they were last chunked"""
         try:
             # Mark step as in progress
             self.progress.mark_step_status(ProcessStep.CHUNK_DOCUMENT, Status.IN_PROGRESS)
             config = Config.from_env()
+            chunk_size = int(config.get("DOCUMENT_CHUNK_SIZE"))
+            overlap = int(config.get("DOCUMENT_CHUNK_OVERLAP"))
             chunker = DocumentChunker(
-                chunk_size=int(config.get("DOCUMENT_CHUNK_SIZE")),
-                overlap=int(config.get("DOCUMENT_CHUNK_OVERLAP")),
+                chunk_size=chunk_size,
+                overlap=overlap,
+                workers=int(config.get("CHUNK_WORKERS", 0)) or None,
             )
+            chunk_params = DocumentManifest.chunk_params(chunk_size, overlap)
             documents = document_service.list_documents()
-            processed, failed = 0, 0
+            manifest = DocumentManifest()
+            entries = manifest.get_entries([doc.id for doc in documents])
+            processed, skipped, failed = 0, 0, 0
+            content_hashes = {}
+            changed_doc_ids = set()
 
-            chunk_service = ChunkService()
+            def on_batch_written(chunks_by_document, replaced_chunk_ids):
+                # Old chunks were replaced, drop their embeddings and stale L0 analysis
+                document_service.delete_chunk_embeddings(replaced_chunk_ids)
+                for doc_id in chunks_by_document:
+                    if doc_id in changed_doc_ids:
+                        document_service.reset_document_analysis(doc_id)
+                manifest.mark_chunked(
+                    {doc_id: content_hashes[doc_id] for doc_id in chunks_by_document},
+                    chunk_params,
+                )
+
+            docs_to_split = []
             for doc in documents:
-                try:
-                    if not doc.raw_content:
-                        logger.warning(f"Document {doc.id} has no content, skipping...")
-                        failed += 1
-                        continue
+                if not doc.raw_content:
+                    logger.warning(f"Document {doc.id} has no content, skipping...")
+                    failed += 1
+                    continue
 
-                    # Split into chunks and save
-                    chunks = chunker.split(doc.raw_content)
-                    for chunk in chunks:
-                        chunk.document_id = doc.id
-                        chunk_service.save_chunk(chunk)
+                content_hash = DocumentManifest.content_hash(doc.raw_content)
+                entry = entries.get(doc.id)
+                if entry and entry["chunk_fingerprint"] == DocumentManifest.chunk_fingerprint(
+                    content_hash, chunk_params
+                ):
+                    skipped += 1
+                    continue
+                content_hashes[doc.id] = content_hash
+                if entry and entry["content_hash"] != content_hash:
+                    changed_doc_ids.add(doc.id)
+                docs_to_split.append(doc)
 
+            # Splitting runs here while a background thread writes finished batches
+            writer = ChunkBatchWriter(
+                ChunkService(),
+                batch_size=int(config.get("CHUNK_WRITE_BATCH_SIZE", 1000)),
+                on_batch_written=on_batch_written,
+            )
+            with writer:
+                # Split across processes and queue each document's chunks as they arrive
+                for doc_id, chunks in chunker.split_documents(
+                    (doc.id, doc.raw_content) for doc in docs_to_split
+                ):
+                    if chunks is None:
+                        failed += 1
+                        continue
+                    writer.add(doc_id, chunks)
                     processed += 1
-                    logger.info(
-                        f"Document {doc.id} processed: {len(chunks)} chunks created"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to process document {doc.id}: {str(e)}")
-                    failed += 1      
+                    logger.info(f"Document {doc_id} processed: {len(chunks)} chunks created")
+            # A batch can fail after its chunks replaced the old ones, so the
+            # manifest must not claim the old chunks and embeddings anymore
+            manifest.mark_stale(writer.failed_document_ids)
+            processed -= len(writer.failed_document_ids)
+            failed += len(writer.failed_document_ids)
+            logger.info(
+                f"Chunking finished: {processed} processed, {skipped} unchanged, {failed} failed"
+            )
             self.progress.mark_step_status(ProcessStep.CHUNK_DOCUMENT, Status.COMPLETED)
             return True
         except Exception as e:
@@ -181,25 +241,54 @@ class TrainProcessService:
             return False
 
     def chunk_embedding(self) -> bool:
-        """Process embeddings for all document chunks"""
+        """Process embeddings for the chunks of documents not yet embedded with the current model"""
         try:
             # Mark step as in progress
             self.progress.mark_step_status(ProcessStep.CHUNK_EMBEDDING, Status.IN_PROGRESS)
             documents = self.list_documents()
-            for doc in documents:
-                doc_id = doc.get("id")
-                try:
-                    # Directly call document service to generate chunk embeddings
-                    processed_chunks = document_service.generate_document_chunk_embeddings(doc_id)
-                    if not processed_chunks:
-                        logger.warning(f"No chunks to process for document: {doc_id}")
-                        continue
-                except Exception as e:
-                    logger.error(
-                        f"Generate chunk embeddings failed for doc_id: {doc_id}: {str(e)}"
-                    )
-                    self.progress.mark_step_status(ProcessStep.CHUNK_EMBEDDING, Status.FAILED)
-                    return False
+            doc_ids = [doc.get("id") for doc in documents]
+
+            embedding_model = embedding_model_key(UserLLMConfigService().get_available_llm())
+            manifest = DocumentManifest()
+            entries = manifest.get_entries(doc_ids)
+            stale_doc_ids = [
+                doc_id
+                for doc_id in doc_ids
+                if not entries.get(doc_id)
+                or not entries[doc_id]["chunk_fingerprint"]
+                or entries[doc_id]["embedding_fingerprint"]
+                != DocumentManifest.embedding_fingerprint(
+                    entries[doc_id]["chunk_fingerprint"], embedding_model
+                )
+            ]
+            logger.info(
+                f"Embedding chunks of {len(stale_doc_ids)} documents, "
+                f"{len(doc_ids) - len(stale_doc_ids)} unchanged"
+            )
+            if not stale_doc_ids:
+                self.progress.mark_step_status(ProcessStep.CHUNK_EMBEDDING, Status.COMPLETED)
+                return True
+
+            # Embed the chunks of all documents as one batched, concurrent run. Their
+            # chunks may still carry vectors of another model, so all are embedded again
+            processed_chunks = document_service.generate_all_chunk_embeddings(
+                stale_doc_ids, force=True
+            )
+            if not processed_chunks:
+                logger.warning("No chunks to process for documents")
+            failed_chunks = [c for c in processed_chunks if not c.has_embedding]
+            failed_doc_ids = {c.document_id for c in failed_chunks}
+            manifest.mark_embedded(
+                [doc_id for doc_id in stale_doc_ids if doc_id not in failed_doc_ids],
+                embedding_model,
+            )
+            if failed_chunks:
+                logger.error(
+                    f"Generate chunk embeddings failed for {len(failed_chunks)} chunks: "
+                    f"{[c.id for c in failed_chunks]}"
+                )
+                self.progress.mark_step_status(ProcessStep.CHUNK_EMBEDDING, Status.FAILED)
+                return False
             # All documents' chunks processed successfully
             self.progress.mark_step_status(ProcessStep.CHUNK_EMBEDDING, Status.COMPLETED)
             return True
@@ -217,7 +306,11 @@ class TrainProcessService:
             
             # Generate L0 - Call document_service to analyze all documents
             logger.info("Generating L0 data...")
-            analyzed_docs = document_service.analyze_all_documents()
+            analyzed_docs = document_service.analyze_all_documents(
+                progress_callback=lambda finished, total: self.progress.mark_step_progress(
+                    ProcessStep.EXTRACT_DIMENSIONAL_TOPICS, finished, total
+                )
+            )
             logger.info(f"Successfully analyzed {len(analyzed_docs)} documents for L0")
             
             # Mark step as completed
@@ -245,6 +338,8 @@ class TrainProcessService:
             # Store L1 data
             with DatabaseSession.session() as session:
                 store_l1_data(session, l1_data)
+            # Later runs only fold documents not yet in this version into L1
+            DocumentManifest().mark_in_l1(l1_data.document_ids, l1_data.embedding_model)
 
             # Mark step as completed
             self.progress.mark_step_status(ProcessStep.GENERATE_BIOGRAPHY, Status.COMPLETED)
@@ -314,13 +409,6 @@ class TrainProcessService:
     def decode_preference_patterns(self)->bool:
         """Decode preference patterns using notes and related data"""
         try:
-            params_manager = TrainingParamsManager()
-            training_params = params_manager.get_latest_training_params()
-            concurrency_threads = training_params.get("concurrency_threads")
-            data_synthesis_mode = training_params.get("data_synthesis_mode")
-            os.environ["CONCURRENCY_THREADS"] = str(concurrency_threads)
-            os.environ["DATA_SYNTHESIS_MODE"] = data_synthesis_mode
-            
             # Mark step as in progress
             self.progress.mark_step_status(ProcessStep.DECODE_PREFERENCE_PATTERNS, Status.IN_PROGRESS)
             logger.info("Starting preference patterns decoding...")
@@ -422,21 +510,15 @@ class TrainProcessService:
                 self.l2_data["graph_path"],
                 self.l2_data["config_path"]
             )
-            l2_generator.merge_json_files(self.l2_data["data_output_base_dir"])
             # Mark step as completed
             logger.info("Content retention augmentation completed successfully")
             self.progress.mark_step_status(ProcessStep.AUGMENT_CONTENT_RETENTION, Status.COMPLETED)
             
-            # Clean up resources after completion
-            self._cleanup_resources()
-            
             return True
             
         except Exception as e:
             logger.error(f"Failed to augment content retention: {str(e)}")
             self.progress.mark_step_status(ProcessStep.AUGMENT_CONTENT_RETENTION, Status.FAILED)
-            # Clean up resources even if there was an error
-            self._cleanup_resources()
             return False
 
     def _prepare_l2_data(self) -> dict:
@@ -452,11 +534,21 @@ class TrainProcessService:
             - graph_path: Path to graph data
             - config_path: Path to config file
         """
-        # If data is already prepared, return cached data directly
-        if self.l2_data_prepared and all(self.l2_data.values()):
-            logger.info("Using cached L2 data")
-            return self.l2_data
+        with self._l2_data_lock:
+            # Set before any of the concurrently started synthesis steps reads them
+            training_params = TrainingParamsManager.get_latest_training_params()
+            os.environ["CONCURRENCY_THREADS"] = str(training_params.get("concurrency_threads"))
+            if training_params.get("data_synthesis_mode"):
+                os.environ["DATA_SYNTHESIS_MODE"] = training_params["data_synthesis_mode"]
+
+            # If data is already prepared, return cached data directly
+            if self.l2_data_prepared and all(self.l2_data.values()):
+                logger.info("Using cached L2 data")
+                return self.l2_data
+            return self._load_l2_data()
 
+    def _load_l2_data(self) -> dict:
+        """Generate the L2 input files and fill the l2_data dictionary"""
         logger.info("Preparing L2 data...")
 
         # Setup directories and paths
@@ -499,7 +591,7 @@ class TrainProcessService:
             os.getcwd(),
             "resources/L1/graphrag_indexing_output/subjective/entities.parquet",
         )
-        self.l2_data["data_output_base_dir"] = os.path.join(os.getcwd(), "resources/L2/data")
+        self.l2_data["data_output_base_dir"] = l2_data_output_dir()
 
         # Lazy load user information
         logger.info("Loading user information...")
@@ -523,6 +615,12 @@ class TrainProcessService:
         try:
             # Mark step as in progress
             self.progress.mark_step_status(ProcessStep.TRAIN, Status.IN_PROGRESS)
+
+            # The synthesis steps ran concurrently, merge their outputs once all are done
+            L2Generator(data_path=os.path.join(os.getcwd(), "resources")).merge_json_files(
+                l2_data_output_dir()
+            )
+            self._cleanup_resources()
             
             # Get paths for the model
             paths = self._get_model_paths(self.model_name)
@@ -1070,49 +1168,65 @@ class TrainProcessService:
             return False
 
     def start_process(self) -> bool:
-        """Start training process"""
+        """Start training process
+
+        Steps are taken from the step queue of the model and run on up to
+        TRAIN_STEP_WORKERS threads as soon as the steps they depend on have
+        completed. Steps completed by an earlier run are skipped.
+        """
         try:
             self.is_stopped = False
             # Store the current process PID
             self.current_pid = os.getpid()  # Store the PID
             logger.info(f"Training process started with PID: {self.current_pid}")
-            # Get the ordered list of all steps
-            ordered_steps = ProcessStep.get_ordered_steps()
-
-            # Get the last successfully completed step
-            last_successful_step = self.progress.get_last_successful_step()
-            start_index = 0
-            if last_successful_step:
-                start_index = ordered_steps.index(last_successful_step) + 1
-
-            # Start executing from the step after the last successful one
-            for step in ordered_steps[start_index:]:
-                self.current_step = step
-                if self.is_stopped:
-                    logger.info("Training process aborted during step")
-                    self.progress.mark_step_status(step, Status.SUSPENDED)
-                    break  # If stop is requested, exit the loop
-            
-                logger.info(f"Starting step: {step.value}")
 
-                # Execute the corresponding method
-                method_name = step.get_method_name()
-                if not hasattr(self, method_name):
-                    logger.error(f"Method {method_name} not found")
-                    self.progress.mark_step_status(step, Status.FAILED)
-                    return False
+            queue = TrainStepQueue(self.model_name)
+            queue.prepare(
+                step for step in ProcessStep.get_ordered_steps()
+                if self.progress.is_step_completed(step)
+            )
+            workers = max(1, int(Config.from_env().get("TRAIN_STEP_WORKERS", 3)))
 
-                method = getattr(self, method_name)
-                success = method()
+            failed = False
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="train-step") as executor:
+                running = {}
+                while True:
+                    while not self.is_stopped and not failed and len(running) < workers:
+                        step = queue.claim()
+                        if step is None:
+                            break
+                        logger.info(f"Starting step: {step.value}")
+                        self.current_step = step
+                        self.running_steps.add(step)
+                        running[executor.submit(self._run_step, step)] = step
+                    if not running:
+                        break
 
-                if not success:
-                    logger.error(f"Step {step.value} failed")
-                    logger.info(f'Marking step as failed: stage={step.value}, step={step.value}')
-                    self.progress.mark_step_status(step, Status.FAILED)
-                    return False
-                logger.info(f"Step {step.value} completed successfully")
-                # self.progress.mark_step_status(step, Status.COMPLETED)
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        step = running.pop(future)
+                        self.running_steps.discard(step)
+                        if future.result():
+                            queue.complete(step)
+                            logger.info(f"Step {step.value} completed successfully")
+                        elif self.is_stopped:
+                            queue.suspend(step)
+                            # The step method may have marked itself failed when it was interrupted
+                            self.progress.mark_step_status(step, Status.SUSPENDED)
+                            logger.info(f"Step {step.value} was stopped, it runs again on the next start")
+                        else:
+                            failed = True
+                            queue.fail(step, f"Step {step.value} failed")
+                            logger.error(f"Step {step.value} failed")
+                            logger.info(f'Marking step as failed: stage={step.value}, step={step.value}')
+                            self.progress.mark_step_status(step, Status.FAILED)
+
+            if failed:
+                self._cleanup_resources()
+                return False
             if self.is_stopped:
+                for step in queue.ready_steps():
+                    self.progress.mark_step_status(step, Status.SUSPENDED)
                 logger.info("Training process was stopped during a step")
             else:
                logger.info("Training process completed...")
@@ -1120,8 +1234,23 @@ class TrainProcessService:
             return True
         except Exception as e:
             logger.error(f"Exception occurred: {str(e)}", exc_info=True)
-            if self.current_step:
-                self.progress.mark_step_status(self.current_step, Status.FAILED)
+            for step in list(self.running_steps) or [self.current_step]:
+                if step:
+                    self.progress.mark_step_status(step, Status.FAILED)
+            return False
+        finally:
+            self.running_steps.clear()
+
+    def _run_step(self, step: ProcessStep) -> bool:
+        """Execute the method of a step on a worker thread"""
+        method_name = step.get_method_name()
+        if not hasattr(self, method_name):
+            logger.error(f"Method {method_name} not found")
+            return False
+        try:
+            return bool(getattr(self, method_name)())
+        except Exception as e:
+            logger.error(f"Step {step.value} raised: {str(e)}", exc_info=True)
             return False
 
     def reset_progress(self):
@@ -1145,9 +1274,9 @@ class TrainProcessService:
             # Set the stop flag
             self.is_stopped = True
             logger.info("Training process has been requested to stop")
-            # mark train stop
-            if self.current_step == ProcessStep.TRAIN:
-                self.progress.mark_step_status(ProcessStep.TRAIN, Status.SUSPENDED)
+            # mark every running step as stopped, start_process marks them again once they return
+            for step in list(self.running_steps):
+                self.progress.mark_step_status(step, Status.SUSPENDED)
             
             # First check if we have the current process PID
             if not hasattr(self, 'current_pid') or not self.current_pid:
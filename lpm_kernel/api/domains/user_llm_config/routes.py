@@ -35,6 +35,9 @@ def validate_llm_config(data: Dict[Any, Any]) -> Dict[str, str]:
             'chat_endpoint', 'chat_api_key', 'chat_model_name',
             'embedding_endpoint', 'embedding_api_key', 'embedding_model_name'
         ]
+        if (data.get('embedding_endpoint') or '').startswith('local://'):
+            # In-process embedding models need no API key
+            required_fields.remove('embedding_api_key')
         for field in required_fields:
             if not data.get(field):
                 errors[field] = f'{field} is required for custom provider'
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+from lpm_kernel.common.repository.database_session import Base
+
+
+class ConfigVersion(Base):
+    """Change counter of a configuration, bumped by every write so processes can tell their cached copy is stale"""
+    __tablename__ = 'config_versions'
+
+    name = Column(String(100), primary_key=True, comment='Configuration name')
+    version = Column(Integer, nullable=False, default=0, comment='Incremented on every change')
+
+    def __repr__(self):
+        return f'<ConfigVersion {self.name}={self.version}>'
@@ -1,15 +1,36 @@
 from typing import List, Optional, Union
 from datetime import datetime
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, update
 from lpm_kernel.common.repository.base_repository import BaseRepository
+from lpm_kernel.api.models.config_version import ConfigVersion
 from lpm_kernel.api.models.user_llm_config import UserLLMConfig
 from lpm_kernel.api.dto.user_llm_config_dto import UserLLMConfigDTO, UpdateUserLLMConfigDTO
 
 
+# Name of the change counter in config_versions
+CONFIG_VERSION_NAME = 'user_llm_config'
+
+
 class UserLLMConfigRepository(BaseRepository[UserLLMConfig]):
     def __init__(self):
         super().__init__(UserLLMConfig)
 
+    def get_version(self) -> int:
+        """Change counter of the configuration, 0 if it was never written"""
+        with self._db.session() as session:
+            entity = session.get(ConfigVersion, CONFIG_VERSION_NAME)
+            return entity.version if entity else 0
+
+    def _bump_version(self, session) -> None:
+        """Increment the change counter in the transaction of the write"""
+        result = session.execute(
+            update(ConfigVersion)
+            .where(ConfigVersion.name == CONFIG_VERSION_NAME)
+            .values(version=ConfigVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            session.add(ConfigVersion(name=CONFIG_VERSION_NAME, version=1))
+
     def get_default_config(self) -> Optional[UserLLMConfigDTO]:
         """Get default configuration (ID=1)"""
         return self._get_by_id(1)
@@ -49,6 +70,7 @@ class UserLLMConfigRepository(BaseRepository[UserLLMConfig]):
             entity.id = 1  # Force ID to be 1
             
             session.add(entity)
+            self._bump_version(session)
             session.commit()
             return UserLLMConfigDTO.from_model(entity)
     
@@ -81,6 +103,7 @@ class UserLLMConfigRepository(BaseRepository[UserLLMConfig]):
             # Update timestamp
             entity.updated_at = datetime.now()
             
+            self._bump_version(session)
             session.commit()
             return UserLLMConfigDTO.from_model(entity)
 
@@ -99,6 +122,7 @@ class UserLLMConfigRepository(BaseRepository[UserLLMConfig]):
                 return None
                 
             session.delete(entity)
+            self._bump_version(session)
             session.commit()
             return UserLLMConfigDTO.from_model(entity)
 
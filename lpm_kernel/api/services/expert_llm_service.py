@@ -6,6 +6,7 @@ from lpm_kernel.api.services.user_llm_config_service import UserLLMConfigService
 from typing import Optional, Dict, Any
 from openai import OpenAI
 from lpm_kernel.configs.config import Config
+from lpm_kernel.common.http_client import OpenAIClientRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +34,7 @@ class ExpertLLMService:
         """Get the OpenAI client for expert LLM"""
         if self._client is None:
             self.user_llm_config = self.user_llm_config_service.get_available_llm()
-            self._client = OpenAI(
+            self._client = OpenAIClientRegistry.get_instance().get(
                 api_key=self.user_llm_config.chat_api_key,
                 base_url=self.user_llm_config.chat_endpoint,
             )
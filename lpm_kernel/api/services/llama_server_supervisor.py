@@ -0,0 +1,176 @@
+import logging
+import subprocess
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+import psutil
+import requests
+
+from lpm_kernel.api.domains.kernel2.dto.server_dto import ServerStatus, ProcessInfo
+from lpm_kernel.configs.config import Config
+
+logger = logging.getLogger(__name__)
+
+SERVER_EXEC_NAME = "llama-server"
+
+
+class LlamaServerSupervisor:
+    """Tracks the llama-server process without scanning the process table per request
+
+    start_server hands the Popen handle over with attach(), liveness is then
+    the child's poll(). A server this process did not start, e.g. one left
+    running across an app restart, is found by a process scan and followed by
+    its PID from then on. Scans that find nothing are repeated at most every
+    scan_ttl seconds. The status, including a probe of the server's /health
+    endpoint, is cached for status_ttl seconds.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        health_url: Optional[str] = None,
+        status_ttl: float = 2.0,
+        scan_ttl: float = 30.0,
+        probe_timeout: float = 1.0,
+    ):
+        self.health_url = health_url
+        self.status_ttl = status_ttl
+        self.scan_ttl = scan_ttl
+        self.probe_timeout = probe_timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._proc: Optional[psutil.Process] = None
+        self._status: Optional[ServerStatus] = None
+        self._status_until = 0.0
+        self._next_scan = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "LlamaServerSupervisor":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    config = Config.from_env()
+                    cls._instance = cls(
+                        health_url=cls._health_url(config.get("LOCAL_LLM_SERVICE_URL")),
+                        status_ttl=float(config.get("LLAMA_SERVER_STATUS_TTL", 2)),
+                        scan_ttl=float(config.get("LLAMA_SERVER_SCAN_TTL", 30)),
+                        probe_timeout=float(config.get("LLAMA_SERVER_PROBE_TIMEOUT", 1)),
+                    )
+        return cls._instance
+
+    def attach(self, process: subprocess.Popen) -> None:
+        """Track a llama-server started by this process"""
+        with self._lock:
+            self._process = process
+            self._proc = self._psutil_process(process.pid)
+            self._invalidate()
+        logger.info(f"Tracking llama-server process {process.pid}")
+
+    def forget(self) -> None:
+        """Drop the tracked process after the server was stopped, the next status scans again"""
+        with self._lock:
+            self._process = None
+            self._proc = None
+            self._next_scan = 0.0
+            self._invalidate()
+
+    def status(self, refresh: bool = False) -> ServerStatus:
+        """Current server status, from the cache unless it expired or refresh is set
+
+        Args:
+            refresh: Check the tracked process and the health endpoint again,
+                and scan for a server if none is tracked
+        """
+        with self._lock:
+            now = time.monotonic()
+            # A child that exited is noticed at once, poll() costs no process scan
+            if self._process is not None and self._process.poll() is not None:
+                logger.warning(f"llama-server process {self._process.pid} exited with code {self._process.returncode}")
+                self._process = None
+                self._proc = None
+                self._invalidate()
+            if not refresh and self._status is not None and now < self._status_until:
+                return self._status
+
+            if not self._alive():
+                self._proc = None
+                if refresh or now >= self._next_scan:
+                    self._proc = self._scan()
+                    self._next_scan = now + self.scan_ttl
+
+            status = self._build_status()
+            self._status = status
+            self._status_until = now + self.status_ttl
+            return status
+
+    def _invalidate(self) -> None:
+        self._status = None
+        self._status_until = 0.0
+
+    def _alive(self) -> bool:
+        if self._proc is None:
+            return False
+        try:
+            return self._proc.is_running() and self._proc.status() != psutil.STATUS_ZOMBIE
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+
+    def _build_status(self) -> ServerStatus:
+        if self._proc is None:
+            return ServerStatus.not_running()
+        try:
+            with self._proc.oneshot():
+                process_info = ProcessInfo(
+                    pid=self._proc.pid,
+                    # The same Process object is reused, so this is the usage since the last status
+                    cpu_percent=self._proc.cpu_percent(),
+                    memory_percent=self._proc.memory_percent(),
+                    create_time=self._proc.create_time(),
+                    cmdline=self._proc.cmdline(),
+                )
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            self._proc = None
+            return ServerStatus.not_running()
+        status = ServerStatus.running(process_info)
+        status.healthy = self._probe()
+        return status
+
+    def _probe(self) -> Optional[bool]:
+        """Whether /health answers OK, False while the model is still loading, None without a URL"""
+        if not self.health_url:
+            return None
+        try:
+            return requests.get(self.health_url, timeout=self.probe_timeout).status_code == 200
+        except requests.RequestException:
+            return False
+
+    @staticmethod
+    def _scan() -> Optional[psutil.Process]:
+        for proc in psutil.process_iter(["pid", "name", "cmdline"]):
+            try:
+                cmdline = proc.info["cmdline"] or []
+                if any(SERVER_EXEC_NAME in cmd for cmd in cmdline):
+                    logger.info(f"Found running llama-server process {proc.pid}")
+                    return proc
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+        return None
+
+    @staticmethod
+    def _psutil_process(pid: int) -> Optional[psutil.Process]:
+        try:
+            return psutil.Process(pid)
+        except psutil.NoSuchProcess:
+            return None
+
+    @staticmethod
+    def _health_url(service_url: Optional[str]) -> Optional[str]:
+        """llama-server serves /health at the root, next to the OpenAI compatible /v1"""
+        if not service_url:
+            return None
+        parsed = urlparse(service_url)
+        return f"{parsed.scheme}://{parsed.netloc}/health"
@@ -0,0 +1,237 @@
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Iterator, Optional
+
+from lpm_kernel.configs.config import Config
+
+logger = logging.getLogger(__name__)
+
+DONE_FRAME = b"data: [DONE]\n\n"
+
+# Markers the reader thread puts on the queue next to the chunks
+_CHUNK = "chunk"
+_END = "end"
+
+
+def _frame(data: Any) -> bytes:
+    return f"data: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+def _empty_message() -> dict:
+    """Chunk sent when the model returned nothing, empty content does not affect the frontend"""
+    return {
+        "id": str(uuid.uuid4()),
+        "object": "chat.completion.chunk",
+        "created": int(datetime.now().timestamp()),
+        "model": "models/lpm",
+        "system_fingerprint": None,
+        "choices": [{"index": 0, "delta": {"content": ""}, "finish_reason": None}],
+    }
+
+
+class StreamRelay:
+    """Relays model chunks to a server-sent events response from a single loop
+
+    One reader thread pulls chunks from the model into a bounded queue, so a
+    slow client stops the reader instead of buffering the whole answer. The
+    response loop waits on that queue exactly until the next heartbeat or
+    batch deadline, there is no polling. Consecutive content deltas are
+    merged into one frame until flush_chars characters or flush_interval
+    seconds have gathered, the first delta is sent at once. When the client
+    disconnects the model stream is closed, which stops generation upstream.
+    Time to first token and tokens per second are logged for every stream.
+    """
+
+    def __init__(
+        self,
+        response_iter: Iterator[Any],
+        parse_chunk: Callable[[Any], Optional[dict]],
+        heartbeat_interval: float = 10.0,
+        flush_interval: float = 0.04,
+        flush_chars: int = 48,
+        queue_size: int = 256,
+    ):
+        self.response_iter = response_iter
+        self.parse_chunk = parse_chunk
+        self.heartbeat_interval = heartbeat_interval
+        self.flush_interval = flush_interval
+        self.flush_chars = flush_chars
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._started = time.monotonic()
+        self._first_token_at: Optional[float] = None
+        self._tokens = 0
+        self._frames = 0
+
+    @classmethod
+    def from_config(cls, response_iter: Iterator[Any], parse_chunk: Callable[[Any], Optional[dict]]) -> "StreamRelay":
+        config = Config.from_env()
+        return cls(
+            response_iter,
+            parse_chunk,
+            heartbeat_interval=float(config.get("STREAM_HEARTBEAT_INTERVAL", 10)),
+            flush_interval=float(config.get("STREAM_FLUSH_INTERVAL_MS", 40)) / 1000,
+            flush_chars=int(config.get("STREAM_FLUSH_CHARS", 48)),
+        )
+
+    def frames(self) -> Iterator[bytes]:
+        """SSE frames of the stream, ends with the [DONE] frame"""
+        reader = threading.Thread(target=self._read, name="sse-reader", daemon=True)
+        reader.start()
+        disconnected = False
+        try:
+            yield from self._relay()
+        except GeneratorExit:
+            disconnected = True
+            logger.info("Client closed the stream connection")
+        except Exception as e:
+            logger.error(f"Error relaying stream: {str(e)}", exc_info=True)
+            try:
+                yield _frame({"error": f"Generator error: {str(e)}"})
+                yield DONE_FRAME
+            except GeneratorExit:
+                disconnected = True
+        finally:
+            self._stop.set()
+            self._close_upstream()
+            self._log_metrics(disconnected)
+
+    def _relay(self) -> Iterator[bytes]:
+        yield b": initial heartbeat\n\n"
+        received = 0
+        pending: Optional[dict] = None
+        flush_at: Optional[float] = None
+        next_heartbeat = time.monotonic() + self.heartbeat_interval
+        heartbeat_count = 0
+
+        def flush() -> Iterator[bytes]:
+            nonlocal pending, flush_at, next_heartbeat
+            if pending is not None:
+                self._frames += 1
+                yield _frame(pending)
+                pending = None
+                next_heartbeat = time.monotonic() + self.heartbeat_interval
+            flush_at = None
+
+        while True:
+            deadline = next_heartbeat if flush_at is None else min(next_heartbeat, flush_at)
+            try:
+                kind, item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                now = time.monotonic()
+                if flush_at is not None and now >= flush_at:
+                    yield from flush()
+                if now >= next_heartbeat:
+                    heartbeat_count += 1
+                    yield f": heartbeat #{heartbeat_count}\n\n".encode("utf-8")
+                    next_heartbeat = now + self.heartbeat_interval
+                continue
+
+            if kind == _END:
+                yield from flush()
+                if item is not None:
+                    logger.error(f"Error processing model response: {str(item)}")
+                    yield _frame({"error": str(item)})
+                elif received == 0:
+                    yield _frame(_empty_message())
+                yield DONE_FRAME
+                return
+
+            received += 1
+            chunk = item
+            if chunk is None:
+                continue
+            if chunk == "[DONE]":
+                yield from flush()
+                yield DONE_FRAME
+                return
+            if isinstance(chunk, dict) and "error" in chunk:
+                logger.warning(f"Received error response: {chunk}")
+                yield from flush()
+                yield _frame(chunk)
+                yield DONE_FRAME
+                return
+
+            response_data = self.parse_chunk(chunk)
+            if not response_data:
+                continue
+            choice = response_data["choices"][0]
+            content = choice["delta"].get("content")
+            has_content = isinstance(content, str) and bool(content)
+            first_token = has_content and self._first_token_at is None
+            if has_content:
+                self._tokens += 1
+                if first_token:
+                    self._first_token_at = time.monotonic()
+            if not has_content or choice.get("finish_reason"):
+                # Role-only deltas and the final chunk go out as they are, after what is pending
+                yield from flush()
+                self._frames += 1
+                yield _frame(response_data)
+                next_heartbeat = time.monotonic() + self.heartbeat_interval
+                continue
+
+            if pending is None:
+                pending = response_data
+            else:
+                pending["choices"][0]["delta"]["content"] += content
+            if first_token:
+                yield from flush()
+            elif len(pending["choices"][0]["delta"]["content"]) >= self.flush_chars:
+                yield from flush()
+            elif flush_at is None:
+                flush_at = time.monotonic() + self.flush_interval
+
+    def _read(self) -> None:
+        """Pull chunks from the model, waits while the queue is full and stops with the relay"""
+        error = None
+        try:
+            for chunk in self.response_iter:
+                if not self._put((_CHUNK, chunk)):
+                    return
+                if chunk == "[DONE]":
+                    break
+        except Exception as e:
+            # Closing the upstream on disconnect interrupts the read as well
+            if not self._stop.is_set():
+                error = e
+        self._put((_END, error))
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _close_upstream(self) -> None:
+        """Close the model stream, an OpenAI stream then drops its HTTP response"""
+        close = getattr(self.response_iter, "close", None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception as e:
+            # A generator that is being read by the reader thread cannot be closed from here
+            logger.debug(f"Could not close model stream: {str(e)}")
+
+    def _log_metrics(self, disconnected: bool) -> None:
+        now = time.monotonic()
+        if self._first_token_at is None:
+            logger.info(f"Stream ended after {now - self._started:.2f}s without content"
+                        f"{', client disconnected' if disconnected else ''}")
+            return
+        generation = now - self._first_token_at
+        tokens_per_second = self._tokens / generation if generation > 0 else float(self._tokens)
+        logger.info(
+            f"Stream ended: first token after {self._first_token_at - self._started:.2f}s, "
+            f"{self._tokens} tokens in {self._frames} frames, {tokens_per_second:.1f} tokens/s"
+            f"{', client disconnected' if disconnected else ''}"
+        )
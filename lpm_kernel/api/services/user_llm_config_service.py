@@ -1,23 +1,72 @@
+import threading
+import time
 from typing import Optional
 from lpm_kernel.api.repositories.user_llm_config_repository import UserLLMConfigRepository
 from lpm_kernel.api.dto.user_llm_config_dto import (
     UserLLMConfigDTO,
     UpdateUserLLMConfigDTO
 )
+from lpm_kernel.configs.config import Config
 from datetime import datetime
 
 
+class _ConfigCache:
+    """Configuration read from the database, stamped with the change counter it was read at"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.config: Optional[UserLLMConfigDTO] = None
+        self.version: Optional[int] = None
+        self.checked_at = 0.0
+        self.check_interval: Optional[float] = None
+
+    def invalidate(self):
+        with self.lock:
+            self.config = None
+            self.version = None
+            self.checked_at = 0.0
+
+
 class UserLLMConfigService:
     """User LLM Configuration Service"""
 
+    # Shared by all instances, the services are created per request and per generator
+    _cache = _ConfigCache()
+
     def __init__(self):
         self.repository = UserLLMConfigRepository()
 
     def get_available_llm(self) -> Optional[UserLLMConfigDTO]:
         """Get available LLM configuration
         Since we only have one default configuration now (ID=1), just return it
+
+        The configuration is cached in memory. update_config and delete_key
+        drop the cache of this process, writes of other worker processes are
+        noticed through the change counter in config_versions, which is read
+        at most every LLM_CONFIG_CACHE_TTL seconds. The returned object is
+        shared between callers and must not be modified.
         """
-        return self.repository.get_default_config()
+        cache = self._cache
+        if cache.check_interval is None:
+            cache.check_interval = float(Config.from_env().get("LLM_CONFIG_CACHE_TTL", 1))
+        now = time.monotonic()
+        with cache.lock:
+            if cache.version is not None and now - cache.checked_at < cache.check_interval:
+                return cache.config
+
+        # The counter is read before the configuration, a write in between
+        # leaves the cache stamped older than its content and it is reloaded
+        version = self.repository.get_version()
+        with cache.lock:
+            if version == cache.version:
+                cache.checked_at = now
+                return cache.config
+        config = self.repository.get_default_config()
+        with cache.lock:
+            cache.config = config
+            cache.version = version
+            cache.checked_at = now
+        return config
     
 
     def update_config(
@@ -41,7 +90,10 @@ class UserLLMConfigService:
         self._ensure_single_record()
         
         # Update or create the configuration
-        return self.repository.update(config_id, dto)
+        try:
+            return self.repository.update(config_id, dto)
+        finally:
+            self._cache.invalidate()
 
     def delete_key(self, config_id: int = 1) -> Optional[UserLLMConfigDTO]:
         """Delete API key from the configuration
@@ -64,7 +116,10 @@ class UserLLMConfigService:
             return None
         
         # delete 
-        return self.repository.delete(config_id)
+        try:
+            return self.repository.delete(config_id)
+        finally:
+            self._cache.invalidate()
         
     def _ensure_single_record(self):
         """Ensure that only one configuration record exists in the database"""
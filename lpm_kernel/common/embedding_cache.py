@@ -0,0 +1,205 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from lpm_kernel.configs.config import Config
+from lpm_kernel.configs.logging import get_train_process_logger
+
+logger = get_train_process_logger()
+
+
+class EmbeddingCache:
+    """Persistent embedding cache with an in-memory LRU front
+
+    Entries are keyed by (model name, dimension, sha256 of text). Vectors are
+    stored as float32 blobs in a SQLite file, the least recently used entries
+    are evicted once the configured size is exceeded.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, db_path: str, max_entries: int = 200000, memory_entries: int = 10000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._dimensions: Dict[str, int] = {}
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (model, dimension, text_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings (last_access)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS model_dimensions (model TEXT PRIMARY KEY, dimension INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+        for model, dimension in self._conn.execute("SELECT model, dimension FROM model_dimensions"):
+            self._dimensions[model] = dimension
+        self._entry_count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @classmethod
+    def get_instance(cls) -> Optional["EmbeddingCache"]:
+        """Get the process-wide cache, None if caching is disabled"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    config = Config.from_env()
+                    if str(config.get("EMBEDDING_CACHE_ENABLED", "true")).lower() != "true":
+                        return None
+                    cls._instance = cls(
+                        db_path=config.get("EMBEDDING_CACHE_PATH", "data/embedding_cache/embeddings.db"),
+                        max_entries=int(config.get("EMBEDDING_CACHE_MAX_ENTRIES", 200000)),
+                        memory_entries=int(config.get("EMBEDDING_CACHE_MEMORY_ENTRIES", 10000)),
+                    )
+                    logger.info(f"Embedding cache initialized at {cls._instance.db_path}")
+        return cls._instance
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Look up cached vectors, returns None for every text not in the cache"""
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        with self._lock:
+            dimension = self._dimensions.get(model)
+            if dimension is None:
+                self.misses += len(texts)
+                return results
+
+            disk_lookups: Dict[str, List[int]] = {}
+            for i, text in enumerate(texts):
+                key = (model, dimension, self.hash_text(text))
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = vector
+                else:
+                    disk_lookups.setdefault(key[2], []).append(i)
+
+            if disk_lookups:
+                hashes = list(disk_lookups.keys())
+                found = []
+                # Stay well below SQLite's bound parameter limit
+                for start in range(0, len(hashes), 500):
+                    batch = hashes[start:start + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    found.extend(
+                        self._conn.execute(
+                            f"SELECT text_hash, vector FROM embeddings "
+                            f"WHERE model = ? AND dimension = ? AND text_hash IN ({placeholders})",
+                            [model, dimension, *batch],
+                        ).fetchall()
+                    )
+                now = time.time()
+                for text_hash, blob in found:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    self._remember((model, dimension, text_hash), vector)
+                    for i in disk_lookups[text_hash]:
+                        results[i] = vector
+                if found:
+                    self._conn.executemany(
+                        "UPDATE embeddings SET last_access = ? WHERE model = ? AND dimension = ? AND text_hash = ?",
+                        [(now, model, dimension, text_hash) for text_hash, _ in found],
+                    )
+                    self._conn.commit()
+
+            hit_count = sum(1 for r in results if r is not None)
+            self.hits += hit_count
+            self.misses += len(texts) - hit_count
+        return results
+
+    def put_many(self, model: str, texts: List[str], vectors: np.ndarray) -> None:
+        """Store vectors for texts, evicting the least recently used entries if needed"""
+        if len(texts) == 0:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dimension = int(vectors.shape[1])
+        now = time.time()
+        rows = []
+        with self._lock:
+            if self._dimensions.get(model) != dimension:
+                # A model switching dimension makes its old entries unreachable
+                self._dimensions[model] = dimension
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO model_dimensions (model, dimension) VALUES (?, ?)",
+                    (model, dimension),
+                )
+            for text, vector in zip(texts, vectors):
+                text_hash = self.hash_text(text)
+                self._remember((model, dimension, text_hash), vector)
+                rows.append((model, dimension, text_hash, vector.tobytes(), now))
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, dimension, text_hash, vector, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._entry_count += max(cursor.rowcount, 0)
+            if self._entry_count > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and cache sizes"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._entry_count,
+            }
+
+    def clear(self) -> None:
+        """Remove all cached embeddings"""
+        with self._lock:
+            self._memory.clear()
+            self._dimensions.clear()
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.execute("DELETE FROM model_dimensions")
+            self._conn.commit()
+            self._entry_count = 0
+
+    def _remember(self, key: tuple, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        # Evict a little more than needed so eviction does not run on every put
+        target = int(self.max_entries * 0.9)
+        to_delete = self._entry_count - target
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE rowid IN "
+            "(SELECT rowid FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (to_delete,),
+        )
+        self._entry_count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        logger.info(f"Evicted {to_delete} entries from embedding cache")
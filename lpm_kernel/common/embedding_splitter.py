@@ -0,0 +1,113 @@
+import re
+from typing import List, Tuple
+
+import numpy as np
+import tiktoken
+
+# Same encoding as lpm_kernel.L2.utils.count_tokens_from_string
+DEFAULT_ENCODING = "cl100k_base"
+
+# A sentence ends after one of these characters, which stay with the sentence
+_SENTENCE_END = re.compile(r"(?<=[。！？.!?\n])")
+
+
+class TokenBudgetSplitter:
+    """Splits texts into windows of at most a number of tokens for embedding
+
+    Windows end at sentence boundaries where possible, a sentence that alone
+    exceeds the budget is cut at token boundaries. Joining the windows of a
+    text gives back the text unchanged.
+    """
+
+    def __init__(self, max_tokens: int = 8000, encoding_name: str = DEFAULT_ENCODING):
+        self.max_tokens = max_tokens
+        self.encoding_name = encoding_name
+        self._encoding = None
+
+    @property
+    def encoding(self) -> tiktoken.Encoding:
+        if self._encoding is None:
+            self._encoding = tiktoken.get_encoding(self.encoding_name)
+        return self._encoding
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def split(self, text: str) -> List[Tuple[str, int]]:
+        """Split a text into (window, token count) pairs"""
+        tokens = self.count_tokens(text)
+        if tokens <= self.max_tokens:
+            return [(text, tokens)]
+
+        windows = []
+        current = []
+        current_tokens = 0
+        for sentence in _SENTENCE_END.split(text):
+            if not sentence:
+                continue
+            sentence_tokens = self.count_tokens(sentence)
+            if sentence_tokens > self.max_tokens:
+                if current:
+                    windows.append(("".join(current), current_tokens))
+                    current, current_tokens = [], 0
+                windows.extend(self._cut_sentence(sentence))
+                continue
+            if current and current_tokens + sentence_tokens > self.max_tokens:
+                windows.append(("".join(current), current_tokens))
+                current, current_tokens = [], 0
+            current.append(sentence)
+            current_tokens += sentence_tokens
+        if current:
+            windows.append(("".join(current), current_tokens))
+        return windows
+
+    def _cut_sentence(self, sentence: str) -> List[Tuple[str, int]]:
+        """Cut a sentence longer than the budget at token boundaries"""
+        tokens = self.encoding.encode(sentence, disallowed_special=())
+        # Offsets are character positions, so cuts never split a multi-byte character
+        _, offsets = self.encoding.decode_with_offsets(tokens)
+        cut_points = sorted(
+            {offsets[i] for i in range(self.max_tokens, len(tokens), self.max_tokens)} - {0}
+        )
+        pieces = []
+        start = 0
+        for end in cut_points + [len(sentence)]:
+            if end > start:
+                piece = sentence[start:end]
+                pieces.append((piece, self.count_tokens(piece)))
+                start = end
+        return pieces
+
+
+def pack_requests(
+    token_counts: List[int], max_request_tokens: int, max_request_texts: int
+) -> List[range]:
+    """Group consecutive texts into requests bounded by total tokens and text count
+
+    A text larger than the token budget still gets a request of its own.
+
+    Returns:
+        List[range]: Indices of the texts of each request.
+    """
+    requests = []
+    start = 0
+    request_tokens = 0
+    for i, tokens in enumerate(token_counts):
+        if i > start and (
+            i - start >= max_request_texts or request_tokens + tokens > max_request_tokens
+        ):
+            requests.append(range(start, i))
+            start = i
+            request_tokens = 0
+        request_tokens += tokens
+    if start < len(token_counts):
+        requests.append(range(start, len(token_counts)))
+    return requests
+
+
+def pool_windows(embeddings: np.ndarray, token_counts: List[int]) -> np.ndarray:
+    """Average window embeddings of one text weighted by their token counts"""
+    if len(embeddings) == 1:
+        return embeddings[0]
+    weights = np.maximum(np.asarray(token_counts, dtype=np.float64), 1.0)
+    return np.average(embeddings, axis=0, weights=weights)
@@ -0,0 +1,260 @@
+import gzip
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import requests
+from openai import DefaultHttpxClient, OpenAI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from lpm_kernel.configs.config import Config
+from lpm_kernel.configs.logging import get_train_process_logger
+
+logger = get_train_process_logger()
+
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Request bodies smaller than this are sent uncompressed even with gzip enabled
+GZIP_MIN_BYTES = 1024
+
+
+class _JitteredRetry(Retry):
+    """Retry with full jitter, so clients throttled together do not retry in lockstep"""
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to requests sent without one"""
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+class HttpTransport:
+    """Process-wide pooled HTTP transport for embedding and chat endpoints
+
+    Keeps one requests session for embedding strategies and one httpx client
+    for OpenAI-compatible chat clients, both with keep-alive connection pools,
+    default timeouts and jittered retries on 429 and 5xx responses.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        pool_size: int = 20,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 120.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        gzip_requests: bool = False,
+    ):
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.gzip_requests = gzip_requests
+
+        retry = _JitteredRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            # embedding requests are idempotent, so POST is retried as well
+            allowed_methods=None,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = _TimeoutHTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+            timeout=self.timeout,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._openai_http_client = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "HttpTransport":
+        """Get the process-wide transport, configured from the environment"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    config = Config.from_env()
+                    cls._instance = cls(
+                        pool_size=int(config.get("HTTP_POOL_SIZE", 20)),
+                        connect_timeout=float(config.get("HTTP_CONNECT_TIMEOUT", 10)),
+                        read_timeout=float(config.get("HTTP_READ_TIMEOUT", 120)),
+                        max_retries=int(config.get("HTTP_MAX_RETRIES", 3)),
+                        backoff_factor=float(config.get("HTTP_BACKOFF_FACTOR", 0.5)),
+                        gzip_requests=str(config.get("HTTP_GZIP_REQUESTS", "false")).lower() == "true",
+                    )
+        return cls._instance
+
+    def post_json(
+        self, url: str, payload: Any, headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """POST a JSON payload over the pooled session
+
+        The body is gzip-compressed when gzip requests are enabled and the body
+        is large enough to benefit. Retries happen inside the session, the last
+        response is returned even if its status is an error.
+        """
+        headers = dict(headers or {})
+        headers["Content-Type"] = "application/json"
+        body = json.dumps(payload).encode("utf-8")
+        if self.gzip_requests and len(body) >= GZIP_MIN_BYTES:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        return self.session.post(url, data=body, headers=headers)
+
+    @property
+    def openai_http_client(self) -> httpx.Client:
+        """Shared httpx client to pass to OpenAI clients as http_client
+
+        The OpenAI SDK retries 429 and 5xx itself with jittered backoff, so only
+        the pool and the timeouts are set here.
+        """
+        if self._openai_http_client is None:
+            with self._lock:
+                if self._openai_http_client is None:
+                    connect_timeout, read_timeout = self.timeout
+                    self._openai_http_client = DefaultHttpxClient(
+                        limits=httpx.Limits(
+                            max_connections=self.pool_size,
+                            max_keepalive_connections=self.pool_size,
+                        ),
+                        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                    )
+        return self._openai_http_client
+
+
+# Pools of the registry, chat requests and L0/L1/L2 generation do not wait for each other's connections
+CHAT_POOL = "chat"
+GENERATOR_POOL = "generator"
+
+
+class OpenAIClientRegistry:
+    """Process-wide OpenAI clients keyed by (base_url, api_key, timeout, pool)
+
+    Clients talking to the same endpoint reuse warm keep-alive connections
+    instead of opening a pool per client. Chat, expert and Space discussion
+    clients send over the pooled httpx client of HttpTransport. The L0, L1
+    and L2 generators run many requests at once and get a pool of their own
+    with generator_pool_size connections. Chat clients created without a
+    timeout use the connect and read timeouts of the HttpTransport pool,
+    generator clients get default_timeout, the OpenAI SDK default unless
+    configured. At most max_size clients are kept, the
+    least recently used is dropped first, and clients unused for idle_ttl
+    seconds are dropped as well. Dropped clients are not closed, closing
+    would close the shared pool, so callers still holding one can keep
+    using it.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_size: int = 32,
+        idle_ttl: float = 600.0,
+        default_timeout: float = 600.0,
+        generator_pool_size: int = 100,
+    ):
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.default_timeout = default_timeout
+        self.generator_pool_size = generator_pool_size
+        self._generator_http_client = None
+        # Ordered from least to most recently used, values are (client, last use)
+        self._clients: "OrderedDict[Tuple, Tuple[OpenAI, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "OpenAIClientRegistry":
+        """Get the process-wide registry, configured from the environment"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    config = Config.from_env()
+                    cls._instance = cls(
+                        max_size=int(config.get("OPENAI_CLIENT_CACHE_SIZE", 32)),
+                        idle_ttl=float(config.get("OPENAI_CLIENT_IDLE_TTL", 600)),
+                        default_timeout=float(config.get("OPENAI_CLIENT_TIMEOUT", 600)),
+                        generator_pool_size=int(config.get("OPENAI_GENERATOR_POOL_SIZE", 100)),
+                    )
+        return cls._instance
+
+    def get(self, base_url: Optional[str] = None, api_key: Optional[str] = None,
+            timeout: Optional[float] = None, pool: str = CHAT_POOL) -> OpenAI:
+        """OpenAI client for an endpoint, created on first use
+
+        Args:
+            base_url: Endpoint of the OpenAI-compatible API, the SDK default if not given
+            api_key: API key, the SDK reads OPENAI_API_KEY if not given
+            timeout: Request timeout in seconds. If not given, chat clients use the
+                timeouts of the HttpTransport pool and generator clients default_timeout
+            pool: CHAT_POOL or GENERATOR_POOL, the connection pool the client sends over
+        """
+        if pool not in (CHAT_POOL, GENERATOR_POOL):
+            raise ValueError(f"Unknown OpenAI client pool: {pool}")
+        if timeout is None and pool == GENERATOR_POOL:
+            timeout = self.default_timeout
+        key = (base_url, api_key, timeout, pool)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            self._evict_idle(now)
+            if entry is None:
+                client_kwargs = {}
+                if timeout is not None:
+                    # Without it the SDK takes the timeout of the httpx client
+                    client_kwargs["timeout"] = timeout
+                client = OpenAI(
+                    base_url=base_url,
+                    api_key=api_key,
+                    http_client=self._http_client(pool),
+                    **client_kwargs,
+                )
+            else:
+                client = entry[0]
+            self._clients[key] = (client, now)
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+        return client
+
+    def _http_client(self, pool: str) -> httpx.Client:
+        if pool == CHAT_POOL:
+            return HttpTransport.get_instance().openai_http_client
+        # Called with the registry lock held
+        if self._generator_http_client is None:
+            self._generator_http_client = DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=self.generator_pool_size,
+                    max_keepalive_connections=self.generator_pool_size,
+                ),
+            )
+        return self._generator_http_client
+
+    def _evict_idle(self, now: float) -> None:
+        while self._clients:
+            key, (_, last_used) = next(iter(self._clients.items()))
+            if now - last_used <= self.idle_ttl:
+                break
+            del self._clients[key]
@@ -6,6 +6,8 @@ import numpy as np
 from lpm_kernel.configs.logging import get_train_process_logger
 logger = get_train_process_logger()
 import lpm_kernel.common.strategy.classification as classification
+from lpm_kernel.common.embedding_cache import EmbeddingCache
+from lpm_kernel.common.embedding_splitter import TokenBudgetSplitter, pack_requests, pool_windows
 from sentence_transformers import SentenceTransformer
 import json
 
@@ -15,13 +17,23 @@ class EmbeddingError(Exception):
         super().__init__(message)
         self.original_error = original_error
 
+def embedding_model_key(user_llm_config) -> str:
+    """Identify the embedding model of a configuration, embeddings of different keys are not comparable"""
+    if not user_llm_config:
+        return ""
+    return f"{user_llm_config.embedding_endpoint}|{user_llm_config.embedding_model_name}"
+
+
 class LLMClient:
     """LLM client utility class"""
 
     def __init__(self):
         self.config = Config.from_env()
         self.user_llm_config_service = UserLLMConfigService()
-        self.embedding_max_text_length = int(self.config.get('EMBEDDING_MAX_TEXT_LENGTH', 8000))
+        # Token budgets per embedded text and per embedding request
+        self.embedding_splitter = TokenBudgetSplitter(max_tokens=self._embedding_max_text_tokens())
+        self.embedding_request_max_tokens = int(self.config.get('EMBEDDING_REQUEST_MAX_TOKENS', 100000))
+        self.embedding_request_max_texts = int(self.config.get('EMBEDDING_REQUEST_MAX_TEXTS', 256))
         # self.user_llm_config = self.user_llm_config_service.get_available_llm()
 
         # self.chat_api_key = self.user_llm_config.chat_api_key
@@ -32,6 +44,21 @@ class LLMClient:
         # self.embedding_model = self.user_llm_config.embedding_model_name
 
 
+    def _embedding_max_text_tokens(self) -> int:
+        """Token budget per embedded text, EMBEDDING_MAX_TEXT_LENGTH is still read when set alone"""
+        max_tokens = self.config.get('EMBEDDING_MAX_TEXT_TOKENS')
+        if max_tokens is None:
+            legacy = self.config.get('EMBEDDING_MAX_TEXT_LENGTH')
+            if legacy is not None:
+                # The old setting was documented as the model's context window, which is counted in tokens
+                logger.warning(
+                    "EMBEDDING_MAX_TEXT_LENGTH is deprecated, set EMBEDDING_MAX_TEXT_TOKENS instead; "
+                    f"using {legacy} as the token budget per embedded text"
+                )
+                return int(legacy)
+            return 8000
+        return int(max_tokens)
+
     def get_embedding(self, texts: Union[str, List[str]]) -> np.ndarray:
         """Calculate text embedding
 
@@ -45,44 +72,69 @@ class LLMClient:
         if isinstance(texts, str):
             texts = [texts]
 
-        # Split long texts into chunks using configured max length
-        chunked_texts = []
-        text_chunk_counts = []  # Keep track of how many chunks each text was split into
-        
-        for text in texts:
-            if len(text) > self.embedding_max_text_length:
-                # Split into chunks of embedding_max_text_length
-                chunks = [text[i:i + self.embedding_max_text_length] 
-                         for i in range(0, len(text), self.embedding_max_text_length)]
-                chunked_texts.extend(chunks)
-                text_chunk_counts.append(len(chunks))
-            else:
-                chunked_texts.append(text)
-                text_chunk_counts.append(1)
-
         user_llm_config = self.user_llm_config_service.get_available_llm()
         if not user_llm_config:
             raise EmbeddingError("No LLM configuration found")
-        
+
+        cache = EmbeddingCache.get_instance()
+        if cache is None:
+            return self._compute_embeddings(texts, user_llm_config)
+
+        # Only compute embeddings for texts that are not cached yet
+        cache_model = embedding_model_key(user_llm_config)
+        cached = cache.get_many(cache_model, texts)
+        missing_indices = [i for i, vector in enumerate(cached) if vector is None]
+        if missing_indices:
+            missing_texts = [texts[i] for i in missing_indices]
+            computed = self._compute_embeddings(missing_texts, user_llm_config)
+            cache.put_many(cache_model, missing_texts, computed)
+            for i, vector in zip(missing_indices, computed):
+                cached[i] = vector
+        logger.debug(
+            f"Embedding cache: {len(texts) - len(missing_indices)}/{len(texts)} hits, stats: {cache.stats()}"
+        )
+        return np.array(cached)
+
+    def _compute_embeddings(self, texts: List[str], user_llm_config) -> np.ndarray:
+        """Request embeddings for texts from the configured embedding endpoint"""
         try:
-            # Send request to embedding endpoint
-            embeddings_array = classification.strategy_classification(user_llm_config, chunked_texts)
+            # Split long texts into sentence-aligned windows within the token budget
+            windows = []
+            window_tokens = []
+            text_window_counts = []  # Keep track of how many windows each text was split into
+            for text in texts:
+                text_windows = self.embedding_splitter.split(text)
+                windows.extend(window for window, _ in text_windows)
+                window_tokens.extend(tokens for _, tokens in text_windows)
+                text_window_counts.append(len(text_windows))
 
-            # If we split any texts, we need to merge their embeddings back
-            if sum(text_chunk_counts) > len(texts):
+            # Pack windows of many texts into each request up to the request budget
+            request_ranges = pack_requests(
+                window_tokens, self.embedding_request_max_tokens, self.embedding_request_max_texts
+            )
+            embeddings_array = np.vstack([
+                np.asarray(
+                    classification.strategy_classification(
+                        user_llm_config, windows[r.start:r.stop]
+                    )
+                )
+                for r in request_ranges
+            ])
+            if len(request_ranges) > 1:
+                logger.info(f"Embedded {len(texts)} texts as {len(windows)} windows in {len(request_ranges)} requests")
+
+            # If we split any texts, pool their window embeddings weighted by token count
+            if len(windows) > len(texts):
                 final_embeddings = []
                 start_idx = 0
-                for chunk_count in text_chunk_counts:
-                    if chunk_count > 1:
-                        # Average embeddings for split text
-                        chunk_embeddings = embeddings_array[start_idx:start_idx + chunk_count]
-                        avg_embedding = np.mean(chunk_embeddings, axis=0)
-                        final_embeddings.append(avg_embedding)
-                    else:
-                        final_embeddings.append(embeddings_array[start_idx])
-                    start_idx += chunk_count
+                for window_count in text_window_counts:
+                    end_idx = start_idx + window_count
+                    final_embeddings.append(
+                        pool_windows(embeddings_array[start_idx:end_idx], window_tokens[start_idx:end_idx])
+                    )
+                    start_idx = end_idx
                 return np.array(final_embeddings)
-            
+
             return embeddings_array
 
         except requests.exceptions.RequestException as e:
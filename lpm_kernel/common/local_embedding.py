@@ -0,0 +1,65 @@
+import threading
+from typing import Dict, List
+
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
+
+from lpm_kernel.configs.config import Config
+from lpm_kernel.configs.logging import get_train_process_logger
+logger = get_train_process_logger()
+
+
+class LocalEmbeddingModel:
+    """SentenceTransformer model loaded once per process for batched inference
+
+    Backs both in-process strategies, local:// endpoints and sentence-transformers
+    endpoints, so they share one cache and the LOCAL_EMBEDDING_DEVICE,
+    LOCAL_EMBEDDING_BATCH_SIZE and LOCAL_EMBEDDING_THREADS settings.
+
+    Models are cached by name, so every embedding request after the first one
+    reuses the loaded weights. Inference is serialized per model because torch
+    already parallelizes each batch over the configured number of threads.
+    """
+
+    _models: Dict[str, "LocalEmbeddingModel"] = {}
+    _models_lock = threading.Lock()
+
+    def __init__(self, model_name: str, device: str = "cpu", batch_size: int = 64, threads: int = 0):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        if threads > 0:
+            torch.set_num_threads(threads)
+        logger.info(
+            f"Loading local embedding model {model_name} on {device}, "
+            f"batch size {batch_size}, {torch.get_num_threads()} threads"
+        )
+        self.model = SentenceTransformer(model_name, device=device)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, model_name: str) -> "LocalEmbeddingModel":
+        """Get the loaded model, loading it on first use"""
+        model = cls._models.get(model_name)
+        if model is None:
+            with cls._models_lock:
+                model = cls._models.get(model_name)
+                if model is None:
+                    config = Config.from_env()
+                    model = cls(
+                        model_name,
+                        device=config.get("LOCAL_EMBEDDING_DEVICE", "cpu"),
+                        batch_size=int(config.get("LOCAL_EMBEDDING_BATCH_SIZE", 64)),
+                        threads=int(config.get("LOCAL_EMBEDDING_THREADS", 0)),
+                    )
+                    cls._models[model_name] = model
+        return model
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        with self._lock:
+            return self.model.encode(
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
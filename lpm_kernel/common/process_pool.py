@@ -0,0 +1,12 @@
+import multiprocessing
+from multiprocessing.context import SpawnContext
+
+
+def spawn_context() -> SpawnContext:
+    """Start method of the worker pools of file processing
+
+    Workers are spawned rather than forked: the parent runs threads, such as
+    the chunk writer and the upload queue, and forking a process that runs
+    threads can deadlock the children on locks held at fork time.
+    """
+    return multiprocessing.get_context("spawn")
@@ -4,10 +4,14 @@ from lpm_kernel.api.dto.user_llm_config_dto import (
 from typing import Optional
 import lpm_kernel.common.strategy.strategy_openai as openai
 import lpm_kernel.common.strategy.strategy_huggingface as huggingface
+import lpm_kernel.common.strategy.strategy_local as local
 
 def strategy_classification(user_llm_config: Optional[UserLLMConfigDTO], chunked_texts):
-    if "sentence-transformers" in user_llm_config.embedding_endpoint:
-        # Using Hugging Face strategy to generate embedding vectors
+    if local.is_local_endpoint(user_llm_config.embedding_endpoint):
+        # Using in-process SentenceTransformer model, loaded once and kept in memory
+        return local.local_strategy(user_llm_config, chunked_texts)
+    elif "sentence-transformers" in user_llm_config.embedding_endpoint:
+        # Using Hugging Face strategy, served by the same in-process model cache as local endpoints
         return huggingface.huggingface_strategy(user_llm_config, chunked_texts)
     else:
         # Using openai strategy to generate embedding vectors
@@ -1,7 +1,7 @@
-from sentence_transformers import SentenceTransformer
 from lpm_kernel.api.dto.user_llm_config_dto import (
     UserLLMConfigDTO,
 )
+from lpm_kernel.common.local_embedding import LocalEmbeddingModel
 from typing import Optional
 import os
 os.environ["HF_ENDPOINT"] = "https://hf-mirror.com"
@@ -14,8 +14,7 @@ def huggingface_strategy(user_llm_config: Optional[UserLLMConfigDTO], chunked_te
         raise ValueError("Endpoint error")
 
     try:
-        model = SentenceTransformer(model_name)
-        embeddings = model.encode(chunked_texts)
-        return embeddings
+        # Loaded once per process, batches of the embedding run reuse the model
+        return LocalEmbeddingModel.get(model_name).encode(chunked_texts)
     except Exception as e:
-        raise Exception(f"Failed to get embeddings: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Failed to get embeddings: {str(e)}") from e
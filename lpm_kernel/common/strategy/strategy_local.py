@@ -0,0 +1,28 @@
+from typing import Optional
+
+from lpm_kernel.api.dto.user_llm_config_dto import (
+    UserLLMConfigDTO,
+)
+from lpm_kernel.common.local_embedding import LocalEmbeddingModel
+
+LOCAL_ENDPOINT_PREFIX = "local://"
+
+
+def is_local_endpoint(embedding_endpoint: Optional[str]) -> bool:
+    return bool(embedding_endpoint) and embedding_endpoint.startswith(LOCAL_ENDPOINT_PREFIX)
+
+
+def local_model_name(user_llm_config: UserLLMConfigDTO) -> str:
+    """Model of a local endpoint, "local://<name or path>" or the embedding model name"""
+    model_name = user_llm_config.embedding_endpoint[len(LOCAL_ENDPOINT_PREFIX):].strip()
+    model_name = model_name or (user_llm_config.embedding_model_name or "").strip()
+    if not model_name:
+        raise ValueError("Local embedding endpoint needs a model name or path")
+    return model_name
+
+
+def local_strategy(user_llm_config: Optional[UserLLMConfigDTO], chunked_texts):
+    try:
+        return LocalEmbeddingModel.get(local_model_name(user_llm_config)).encode(chunked_texts)
+    except Exception as e:
+        raise Exception(f"Failed to get embeddings: {str(e)}") from e
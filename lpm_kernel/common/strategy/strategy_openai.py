@@ -6,23 +6,30 @@ from lpm_kernel.api.dto.user_llm_config_dto import (
 from lpm_kernel.configs.logging import get_train_process_logger
 logger = get_train_process_logger()
 import requests
+from lpm_kernel.common.http_client import HttpTransport
 
 def openai_strategy(user_llm_config: Optional[UserLLMConfigDTO], chunked_texts):
     try:
         headers = {
             "Authorization": f"Bearer {user_llm_config.embedding_api_key}",
-            "Content-Type": "application/json",
         }
 
         data = {"input": chunked_texts, "model": user_llm_config.embedding_model_name}
 
-        logger.info(f"Getting embedding for {data}, total chunks: {len(chunked_texts)}")
+        logger.debug(f"Getting embedding for {data}")
 
-        response = requests.post(
-            f"{user_llm_config.embedding_endpoint}/embeddings", headers=headers, json=data
+        # Pooled keep-alive session, retries 429 and 5xx with jittered backoff
+        response = HttpTransport.get_instance().post_json(
+            f"{user_llm_config.embedding_endpoint}/embeddings", data, headers=headers
         )
         response.raise_for_status()
         result = response.json()
+        # Packed requests carry up to EMBEDDING_REQUEST_MAX_TOKENS of text, so only sizes are logged
+        usage = result.get("usage") or {}
+        logger.info(
+            f"Got embeddings for {len(chunked_texts)} texts, "
+            f"{usage.get('total_tokens', 'unknown')} tokens"
+        )
 
         # Extract embedding vectors
         embeddings = [item["embedding"] for item in result["data"]]
@@ -31,5 +38,5 @@ def openai_strategy(user_llm_config: Optional[UserLLMConfigDTO], chunked_texts):
         return embeddings_array
 
     except requests.exceptions.RequestException as e:
-        raise Exception(f"Failed to get embeddings: {str(e)}", exc_info=True)
+        raise Exception(f"Failed to get embeddings: {str(e)}") from e
 
@@ -0,0 +1,46 @@
+"""
+Migration: Add document_fingerprints table
+Version: 20261018110000
+"""
+
+description = "Add document_fingerprints table for incremental training"
+
+def upgrade(conn):
+    """
+    Apply the migration
+    
+    Args:
+        conn: SQLite connection object
+    """
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS document_fingerprints (
+        document_id INTEGER PRIMARY KEY,
+        content_hash VARCHAR(64) NOT NULL,
+        chunk_params VARCHAR(100),
+        embedding_model VARCHAR(500),
+        chunk_fingerprint VARCHAR(64),
+        embedding_fingerprint VARCHAR(64),
+        l1_fingerprint VARCHAR(64),
+        update_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (document_id) REFERENCES document(id)
+    )
+    """)
+    print("Created document_fingerprints table")
+    
+    # No need to commit, the migration manager handles transactions
+
+def downgrade(conn):
+    """
+    Revert the migration
+    
+    Args:
+        conn: SQLite connection object
+    """
+    cursor = conn.cursor()
+    
+    cursor.execute("DROP TABLE IF EXISTS document_fingerprints")
+    print("Dropped document_fingerprints table")
+    
+    # No need to commit, the migration manager handles transactions
@@ -0,0 +1,49 @@
+"""
+Migration: Add train_step_jobs table
+Version: 20261018120000
+"""
+
+description = "Add train_step_jobs table for the training step queue"
+
+def upgrade(conn):
+    """
+    Apply the migration
+    
+    Args:
+        conn: SQLite connection object
+    """
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS train_step_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        model_name VARCHAR(200) NOT NULL,
+        step VARCHAR(100) NOT NULL,
+        status VARCHAR(50) NOT NULL DEFAULT 'pending',
+        depends_on TEXT NOT NULL DEFAULT '[]',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        worker VARCHAR(200),
+        error TEXT,
+        started_at TIMESTAMP,
+        finished_at TIMESTAMP,
+        update_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (model_name, step)
+    )
+    """)
+    print("Created train_step_jobs table")
+    
+    # No need to commit, the migration manager handles transactions
+
+def downgrade(conn):
+    """
+    Revert the migration
+    
+    Args:
+        conn: SQLite connection object
+    """
+    cursor = conn.cursor()
+    
+    cursor.execute("DROP TABLE IF EXISTS train_step_jobs")
+    print("Dropped train_step_jobs table")
+    
+    # No need to commit, the migration manager handles transactions
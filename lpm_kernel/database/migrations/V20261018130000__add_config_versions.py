@@ -0,0 +1,39 @@
+"""
+Migration: Add config_versions table
+Version: 20261018130000
+"""
+
+description = "Add config_versions table for configuration cache invalidation"
+
+def upgrade(conn):
+    """
+    Apply the migration
+    
+    Args:
+        conn: SQLite connection object
+    """
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS config_versions (
+        name VARCHAR(100) PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    print("Created config_versions table")
+    
+    # No need to commit, the migration manager handles transactions
+
+def downgrade(conn):
+    """
+    Revert the migration
+    
+    Args:
+        conn: SQLite connection object
+    """
+    cursor = conn.cursor()
+    
+    cursor.execute("DROP TABLE IF EXISTS config_versions")
+    print("Dropped config_versions table")
+    
+    # No need to commit, the migration manager handles transactions
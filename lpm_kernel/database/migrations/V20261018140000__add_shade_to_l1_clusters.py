@@ -0,0 +1,64 @@
+"""
+Migration: Add shade field to l1_clusters table
+Version: 20261018140000
+"""
+
+description = "Add shade field to l1_clusters table"
+
+def upgrade(conn):
+    """
+    Apply the migration
+    
+    Args:
+        conn: SQLite connection object
+    """
+    cursor = conn.cursor()
+    
+    # Check if shade column already exists in l1_clusters table
+    cursor.execute("PRAGMA table_info(l1_clusters)")
+    columns = [row[1] for row in cursor.fetchall()]
+    
+    if 'shade' not in columns:
+        cursor.execute("ALTER TABLE l1_clusters ADD COLUMN shade TEXT")
+        print("Added shade column to l1_clusters table")
+    
+    # No need to commit, the migration manager handles transactions
+
+def downgrade(conn):
+    """
+    Revert the migration
+    
+    Args:
+        conn: SQLite connection object
+    """
+    cursor = conn.cursor()
+    
+    # SQLite doesn't support dropping columns directly
+    # We need to create a new table without the shade field, copy the data, and replace the old table
+    cursor.execute("""
+    CREATE TABLE l1_clusters_temp (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        version INTEGER NOT NULL,
+        cluster_id VARCHAR(100),
+        memory_ids TEXT,
+        cluster_center TEXT,
+        create_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (version) REFERENCES l1_versions(version)
+    )
+    """)
+    
+    cursor.execute("""
+    INSERT INTO l1_clusters_temp (
+        id, version, cluster_id, memory_ids, cluster_center, create_time
+    )
+    SELECT 
+        id, version, cluster_id, memory_ids, cluster_center, create_time
+    FROM l1_clusters
+    """)
+    
+    cursor.execute("DROP TABLE l1_clusters")
+    cursor.execute("ALTER TABLE l1_clusters_temp RENAME TO l1_clusters")
+    
+    print("Removed shade field from l1_clusters table")
+    
+    # No need to commit, the migration manager handles transactions
@@ -0,0 +1,75 @@
+"""
+Migration: Add embedding_model field to l1_shades table
+Version: 20261018150000
+"""
+
+description = "Add embedding_model field to l1_shades table"
+
+def upgrade(conn):
+    """
+    Apply the migration
+    
+    Args:
+        conn: SQLite connection object
+    """
+    cursor = conn.cursor()
+    
+    # Check if embedding_model column already exists in l1_shades table
+    cursor.execute("PRAGMA table_info(l1_shades)")
+    columns = [row[1] for row in cursor.fetchall()]
+    
+    if 'embedding_model' not in columns:
+        cursor.execute("ALTER TABLE l1_shades ADD COLUMN embedding_model VARCHAR(500)")
+        print("Added embedding_model column to l1_shades table")
+    
+    # No need to commit, the migration manager handles transactions
+
+def downgrade(conn):
+    """
+    Revert the migration
+    
+    Args:
+        conn: SQLite connection object
+    """
+    cursor = conn.cursor()
+    
+    # SQLite doesn't support dropping columns directly
+    # We need to create a new table without the embedding_model field, copy the data, and replace the old table
+    cursor.execute("""
+    CREATE TABLE l1_shades_temp (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        version INTEGER NOT NULL,
+        name VARCHAR(200),
+        aspect VARCHAR(200),
+        icon VARCHAR(100),
+        desc_third_view TEXT,
+        content_third_view TEXT,
+        desc_second_view TEXT,
+        content_second_view TEXT,
+        embedding TEXT,
+        create_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (version) REFERENCES l1_versions(version)
+    )
+    """)
+    
+    cursor.execute("""
+    INSERT INTO l1_shades_temp (
+        id, version, name, aspect, icon,
+        desc_third_view, content_third_view,
+        desc_second_view, content_second_view,
+        embedding, create_time
+    )
+    SELECT 
+        id, version, name, aspect, icon,
+        desc_third_view, content_third_view,
+        desc_second_view, content_second_view,
+        embedding, create_time
+    FROM l1_shades
+    """)
+    
+    cursor.execute("DROP TABLE l1_shades")
+    cursor.execute("ALTER TABLE l1_shades_temp RENAME TO l1_shades")
+    
+    print("Removed embedding_model field from l1_shades table")
+    
+    # No need to commit, the migration manager handles transactions
@@ -1,5 +1,10 @@
-from typing import List
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
 from lpm_kernel.L1.bio import Chunk
+from lpm_kernel.common.process_pool import spawn_context
+import os
 import traceback
 import time
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -8,16 +13,53 @@ from lpm_kernel.configs.logging import get_train_process_logger
 logger = get_train_process_logger()
 
 
+SEPARATORS = ["\n\n", "\n", "。", "！", "？", ".", "!", "?", " ", ""]
+
+
+def _create_text_splitter(chunk_size: int, overlap: int) -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=overlap,
+        length_function=len,
+        separators=SEPARATORS,
+    )
+
+
+# Splitter of a pool worker process, created once by _init_worker
+_worker_text_splitter = None
+
+
+def _init_worker(chunk_size: int, overlap: int) -> None:
+    global _worker_text_splitter
+    _worker_text_splitter = _create_text_splitter(chunk_size, overlap)
+
+
+def _split_in_worker(content: str) -> List[str]:
+    return _worker_text_splitter.split_text(content)
+
+
+@dataclass
+class ChunkingMetrics:
+    """Throughput of a DocumentChunker.split_documents run"""
+
+    documents: int = 0
+    chars: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def chars_per_second(self) -> float:
+        return self.chars / self.seconds if self.seconds > 0 else 0.0
+
+
 class DocumentChunker:
-    def __init__(self, chunk_size: int = 1000, overlap: int = 200):
+    def __init__(self, chunk_size: int = 1000, overlap: int = 200, workers: Optional[int] = None):
         self.chunk_size = chunk_size
         self.overlap = overlap
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.overlap,
-            length_function=len,
-            separators=["\n\n", "\n", "。", "！", "？", ".", "!", "?", " ", ""],
-        )
+        # Process count for split_documents, defaults to the number of CPUs
+        self.workers = workers or os.cpu_count() or 1
+        self.text_splitter = _create_text_splitter(self.chunk_size, self.overlap)
+        self.metrics = ChunkingMetrics()
 
     def split(self, content: str) -> List[Chunk]:
         try:
@@ -30,17 +72,7 @@ class DocumentChunker:
             # use LangChain splitter
             texts = self.text_splitter.split_text(content)
 
-            chunks = [
-                Chunk(
-                    id=None,
-                    document_id=None,
-                    content=text,
-                    embedding=None,
-                    tags=None,
-                    topic=None,
-                )
-                for text in texts
-            ]
+            chunks = self._to_chunks(texts)
 
             logger.info(f"Split completed, created {len(chunks)} chunks")
             return chunks
@@ -49,3 +81,97 @@ class DocumentChunker:
             logger.error(f"Error in split method: {str(e)}")
             logger.error(traceback.format_exc())
             raise
+
+    def split_documents(
+        self, documents: Iterable[Tuple[int, str]]
+    ) -> Iterator[Tuple[int, Optional[List[Chunk]]]]:
+        """Split many documents across a process pool
+
+        Documents are consumed lazily and results are yielded in input order as
+        soon as they are ready, with at most a few documents per worker in flight.
+        Chunks are identical to split() for the same chunk size and overlap.
+
+        Args:
+            documents: (document_id, content) pairs
+
+        Yields:
+            (document_id, chunks), chunks is None if splitting the document failed
+        """
+        self.metrics = ChunkingMetrics()
+        start_time = time.perf_counter()
+
+        if self.workers <= 1:
+            for document_id, content in documents:
+                yield document_id, self._split_and_count(document_id, content)
+            self._log_metrics(start_time)
+            return
+
+        context = spawn_context()
+        max_in_flight = self.workers * 4
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.chunk_size, self.overlap),
+        ) as executor:
+            pending = deque()
+            documents = iter(documents)
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < max_in_flight:
+                    try:
+                        document_id, content = next(documents)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = executor.submit(_split_in_worker, content or "")
+                    pending.append((document_id, content, future))
+                if not pending:
+                    break
+
+                document_id, content, future = pending.popleft()
+                try:
+                    chunks = self._to_chunks(future.result())
+                    self._count(content, chunks)
+                except Exception as e:
+                    logger.error(f"Error splitting document {document_id}: {str(e)}")
+                    chunks = None
+                yield document_id, chunks
+
+        self._log_metrics(start_time)
+
+    def _split_and_count(self, document_id: int, content: str) -> Optional[List[Chunk]]:
+        try:
+            chunks = self._to_chunks(self.text_splitter.split_text(content or ""))
+        except Exception as e:
+            logger.error(f"Error splitting document {document_id}: {str(e)}")
+            return None
+        self._count(content, chunks)
+        return chunks
+
+    def _count(self, content: str, chunks: List[Chunk]) -> None:
+        self.metrics.documents += 1
+        self.metrics.chars += len(content or "")
+        self.metrics.chunks += len(chunks)
+
+    def _log_metrics(self, start_time: float) -> None:
+        self.metrics.seconds = time.perf_counter() - start_time
+        logger.info(
+            f"Split {self.metrics.documents} documents into {self.metrics.chunks} chunks "
+            f"in {self.metrics.seconds:.2f}s ({self.metrics.chars_per_second:.0f} chars/sec, "
+            f"{self.workers} workers)"
+        )
+
+    @staticmethod
+    def _to_chunks(texts: List[str]) -> List[Chunk]:
+        return [
+            Chunk(
+                id=None,
+                document_id=None,
+                content=text,
+                embedding=None,
+                tags=None,
+                topic=None,
+            )
+            for text in texts
+        ]
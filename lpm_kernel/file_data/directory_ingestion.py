@@ -0,0 +1,233 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from lpm_kernel.common.process_pool import spawn_context
+from lpm_kernel.file_data.core.file_type import FileType
+from lpm_kernel.file_data.document import Document
+from lpm_kernel.file_data.document_manifest import DocumentManifest
+from lpm_kernel.file_data.document_repository import DocumentRepository
+from lpm_kernel.file_data.process_factory import ProcessorFactory
+from lpm_kernel.file_data.process_status import ProcessStatus
+
+from lpm_kernel.configs.logging import get_train_process_logger
+logger = get_train_process_logger()
+
+
+def walk_files(root: Path, recursive: bool = False) -> Iterator[Path]:
+    """Yield the files below root while walking, without listing the tree first"""
+    directories = [root]
+    while directories:
+        directory = directories.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            directories.append(Path(entry.path))
+                    elif entry.is_file():
+                        yield Path(entry.path)
+        except OSError as e:
+            logger.warning(f"Cannot read directory {directory}: {str(e)}")
+
+
+def _init_worker() -> None:
+    # Files are already spread over processes, so each PDF is read inline
+    os.environ["PDF_EXTRACT_WORKERS"] = "1"
+
+
+def extract_file(file_path: str) -> dict:
+    """Extract one file with the processor of its type, runs in a pool worker"""
+    start_time = time.perf_counter()
+    doc = ProcessorFactory.auto_detect_and_process(file_path)
+    return {
+        "name": doc.name,
+        "mime_type": doc.mime_type,
+        "document_size": doc.document_size,
+        "raw_content": doc.raw_content,
+        "extract_status": doc.extract_status,
+        "seconds": time.perf_counter() - start_time,
+    }
+
+
+@dataclass
+class IngestionMetrics:
+    """Per-stage counters of a directory ingestion run"""
+
+    found: int = 0
+    unsupported: int = 0
+    already_imported: int = 0
+    extracted: int = 0
+    extract_failed: int = 0
+    duplicates: int = 0
+    inserted: int = 0
+    extract_seconds: float = 0.0
+    insert_seconds: float = 0.0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        def rate(count: int, seconds: float) -> float:
+            return count / seconds if seconds > 0 else 0.0
+
+        return (
+            f"found {self.found} files in {self.seconds:.2f}s "
+            f"({rate(self.found, self.seconds):.1f} files/sec); "
+            f"skipped {self.unsupported} unsupported, {self.already_imported} already imported, "
+            f"{self.duplicates} duplicate content; "
+            f"extracted {self.extracted} ({rate(self.extracted, self.extract_seconds):.1f} files "
+            f"per worker-second), {self.extract_failed} failed; "
+            f"inserted {self.inserted} ({rate(self.inserted, self.insert_seconds):.1f} docs/sec)"
+        )
+
+
+class DirectoryIngestion:
+    """Imports the files of a directory as documents
+
+    Stages:
+    - walk: files are streamed from the directory tree
+    - filter: unsupported types and files whose path and size were already
+      imported are skipped before extraction
+    - extract: files are processed by their file type processor in a pool of
+      worker processes
+    - dedupe: files whose extracted content equals an existing or earlier
+      document are skipped
+    - insert: documents are written in batches
+    """
+
+    def __init__(
+        self,
+        repository: DocumentRepository,
+        workers: Optional[int] = None,
+        insert_batch_size: int = 200,
+    ):
+        self._repository = repository
+        self.workers = workers or os.cpu_count() or 1
+        self.insert_batch_size = insert_batch_size
+        self.metrics = IngestionMetrics()
+
+    def run(self, root: Path, recursive: bool = False) -> List[Document]:
+        self.metrics = IngestionMetrics()
+        start_time = time.perf_counter()
+
+        supported_suffixes = set(FileType.get_mime_mapping().keys())
+        import_keys = self._repository.find_import_keys()
+        content_hashes = {
+            DocumentManifest.content_hash(raw_content)
+            for raw_content in self._repository.iter_raw_contents()
+            if raw_content
+        }
+
+        def candidate_files() -> Iterator[Path]:
+            for file_path in walk_files(root, recursive):
+                self.metrics.found += 1
+                if file_path.suffix.lower() not in supported_suffixes:
+                    self.metrics.unsupported += 1
+                    continue
+                try:
+                    size = file_path.stat().st_size
+                except OSError:
+                    continue
+                if (str(file_path.absolute()), size) in import_keys:
+                    self.metrics.already_imported += 1
+                    continue
+                yield file_path
+
+        saved: List[Document] = []
+        pending: List[Document] = []
+        for file_path, extracted in self._extract_all(candidate_files()):
+            if extracted is None:
+                continue
+            # Files without text, e.g. images without recognized text, are never duplicates
+            if extracted["raw_content"]:
+                content_hash = DocumentManifest.content_hash(extracted["raw_content"])
+                if content_hash in content_hashes:
+                    self.metrics.duplicates += 1
+                    logger.info(f"Skipping {file_path}, same content as an existing document")
+                    continue
+                content_hashes.add(content_hash)
+
+            pending.append(
+                Document(
+                    name=extracted["name"],
+                    title=extracted["name"],
+                    mime_type=extracted["mime_type"],
+                    user_description="Auto scanned document",
+                    url=str(file_path.absolute()),
+                    document_size=extracted["document_size"],
+                    extract_status=extracted["extract_status"],
+                    embedding_status=ProcessStatus.INITIALIZED,
+                    raw_content=extracted["raw_content"],
+                )
+            )
+            if len(pending) >= self.insert_batch_size:
+                saved.extend(self._insert(pending))
+                pending = []
+        if pending:
+            saved.extend(self._insert(pending))
+
+        self.metrics.seconds = time.perf_counter() - start_time
+        logger.info(f"Directory ingestion of {root}: {self.metrics.summary()}")
+        return saved
+
+    def _extract_all(self, files: Iterator[Path]) -> Iterator[tuple]:
+        """Yield (file path, extracted fields or None on failure) in completion order"""
+        if self.workers <= 1:
+            for file_path in files:
+                yield file_path, self._collect(file_path, lambda: extract_file(str(file_path)))
+            return
+
+        context = spawn_context()
+        max_in_flight = self.workers * 4
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=context, initializer=_init_worker
+        ) as executor:
+            in_flight = {}
+            exhausted = False
+            while in_flight or not exhausted:
+                while not exhausted and len(in_flight) < max_in_flight:
+                    file_path = next(files, None)
+                    if file_path is None:
+                        exhausted = True
+                        break
+                    in_flight[executor.submit(extract_file, str(file_path))] = file_path
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = in_flight.pop(future)
+                    yield file_path, self._collect(file_path, future.result)
+
+    def _collect(self, file_path: Path, get_result) -> Optional[dict]:
+        try:
+            extracted = get_result()
+        except Exception as e:
+            self.metrics.extract_failed += 1
+            logger.error(f"Error processing file {file_path}: {str(e)}")
+            return None
+        self.metrics.extracted += 1
+        self.metrics.extract_seconds += extracted["seconds"]
+        return extracted
+
+    def _insert(self, documents: List[Document]) -> List[Document]:
+        start_time = time.perf_counter()
+        try:
+            saved = self._repository.create_many(documents)
+        except Exception as e:
+            logger.warning(
+                f"Saving a batch of {len(documents)} documents failed, retrying individually: {str(e)}"
+            )
+            saved = []
+            for document in documents:
+                # fresh copy, the rolled back batch may have assigned an id
+                fields = {key: value for key, value in document.to_dict().items() if key != "id"}
+                try:
+                    saved.append(self._repository.create(Document.from_dict(fields)))
+                except Exception as e:
+                    logger.error(f"Error saving scanned document {document.url}: {str(e)}")
+        self.metrics.insert_seconds += time.perf_counter() - start_time
+        self.metrics.inserted += len(saved)
+        return saved
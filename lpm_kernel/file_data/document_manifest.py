@@ -0,0 +1,144 @@
+import hashlib
+from typing import Dict, List, Optional
+
+from lpm_kernel.common.repository.database_session import DatabaseSession
+from lpm_kernel.models.document_fingerprint import DocumentFingerprint
+
+from lpm_kernel.configs.logging import get_train_process_logger
+logger = get_train_process_logger()
+
+
+def _sha256(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class DocumentManifest:
+    """Per-document fingerprints of the inputs each training step ran with
+
+    A step can skip a document when the fingerprint it would produce now equals
+    the stored one:
+    - chunking: raw content hash and chunker parameters
+    - chunk embedding: chunk fingerprint and embedding model
+    - L1: chunk fingerprint and embedding model of the version folded into the
+      latest L1 data, L1 clusters and chunk topics refer to chunk ids, which
+      re-chunking replaces, and cluster centers are vectors of that model
+    """
+
+    @staticmethod
+    def content_hash(raw_content: Optional[str]) -> str:
+        return _sha256(raw_content or "")
+
+    @staticmethod
+    def chunk_params(chunk_size: int, overlap: int) -> str:
+        return f"size={chunk_size},overlap={overlap}"
+
+    @staticmethod
+    def chunk_fingerprint(content_hash: str, chunk_params: str) -> str:
+        return _sha256(content_hash, chunk_params)
+
+    @staticmethod
+    def embedding_fingerprint(chunk_fingerprint: str, embedding_model: str) -> str:
+        return _sha256(chunk_fingerprint, embedding_model)
+
+    def get_entries(self, document_ids: Optional[List[int]] = None) -> Dict[int, dict]:
+        """Get manifest entries by document id, all entries if no ids are given"""
+        with DatabaseSession.session() as session:
+            query = session.query(DocumentFingerprint)
+            if document_ids is not None:
+                query = query.filter(DocumentFingerprint.document_id.in_(document_ids))
+            return {
+                entry.document_id: {
+                    "content_hash": entry.content_hash,
+                    "chunk_params": entry.chunk_params,
+                    "embedding_model": entry.embedding_model,
+                    "chunk_fingerprint": entry.chunk_fingerprint,
+                    "embedding_fingerprint": entry.embedding_fingerprint,
+                    "l1_fingerprint": entry.l1_fingerprint,
+                }
+                for entry in query.all()
+            }
+
+    def mark_chunked(self, content_hashes: Dict[int, str], chunk_params: str) -> None:
+        """Record that documents were chunked, their chunks still need embeddings
+
+        Args:
+            content_hashes: raw content hash per chunked document id
+            chunk_params: chunker parameters the documents were split with
+        """
+        if not content_hashes:
+            return
+        with DatabaseSession.session() as session:
+            entries = {
+                entry.document_id: entry
+                for entry in session.query(DocumentFingerprint)
+                .filter(DocumentFingerprint.document_id.in_(list(content_hashes.keys())))
+                .all()
+            }
+            for document_id, content_hash in content_hashes.items():
+                entry = entries.get(document_id)
+                if entry is None:
+                    entry = DocumentFingerprint(document_id=document_id, content_hash=content_hash)
+                    session.add(entry)
+                entry.content_hash = content_hash
+                entry.chunk_params = chunk_params
+                entry.chunk_fingerprint = self.chunk_fingerprint(content_hash, chunk_params)
+                entry.embedding_model = None
+                entry.embedding_fingerprint = None
+            session.commit()
+
+    def mark_embedded(self, document_ids: List[int], embedding_model: str) -> None:
+        """Record that all chunks of the documents are embedded with the model"""
+        if not document_ids:
+            return
+        with DatabaseSession.session() as session:
+            entries = (
+                session.query(DocumentFingerprint)
+                .filter(DocumentFingerprint.document_id.in_(document_ids))
+                .all()
+            )
+            for entry in entries:
+                if entry.chunk_fingerprint is None:
+                    continue
+                entry.embedding_model = embedding_model
+                entry.embedding_fingerprint = self.embedding_fingerprint(
+                    entry.chunk_fingerprint, embedding_model
+                )
+            session.commit()
+
+    def mark_stale(self, document_ids: List[int]) -> None:
+        """Forget the fingerprints of documents whose chunks may not match them
+
+        The documents are chunked and embedded again by the next run, and
+        chunk_embedding treats them as not embedded.
+        """
+        if not document_ids:
+            return
+        with DatabaseSession.session() as session:
+            entries = (
+                session.query(DocumentFingerprint)
+                .filter(DocumentFingerprint.document_id.in_(document_ids))
+                .all()
+            )
+            for entry in entries:
+                entry.chunk_fingerprint = None
+                entry.embedding_model = None
+                entry.embedding_fingerprint = None
+            session.commit()
+
+    def mark_in_l1(self, document_ids: List[int], embedding_model: str) -> None:
+        """Record that the latest L1 data was built from exactly these documents
+
+        Args:
+            document_ids: documents the L1 data was built from
+            embedding_model: key of the embedding model of the memories it clustered
+        """
+        document_ids = set(document_ids)
+        with DatabaseSession.session() as session:
+            for entry in session.query(DocumentFingerprint).all():
+                entry.l1_fingerprint = (
+                    self.embedding_fingerprint(entry.chunk_fingerprint, embedding_model)
+                    if entry.document_id in document_ids and entry.chunk_fingerprint
+                    else None
+                )
+            session.commit()
+        logger.info(f"Marked {len(document_ids)} documents as included in L1")
@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict
+from typing import Iterator, List, Optional, Dict, Set, Tuple
 from sqlalchemy import select
 from lpm_kernel.common.repository.base_repository import BaseRepository
 from lpm_kernel.file_data.document import Document
@@ -60,6 +60,92 @@ class DocumentRepository(BaseRepository[Document]):
                 for chunk in chunks
             ]
 
+    def find_chunks_by_document_ids(self, document_ids: List[int]) -> List[ChunkDTO]:
+        """search all chunks of the specified documents"""
+        with self._db.session() as session:
+            chunks = (
+                session.query(ChunkModel)
+                .filter(ChunkModel.document_id.in_(document_ids))
+                .order_by(ChunkModel.id)
+                .all()
+            )
+            return [chunk.to_dto() for chunk in chunks]
+
+    def replace_chunks(self, chunks_by_document: Dict[int, List[dict]]) -> List[int]:
+        """
+        replace the chunks of several documents in one transaction
+
+        Existing chunks of the documents are deleted and the new rows are bulk inserted.
+        Returns the ids of the deleted chunks.
+        """
+        document_ids = list(chunks_by_document.keys())
+        with self._db.session() as session:
+            try:
+                deleted_ids = [
+                    chunk_id
+                    for (chunk_id,) in session.query(ChunkModel.id)
+                    .filter(ChunkModel.document_id.in_(document_ids))
+                    .all()
+                ]
+                if deleted_ids:
+                    session.query(ChunkModel).filter(
+                        ChunkModel.document_id.in_(document_ids)
+                    ).delete(synchronize_session=False)
+                rows = [
+                    {**row, "document_id": document_id, "has_embedding": False}
+                    for document_id, document_rows in chunks_by_document.items()
+                    for row in document_rows
+                ]
+                if rows:
+                    session.bulk_insert_mappings(ChunkModel, rows)
+                session.commit()
+                return deleted_ids
+            except Exception:
+                session.rollback()
+                raise
+
+    def create_many(self, documents: List[Document]) -> List[Document]:
+        """create several documents in one transaction"""
+        with self._db.session() as session:
+            try:
+                created = []
+                for doc in documents:
+                    # the nullable id rules out a multi-row INSERT ... RETURNING,
+                    # so rows are flushed one by one and committed together
+                    session.add(doc)
+                    session.flush()
+                    created.append(self.model.from_dict(doc.to_dict()))
+                session.commit()
+                return created
+            except Exception:
+                session.rollback()
+                raise
+
+    def find_import_keys(self) -> Set[Tuple[str, int]]:
+        """(url, document_size) of every document that was imported from a file"""
+        with self._db.session() as session:
+            rows = session.execute(
+                select(Document.url, Document.document_size).where(Document.url.is_not(None))
+            )
+            return {(url, size) for url, size in rows}
+
+    def iter_raw_contents(self, batch_size: int = 500) -> Iterator[Optional[str]]:
+        """stream the raw content of all documents without loading them at once"""
+        with self._db.session() as session:
+            rows = session.execute(
+                select(Document.raw_content).execution_options(yield_per=batch_size)
+            )
+            for (raw_content,) in rows:
+                yield raw_content
+
+    def reset_analyze_status(self, document_id: int) -> None:
+        """mark doc as unanalyzed so its insight and summary are generated again"""
+        with self._db.session() as session:
+            document = session.get(self.model, document_id)
+            if document:
+                document.analyze_status = ProcessStatus.INITIALIZED
+                session.commit()
+
     def save_chunk(self, chunk: ChunkModel) -> ChunkModel:
         """save chunk"""
         with self._db.session() as session:
@@ -91,6 +177,21 @@ class DocumentRepository(BaseRepository[Document]):
             logger.error(f"Error updating chunk embedding status: {str(e)}")
             raise
 
+    def update_chunks_embedding_status(self, chunk_ids: List[int], has_embedding: bool) -> None:
+        """update embedding status of multiple chunks in one transaction"""
+        if not chunk_ids:
+            return
+        try:
+            with self._db.session() as session:
+                session.query(ChunkModel).filter(ChunkModel.id.in_(chunk_ids)).update(
+                    {ChunkModel.has_embedding: has_embedding}, synchronize_session=False
+                )
+                session.commit()
+                logger.debug(f"Updated embedding status for {len(chunk_ids)} chunks")
+        except Exception as e:
+            logger.error(f"Error updating chunks embedding status: {str(e)}")
+            raise
+
     def find_unembedding(self) -> List[DocumentDTO]:
         """search unembedding documents according to embedding_status"""
         with self._db.session() as session:
@@ -1,11 +1,16 @@
 # file_data/service.py
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import os
+import random
+import threading
+import time
 from sqlalchemy import select
 
 from lpm_kernel.common.repository.database_session import DatabaseSession
 from lpm_kernel.common.repository.vector_store_factory import VectorStoreFactory
+from lpm_kernel.configs.config import Config
 from lpm_kernel.file_data.document_dto import DocumentDTO, CreateDocumentRequest
 from lpm_kernel.file_data.exceptions import FileProcessingError
 from lpm_kernel.kernel.l0_base import InsightKernel, SummaryKernel
@@ -13,8 +18,8 @@ from lpm_kernel.models.memory import Memory
 from .document import Document
 from .document_repository import DocumentRepository
 from .dto.chunk_dto import ChunkDTO
+from .directory_ingestion import DirectoryIngestion
 from .embedding_service import EmbeddingService
-from .process_factory import ProcessorFactory
 from .process_status import ProcessStatus
 
 from lpm_kernel.configs.logging import get_train_process_logger
@@ -29,6 +34,15 @@ class DocumentService:
         self.vector_store = VectorStoreFactory.get_instance()
         self.embedding_service = EmbeddingService()
 
+        # Settings for analyzing documents in parallel
+        config = Config.from_env()
+        self.analysis_concurrency = int(config.get("L0_ANALYSIS_CONCURRENCY", 4))
+        self.analysis_max_retries = int(config.get("L0_ANALYSIS_MAX_RETRIES", 5))
+        self.analysis_backoff_seconds = float(config.get("L0_ANALYSIS_BACKOFF_SECONDS", 2))
+        self.analysis_max_backoff_seconds = float(config.get("L0_ANALYSIS_MAX_BACKOFF_SECONDS", 60))
+        self._rate_limit_lock = threading.Lock()
+        self._rate_limited_until = 0.0
+
     def create_document(self, data: CreateDocumentRequest) -> Document:
         """
         create new document
@@ -76,45 +90,16 @@ class DocumentService:
         if not path.is_dir():
             raise FileProcessingError(f"{directory_path} is not a directory")
 
-        documents_dtos: List[DocumentDTO] = []
-        pattern = "**/*" if recursive else "*"
-
-        # list all files
-        files = list(path.glob(pattern))
-        logger.info(f"Found files: {files}")
-
-        for file_path in files:
-            if file_path.is_file():
-                try:
-                    logger.info(f"Processing file: {file_path}")
-                    doc = ProcessorFactory.auto_detect_and_process(str(file_path))
-
-                    # create CreateDocumentRequest obj to database
-                    request = CreateDocumentRequest(
-                        name=doc.name,
-                        title=doc.name,
-                        mime_type=doc.mime_type,
-                        user_description="Auto scanned document",
-                        document_size=doc.document_size,
-                        url=str(file_path.absolute()),
-                        raw_content=doc.raw_content,
-                        extract_status=doc.extract_status,
-                        embedding_status=ProcessStatus.INITIALIZED,
-                    )
-                    saved_doc = self.create_document(request)
-
-                    documents_dtos.append(saved_doc.to_dto())
-                    logger.info(f"Successfully processed and saved: {file_path}")
-
-                except Exception as e:
-                    # add detailed error log
-                    logger.exception(
-                        f"Error processing file {file_path}"
-                    )
-                    continue
+        config = Config.from_env()
+        ingestion = DirectoryIngestion(
+            self._repository,
+            workers=int(config.get("SCAN_WORKERS", 0)) or None,
+            insert_batch_size=int(config.get("SCAN_INSERT_BATCH_SIZE", 200)),
+        )
+        saved_docs = ingestion.run(path, recursive=recursive)
 
-        logger.info(f"Total documents processed and saved: {len(documents_dtos)}")
-        return documents_dtos
+        logger.info(f"Total documents processed and saved: {len(saved_docs)}")
+        return [doc.to_dto() for doc in saved_docs]
 
     def _analyze_document(self, doc: DocumentDTO) -> DocumentDTO:
         """
@@ -179,6 +164,25 @@ class DocumentService:
             self._update_analyze_status_failed(document_id)
             raise
 
+    def delete_chunk_embeddings(self, chunk_ids: List[int]) -> None:
+        """
+        delete chunk embeddings from the vector store, e.g. after the chunks were replaced
+        Args:
+            chunk_ids (List[int]): chunk IDs
+        """
+        if not chunk_ids:
+            return
+        try:
+            self.embedding_service.chunk_collection.delete(
+                ids=[str(chunk_id) for chunk_id in chunk_ids]
+            )
+        except Exception as e:
+            logger.error(f"Error deleting {len(chunk_ids)} chunk embeddings: {str(e)}")
+
+    def reset_document_analysis(self, document_id: int) -> None:
+        """mark a document for analysis again, e.g. after its content changed"""
+        self._repository.reset_analyze_status(document_id)
+
     def _update_analyze_status_failed(self, doc_id: int) -> None:
         """update status as failed"""
         try:
@@ -206,9 +210,17 @@ class DocumentService:
             logger.error(f"Error checking documents embedding status: {str(e)}", exc_info=True)
             raise
 
-    def analyze_all_documents(self) -> List[DocumentDTO]:
+    def analyze_all_documents(
+        self, progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List[DocumentDTO]:
         """
-        analyze all unanalyzed documents
+        analyze all unanalyzed documents with a bounded pool of workers
+
+        Every document is marked as analyzed as soon as it finishes, so after a
+        crash only the unfinished documents are picked up again.
+        Args:
+            progress_callback (Callable[[int, int], None], optional): called with
+                (finished, total) after each document, from the calling thread
         Returns:
             List[DocumentDTO]: finished doc list
         Raises:
@@ -217,27 +229,90 @@ class DocumentService:
         try:
             # get all unanalyzed documents
             unanalyzed_docs = self._repository.find_unanalyzed()
+            total = len(unanalyzed_docs)
+            logger.info(
+                f"Analyzing {total} documents with concurrency {self.analysis_concurrency}"
+            )
 
             analyzed_docs = []
             success_count = 0
             error_count = 0
+            if progress_callback:
+                progress_callback(0, total)
 
-            for index, doc in enumerate(unanalyzed_docs, 1):
-                try:
-                    analyzed_doc = self._analyze_document(doc)
-                    analyzed_docs.append(analyzed_doc)
-                    success_count += 1
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"Document {doc.id} processing failed: {str(e)}")
-                    continue
+            with ThreadPoolExecutor(max_workers=max(1, self.analysis_concurrency)) as executor:
+                futures = {
+                    executor.submit(self._analyze_document_with_backoff, doc): doc
+                    for doc in unanalyzed_docs
+                }
+                for future in as_completed(futures):
+                    doc = futures[future]
+                    try:
+                        analyzed_docs.append(future.result())
+                        success_count += 1
+                    except Exception as e:
+                        error_count += 1
+                        logger.error(f"Document {doc.id} processing failed: {str(e)}")
+                    if progress_callback:
+                        progress_callback(success_count + error_count, total)
 
+            logger.info(
+                f"Document analysis finished: {success_count} succeeded, {error_count} failed"
+            )
             return analyzed_docs
 
         except Exception as e:
             logger.error(f"Error occurred during batch analysis: {str(e)}", exc_info=True)
             raise
 
+    def _analyze_document_with_backoff(self, doc: DocumentDTO) -> DocumentDTO:
+        """
+        analyze one file, retrying with exponential backoff when rate limited
+
+        A rate limit hit by one worker pauses all workers, since they share the
+        same API quota.
+        """
+        attempt = 0
+        while True:
+            self._wait_for_rate_limit()
+            try:
+                return self._analyze_document(doc)
+            except Exception as e:
+                if not self._is_rate_limit_error(e) or attempt >= self.analysis_max_retries:
+                    raise
+                delay = min(
+                    self.analysis_backoff_seconds * (2 ** attempt),
+                    self.analysis_max_backoff_seconds,
+                )
+                delay += random.uniform(0, delay / 2)
+                attempt += 1
+                logger.warning(
+                    f"Document {doc.id} hit rate limit, retry {attempt}/{self.analysis_max_retries} in {delay:.1f}s"
+                )
+                with self._rate_limit_lock:
+                    self._rate_limited_until = max(self._rate_limited_until, time.time() + delay)
+
+    def _wait_for_rate_limit(self) -> None:
+        """sleep until the shared rate limit pause is over"""
+        while True:
+            with self._rate_limit_lock:
+                remaining = self._rate_limited_until - time.time()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    @staticmethod
+    def _is_rate_limit_error(error: BaseException) -> bool:
+        """check the error and the errors it was raised from for an HTTP 429"""
+        while error is not None:
+            if getattr(error, "status_code", None) == 429:
+                return True
+            message = str(error).lower()
+            if "rate limit" in message or "error code: 429" in message:
+                return True
+            error = error.__cause__ or error.__context__
+        return False
+
     def get_document_l0(self, document_id: int) -> Dict:
         """
         get chunks and embeds
@@ -405,9 +480,50 @@ class DocumentService:
             )
 
             # update state in db
-            for chunk_dto in processed_chunks:
-                if chunk_dto.has_embedding:
-                    self._repository.update_chunk_embedding_status(chunk_dto.id, True)
+            self._repository.update_chunks_embedding_status(
+                [c.id for c in processed_chunks if c.has_embedding], True
+            )
+
+            return processed_chunks
+
+        except Exception as e:
+            logger.error(f"Error processing chunk embeddings: {str(e)}")
+            raise
+
+    def generate_all_chunk_embeddings(
+        self, document_ids: List[int], force: bool = False
+    ) -> List[ChunkDTO]:
+        """
+        handle chunks and embeddings of many documents as one batched run
+        Args:
+            document_ids (List[int]): doc IDs
+            force (bool): drop existing chunk embeddings and embed all chunks again,
+                e.g. after the embedding model changed
+        Returns:
+            List[ChunkDTO]: chunks list, failed chunks keep has_embedding=False
+        Raises:
+            Exception: error occurred
+        """
+        try:
+            chunks_dtos = self._repository.find_chunks_by_document_ids(document_ids)
+            if not chunks_dtos:
+                logger.info(f"No chunks found for {len(document_ids)} documents")
+                return []
+
+            if force:
+                embedded_ids = [c.id for c in chunks_dtos if c.has_embedding]
+                self.delete_chunk_embeddings(embedded_ids)
+                self._repository.update_chunks_embedding_status(embedded_ids, False)
+                for chunk in chunks_dtos:
+                    chunk.has_embedding = False
+
+            processed_chunks = self.embedding_service.generate_chunk_embeddings(
+                chunks_dtos
+            )
+
+            self._repository.update_chunks_embedding_status(
+                [c.id for c in processed_chunks if c.has_embedding], True
+            )
 
             return processed_chunks
 
@@ -2,8 +2,12 @@ from typing import List, Tuple
 import chromadb
 from chromadb.utils import embedding_functions
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import tiktoken
 from .dto.chunk_dto import ChunkDTO
 from lpm_kernel.common.llm import LLMClient
+from lpm_kernel.configs.config import Config
 from lpm_kernel.file_data.document_dto import DocumentDTO
 from typing import List, Dict, Optional
 from lpm_kernel.configs.logging import get_train_process_logger
@@ -18,6 +22,14 @@ class EmbeddingService:
         chroma_path = os.getenv("CHROMA_PERSIST_DIRECTORY", "./data/chroma_db")
         self.client = chromadb.PersistentClient(path=chroma_path)
         self.llm_client = LLMClient()
+
+        # Batching settings for chunk embeddings
+        config = Config.from_env()
+        self.batch_size = int(config.get("EMBEDDING_BATCH_SIZE", 64))
+        self.batch_max_tokens = int(config.get("EMBEDDING_BATCH_MAX_TOKENS", 8000))
+        self.concurrency = int(config.get("EMBEDDING_CONCURRENCY", 4))
+        self.store_batch_size = int(config.get("EMBEDDING_STORE_BATCH_SIZE", 500))
+        self._encoding = None
         
         # Get embedding model dimension from user config
         try:
@@ -160,7 +172,9 @@ class EmbeddingService:
     def generate_chunk_embeddings(self, chunks: List[ChunkDTO]) -> List[ChunkDTO]:
         """Process chunk level embeddings"""
         """
-        Store in ChromaDB, the structure is as follows:
+        Chunks are packed into token-budgeted batches which are embedded
+        concurrently, a failed batch is retried chunk by chunk, and results
+        are stored in ChromaDB with bulk add calls. The structure is as follows:
         documents=[c.content for c in unprocessed_chunks],
                     ids=[str(c.id) for c in unprocessed_chunks],
                     embeddings=embeddings.tolist(),
@@ -172,6 +186,7 @@ class EmbeddingService:
                         }
                         for c in unprocessed_chunks
                     ],
+        Chunks whose embedding could not be generated keep has_embedding=False.
         """
         try:
             unprocessed_chunks = [c for c in chunks if not c.has_embedding]
@@ -179,61 +194,130 @@ class EmbeddingService:
                 logger.info("No unprocessed chunks found")
                 return chunks
 
-            logger.info(f"Processing embeddings for {len(unprocessed_chunks)} chunks")
-
-            contents = [c.content for c in unprocessed_chunks]
-            logger.info("Getting embeddings from LLM service... {}".format(contents))
-            embeddings = self.llm_client.get_embedding(contents)
+            start_time = time.time()
+            batches = self._build_batches(unprocessed_chunks)
+            logger.info(
+                f"Processing embeddings for {len(unprocessed_chunks)} chunks "
+                f"in {len(batches)} batches with concurrency {self.concurrency}"
+            )
 
-            if embeddings is None or len(embeddings) == 0:
-                logger.error("Failed to get embeddings from LLM service")
-                return chunks
+            embedded: List[Tuple[ChunkDTO, List[float]]] = []
+            with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as executor:
+                futures = [
+                    executor.submit(self._embed_batch, batch) for batch in batches
+                ]
+                for future in as_completed(futures):
+                    embedded.extend(future.result())
 
-            logger.info(f"Successfully got embeddings with shape: {embeddings.shape}")
+            failed_count = len(unprocessed_chunks) - len(embedded)
+            if failed_count:
+                logger.error(f"Failed to get embeddings for {failed_count} chunks")
 
             try:
-                logger.info("Adding embeddings to ChromaDB...")
-                self.chunk_collection.add(
-                    documents=[c.content for c in unprocessed_chunks],
-                    ids=[str(c.id) for c in unprocessed_chunks],
-                    embeddings=embeddings.tolist(),
-                    metadatas=[
-                        {
-                            "document_id": str(c.document_id),
-                            "topic": c.topic or "",
-                            "tags": ",".join(c.tags) if c.tags else "",
-                        }
-                        for c in unprocessed_chunks
-                    ],
-                )
-                logger.info("Successfully added embeddings to ChromaDB")
-
-                # verify embeddings storage
-                for chunk in unprocessed_chunks:
-                    result = self.chunk_collection.get(
-                        ids=[str(chunk.id)], include=["embeddings"]
-                    )
-                    if result and result["embeddings"]:
-                        chunk.has_embedding = True
-                        logger.info(f"Verified embedding for chunk {chunk.id}")
-                    else:
-                        logger.warning(
-                            f"Failed to verify embedding for chunk {chunk.id}"
-                        )
-                        chunk.has_embedding = False
-
+                self._store_chunk_embeddings(embedded)
             except Exception as e:
                 logger.error(f"Error storing embeddings in ChromaDB: {str(e)}", exc_info=True)
                 for chunk in unprocessed_chunks:
                     chunk.has_embedding = False
                 raise
 
+            elapsed = time.time() - start_time
+            stored_count = sum(1 for c in unprocessed_chunks if c.has_embedding)
+            logger.info(
+                f"Chunk embedding finished: {stored_count}/{len(unprocessed_chunks)} chunks "
+                f"in {elapsed:.2f}s ({stored_count / elapsed if elapsed > 0 else 0:.2f} chunks/sec)"
+            )
+
             return chunks
 
         except Exception as e:
             logger.error(f"Error processing chunk embeddings: {str(e)}", exc_info=True)
             raise
 
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens of a text with the cl100k_base encoding"""
+        if self._encoding is None:
+            self._encoding = tiktoken.get_encoding("cl100k_base")
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def _build_batches(self, chunks: List[ChunkDTO]) -> List[List[ChunkDTO]]:
+        """Pack chunks into batches bounded by batch size and token budget"""
+        batches = []
+        current_batch = []
+        current_tokens = 0
+        for chunk in chunks:
+            tokens = self._count_tokens(chunk.content or "")
+            if current_batch and (
+                len(current_batch) >= self.batch_size
+                or current_tokens + tokens > self.batch_max_tokens
+            ):
+                batches.append(current_batch)
+                current_batch = []
+                current_tokens = 0
+            current_batch.append(chunk)
+            current_tokens += tokens
+        if current_batch:
+            batches.append(current_batch)
+        return batches
+
+    def _embed_batch(self, batch: List[ChunkDTO]) -> List[Tuple[ChunkDTO, List[float]]]:
+        """Embed one batch, retrying its chunks individually if the batch fails
+
+        Returns:
+            List[Tuple[ChunkDTO, List[float]]]: chunks that got an embedding
+        """
+        try:
+            embeddings = self.llm_client.get_embedding([c.content for c in batch])
+            if embeddings is None or len(embeddings) != len(batch):
+                raise ValueError(
+                    f"Expected {len(batch)} embeddings, got "
+                    f"{0 if embeddings is None else len(embeddings)}"
+                )
+            return [(chunk, embedding.tolist()) for chunk, embedding in zip(batch, embeddings)]
+        except Exception as e:
+            logger.warning(
+                f"Embedding batch of {len(batch)} chunks failed, retrying individually: {str(e)}"
+            )
+
+        results = []
+        for chunk in batch:
+            try:
+                embeddings = self.llm_client.get_embedding([chunk.content])
+                if embeddings is None or len(embeddings) == 0:
+                    raise ValueError("Empty embedding response")
+                results.append((chunk, embeddings[0].tolist()))
+            except Exception as e:
+                logger.error(f"Failed to get embedding for chunk {chunk.id}: {str(e)}")
+        return results
+
+    def _store_chunk_embeddings(self, embedded: List[Tuple[ChunkDTO, List[float]]]) -> None:
+        """Add chunk embeddings to ChromaDB in bulk and verify their storage"""
+        for i in range(0, len(embedded), self.store_batch_size):
+            batch = embedded[i:i + self.store_batch_size]
+            ids = [str(chunk.id) for chunk, _ in batch]
+            self.chunk_collection.add(
+                documents=[chunk.content for chunk, _ in batch],
+                ids=ids,
+                embeddings=[embedding for _, embedding in batch],
+                metadatas=[
+                    {
+                        "document_id": str(chunk.document_id),
+                        "topic": chunk.topic or "",
+                        "tags": ",".join(chunk.tags) if chunk.tags else "",
+                    }
+                    for chunk, _ in batch
+                ],
+            )
+
+            # verify embeddings storage
+            result = self.chunk_collection.get(ids=ids, include=[])
+            stored_ids = set(result["ids"]) if result else set()
+            for chunk, _ in batch:
+                chunk.has_embedding = str(chunk.id) in stored_ids
+                if not chunk.has_embedding:
+                    logger.warning(f"Failed to verify embedding for chunk {chunk.id}")
+            logger.info(f"Stored {len(batch)} chunk embeddings in ChromaDB")
+
     def get_chunk_embedding_by_chunk_id(self, chunk_id: int) -> Optional[List[float]]:
         """Get the corresponding embedding vector by chunk_id
 
@@ -77,6 +77,25 @@ class StorageService:
         Returns:
             tuple: (Memory object, Document object)
 
+        Raises:
+            ValueError: if file already exists
+        """
+        memory = self.store_upload(file, metadata)
+        document = self.process_memory(memory.id, metadata)
+        return self.get_memory(memory.id), document
+
+    def store_upload(self, file, metadata=None) -> Memory:
+        """Save an uploaded file to disk and create its Memory record
+
+        The document is not extracted yet, see process_memory.
+
+        Args:
+            file: uploaded file object
+            metadata: file metadata
+
+        Returns:
+            Memory: created Memory object
+
         Raises:
             ValueError: if file already exists
         """
@@ -98,10 +117,6 @@ class StorageService:
             filepath, filename, filesize = self._save_file_to_disk(file)
             logger.info(f"File saved to disk: {filepath}, size: {filesize} bytes")
 
-            # create Memory record
-            memory = None
-            document = None
-
             db = DatabaseSession()
             session = db._session_factory()
             try:
@@ -114,19 +129,10 @@ class StorageService:
                 )
                 session.add(memory)
                 session.commit()
-                logger.info(f"Memory record created successfully: {memory.id}")
-
-                # process document
-                document = self._process_document(filepath, metadata)
-                if document:
-                    memory.document_id = document.id
-                    session.add(memory)
-                    session.commit()
-                    logger.info(f"Memory record updated, associated document ID: {document.id}")
-
-                # refresh memory object to ensure all fields are up to date
                 session.refresh(memory)
-
+                session.expunge(memory)
+                logger.info(f"Memory record created successfully: {memory.id}")
+                return memory
             except Exception as e:
                 session.rollback()
                 logger.error(f"Database operation failed: {str(e)}", exc_info=True)
@@ -134,12 +140,48 @@ class StorageService:
             finally:
                 session.close()
 
-            return memory, document
-
         except Exception as e:
             logger.error(f"Error occurred during file saving: {str(e)}", exc_info=True)
             raise
 
+    def process_memory(self, memory_id: str, metadata=None):
+        """Extract the file of a Memory record and create its document
+
+        Args:
+            memory_id: Memory record id
+            metadata: file metadata
+
+        Returns:
+            Document: created Document object, return None if processing fails
+        """
+        memory = self.get_memory(memory_id)
+        if memory is None:
+            raise ValueError(f"Memory record not found: {memory_id}")
+
+        document = self._process_document(Path(memory.path), metadata)
+        if document:
+            db = DatabaseSession()
+            with db._session_factory() as session:
+                try:
+                    stored = session.get(Memory, memory_id)
+                    stored.document_id = document.id
+                    session.commit()
+                    logger.info(f"Memory record updated, associated document ID: {document.id}")
+                except Exception as e:
+                    session.rollback()
+                    logger.error(f"Database operation failed: {str(e)}", exc_info=True)
+                    raise
+        return document
+
+    def get_memory(self, memory_id: str) -> Memory:
+        """Get a detached Memory record by id, None if it does not exist"""
+        db = DatabaseSession()
+        with db._session_factory() as session:
+            memory = session.get(Memory, memory_id)
+            if memory:
+                session.expunge(memory)
+            return memory
+
     def _save_file_to_disk(self, file):
         """Save file to disk
 
@@ -1,4 +1,8 @@
 from pathlib import Path
+from typing import Iterator, List
+import multiprocessing
+import os
+import time
 import fitz  # PyMuPDF
 
 # from ...core.processor import BaseFileProcessor
@@ -6,9 +10,18 @@ from ...core.file_type import FileType
 from ...core.decorators import processor_register
 from ...core.exceptions import FileProcessingError
 from ...document import Document, ProcessStatus
+from lpm_kernel.common.process_pool import spawn_context
+from lpm_kernel.configs.config import Config
 from lpm_kernel.file_data.processors.processor import BaseFileProcessor
 
 
+def _extract_page_range(task) -> List[str]:
+    """Extract the text of pages [start, stop) in a worker process"""
+    file_path, start, stop = task
+    with fitz.open(file_path) as pdf:
+        return [pdf[page_number].get_text() for page_number in range(start, stop)]
+
+
 @processor_register
 class PDFProcessor(BaseFileProcessor):
     SUPPORTED_TYPES = {FileType.PDF}
@@ -16,16 +29,78 @@ class PDFProcessor(BaseFileProcessor):
     @classmethod
     def _process_file(cls, file_path: Path, doc: Document) -> Document:
         try:
-            with fitz.open(file_path) as pdf:
-                text = ""
-                for page in pdf:
-                    text += page.get_text()
-
-                doc.raw_content = text
-                doc.extract_status = ProcessStatus.SUCCESS
+            # raw_content is stored whole and chunked later by the training process,
+            # L0 analysis and the document embedding read it whole as well, so pages
+            # are joined here. PDF_MAX_CHARS bounds the text held while they are.
+            # Join once instead of growing a string page by page
+            doc.raw_content = "".join(cls.iter_pages(file_path))
+            doc.extract_status = ProcessStatus.SUCCESS
 
         except Exception as e:
             doc.extract_status = ProcessStatus.FAILED
             raise FileProcessingError(f"Failed to process PDF: {str(e)}")
 
         return doc
+
+    @classmethod
+    def iter_pages(cls, file_path: Path) -> Iterator[str]:
+        """
+        Yield the text of every page in order.
+        Large PDFs are split into page ranges extracted by worker processes.
+        Extraction stops with FileProcessingError once the file exceeds
+        PDF_MAX_SECONDS or its text exceeds PDF_MAX_CHARS.
+        :param file_path: PDF file path
+        :return: iterator over page texts
+        """
+        config = Config.from_env()
+        workers = int(config.get("PDF_EXTRACT_WORKERS", 0)) or min(4, os.cpu_count() or 1)
+        parallel_min_pages = int(config.get("PDF_PARALLEL_MIN_PAGES", 64))
+        pages_per_task = int(config.get("PDF_PAGES_PER_TASK", 16))
+        max_seconds = float(config.get("PDF_MAX_SECONDS", 600))
+        max_chars = int(config.get("PDF_MAX_CHARS", 50_000_000))
+
+        deadline = time.monotonic() + max_seconds
+        total_chars = 0
+
+        def check_limits(page_text: str) -> None:
+            nonlocal total_chars
+            total_chars += len(page_text)
+            if total_chars > max_chars:
+                raise FileProcessingError(
+                    f"PDF text exceeds {max_chars} characters: {file_path}"
+                )
+            if time.monotonic() > deadline:
+                raise FileProcessingError(
+                    f"PDF extraction exceeded {max_seconds:.0f}s: {file_path}"
+                )
+
+        with fitz.open(file_path) as pdf:
+            page_count = pdf.page_count
+            if workers <= 1 or page_count < parallel_min_pages:
+                for page in pdf:
+                    page_text = page.get_text()
+                    check_limits(page_text)
+                    yield page_text
+                return
+
+        tasks = [
+            (str(file_path), start, min(start + pages_per_task, page_count))
+            for start in range(0, page_count, pages_per_task)
+        ]
+        pool = spawn_context().Pool(min(workers, len(tasks)))
+        try:
+            results = pool.imap(_extract_page_range, tasks)
+            for _ in tasks:
+                try:
+                    page_texts = results.next(timeout=max(0.0, deadline - time.monotonic()))
+                except multiprocessing.TimeoutError:
+                    raise FileProcessingError(
+                        f"PDF extraction exceeded {max_seconds:.0f}s: {file_path}"
+                    )
+                for page_text in page_texts:
+                    check_limits(page_text)
+                    yield page_text
+        finally:
+            # Also stops workers still busy when a limit was hit or the caller stopped early
+            pool.terminate()
+            pool.join()
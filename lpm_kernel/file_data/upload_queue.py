@@ -0,0 +1,134 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Optional
+
+from lpm_kernel.configs.config import Config
+from lpm_kernel.common.logging import logger
+
+
+class UploadJobStatus(Enum):
+    """Upload job status enum"""
+
+    QUEUED = "QUEUED"
+    PROCESSING = "PROCESSING"
+    SUCCESS = "SUCCESS"
+    FAILED = "FAILED"
+
+
+@dataclass
+class UploadJob:
+    """Extraction and document creation of one uploaded file"""
+
+    memory_id: str
+    filename: str
+    metadata: Optional[dict] = None
+    job_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: UploadJobStatus = UploadJobStatus.QUEUED
+    document_id: Optional[int] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (UploadJobStatus.SUCCESS, UploadJobStatus.FAILED)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "memory_id": self.memory_id,
+            "filename": self.filename,
+            "status": self.status.value,
+            "document_id": self.document_id,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class UploadQueue:
+    """Background worker pool that turns stored uploads into documents
+
+    Uploads are saved and registered as memories inside the request, jobs
+    then extract the file and create its document on a worker thread. Job
+    states are kept in memory, the oldest finished jobs are dropped once
+    more than max_jobs are tracked.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, storage_service, workers: int = 2, max_jobs: int = 1000):
+        self.storage_service = storage_service
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload")
+        self._jobs: "OrderedDict[str, UploadJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, storage_service) -> "UploadQueue":
+        """Get the process-wide queue, created with the first storage service passed in"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    config = Config.from_env()
+                    cls._instance = cls(
+                        storage_service,
+                        workers=int(config.get("UPLOAD_WORKERS", 2)),
+                        max_jobs=int(config.get("UPLOAD_MAX_TRACKED_JOBS", 1000)),
+                    )
+        return cls._instance
+
+    def submit(self, memory_id: str, filename: str, metadata: Optional[dict] = None) -> UploadJob:
+        job = UploadJob(memory_id=memory_id, filename=filename, metadata=metadata)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict_finished()
+        self._executor.submit(self._run, job)
+        logger.info(f"Queued upload job {job.job_id} for {filename}")
+        return job
+
+    def get(self, job_id: str) -> Optional[UploadJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def get_many(self, job_ids: List[str]) -> Dict[str, Optional[UploadJob]]:
+        with self._lock:
+            return {job_id: self._jobs.get(job_id) for job_id in job_ids}
+
+    def wait(self, job: UploadJob, timeout: float) -> bool:
+        """Wait up to timeout seconds for a job to finish, returns whether it finished"""
+        return job.done.wait(timeout)
+
+    def _run(self, job: UploadJob) -> None:
+        job.status = UploadJobStatus.PROCESSING
+        job.started_at = time.time()
+        try:
+            document = self.storage_service.process_memory(job.memory_id, job.metadata)
+            if document is None:
+                raise ValueError(f"Document processing failed for {job.filename}")
+            job.document_id = document.id
+            job.status = UploadJobStatus.SUCCESS
+            logger.info(f"Upload job {job.job_id} created document {document.id}")
+        except Exception as e:
+            job.error = str(e)
+            job.status = UploadJobStatus.FAILED
+            logger.error(f"Upload job {job.job_id} failed: {str(e)}", exc_info=True)
+        finally:
+            job.finished_at = time.time()
+            job.done.set()
+
+    def _evict_finished(self) -> None:
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:excess]:
+            del self._jobs[job_id]
@@ -1,5 +1,8 @@
 # file_data/service.py
 import logging
+import queue
+import threading
+from typing import Callable, Dict, List, Optional
 
 from lpm_kernel.L1.bio import Chunk
 from lpm_kernel.common.repository.database_session import DatabaseSession
@@ -76,6 +79,103 @@ class ChunkService:
             logger.error(f"Error saving chunk: {str(e)}")
             raise
 
+    def save_document_chunks(self, chunks_by_document: Dict[int, List[Chunk]]) -> List[int]:
+        """
+        Replace the chunks of several documents in one transaction
+        Args:
+            chunks_by_document (Dict[int, List[Chunk]]): new chunks per document ID
+        Returns:
+            List[int]: IDs of the replaced chunks, their embeddings are stale
+        Raises:
+            Exception: Error when saving fails, nothing is written then
+        """
+        rows = {
+            document_id: [
+                {"content": chunk.content, "tags": chunk.tags, "topic": chunk.topic}
+                for chunk in chunks
+            ]
+            for document_id, chunks in chunks_by_document.items()
+        }
+        replaced_chunk_ids = self._repository.replace_chunks(rows)
+        logger.debug(
+            f"Saved {sum(len(r) for r in rows.values())} chunks for {len(rows)} documents"
+        )
+        return replaced_chunk_ids
+
+
+class ChunkBatchWriter:
+    """Writes chunks of many documents to the database on a background thread
+
+    Documents are buffered until batch_size chunks are pending, then written in
+    one transaction while the caller keeps splitting the next documents. A
+    bounded queue keeps memory flat when splitting outpaces writing.
+    """
+
+    def __init__(
+        self,
+        chunk_service: ChunkService,
+        batch_size: int = 1000,
+        max_pending_batches: int = 4,
+        on_batch_written: Optional[Callable[[Dict[int, List[Chunk]], List[int]], None]] = None,
+    ):
+        self.chunk_service = chunk_service
+        self.batch_size = batch_size
+        self.on_batch_written = on_batch_written
+        self.written_document_ids: List[int] = []
+        self.failed_document_ids: List[int] = []
+        self.chunk_count = 0
+
+        self._buffer: Dict[int, List[Chunk]] = {}
+        self._buffered_chunks = 0
+        self._queue: "queue.Queue[Optional[Dict[int, List[Chunk]]]]" = queue.Queue(
+            maxsize=max_pending_batches
+        )
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def add(self, document_id: int, chunks: List[Chunk]) -> None:
+        """Queue the chunks of a document, replacing its existing chunks"""
+        self._buffer[document_id] = chunks
+        self._buffered_chunks += len(chunks)
+        if self._buffered_chunks >= self.batch_size:
+            self._flush()
+
+    def close(self) -> None:
+        """Write remaining chunks and wait for the writer thread"""
+        self._flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._queue.put(self._buffer)
+            self._buffer = {}
+            self._buffered_chunks = 0
+
+    def _run(self) -> None:
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            try:
+                replaced_chunk_ids = self.chunk_service.save_document_chunks(batch)
+                if self.on_batch_written:
+                    self.on_batch_written(batch, replaced_chunk_ids)
+                # Only counted once the callback succeeded, a failed one fails the batch
+                self.written_document_ids.extend(batch.keys())
+                self.chunk_count += sum(len(chunks) for chunks in batch.values())
+            except Exception as e:
+                logger.error(
+                    f"Error writing chunks of {len(batch)} documents: {str(e)}", exc_info=True
+                )
+                self.failed_document_ids.extend(batch.keys())
+
 
 # Usage elsewhere:
 # from lpm_kernel.kernel import chunk_service
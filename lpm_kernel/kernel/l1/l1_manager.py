@@ -5,9 +5,12 @@ import numpy as np
 
 from lpm_kernel.L1.bio import Note, Chunk, Bio, ShadeInfo, ShadeMergeInfo
 from lpm_kernel.L1.l1_generator import L1Generator
+from lpm_kernel.common.llm import LLMClient, embedding_model_key
 from lpm_kernel.common.repository.database_session import DatabaseSession
+from lpm_kernel.configs.config import Config
+from lpm_kernel.file_data.document_manifest import DocumentManifest
 from lpm_kernel.file_data.document_service import document_service
-from lpm_kernel.models.l1 import L1Bio
+from lpm_kernel.models.l1 import L1Bio, L1ChunkTopic, L1Cluster, L1Shade
 from lpm_kernel.models.l1 import (
     L1GenerationResult,
     L1Version,
@@ -99,7 +102,11 @@ def extract_notes_from_documents(documents) -> tuple[List[Note], list]:
 
 
 def generate_l1_from_l0() -> L1GenerationResult:
-    """Generate L1 level knowledge representation from L0 data"""
+    """Generate L1 level knowledge representation from L0 data
+
+    If the latest L1 version covers a subset of the current documents, only the
+    new documents are clustered into it through the topics update strategy.
+    """
     l1_generator = L1Generator()
 
     # 1. Prepare data
@@ -114,6 +121,14 @@ def generate_l1_from_l0() -> L1GenerationResult:
         return None
 
     try:
+        # Memory embeddings are computed with the configured model before L1 runs
+        embedding_model = current_embedding_model()
+        previous_l1 = load_incremental_l1_base(memory_list, embedding_model)
+        if previous_l1:
+            return generate_l1_incremental(
+                l1_generator, notes_list, memory_list, previous_l1, embedding_model
+            )
+
         # 3. Generate L1 data
         # 3.1 Generate topics
         clusters = l1_generator.gen_topics_for_shades(
@@ -133,26 +148,15 @@ def generate_l1_from_l0() -> L1GenerationResult:
         shades_merge_infos = convert_from_shades_to_merge_info(shades)
 
         logger.info(f"Generated {len(shades)} shades")
-        merged_shades = l1_generator.merge_shades(shades_merge_infos)
-        logger.info(f"Merged shades success: {merged_shades.success}")
-        logger.info(
-            f"Number of merged shades: {len(merged_shades.merge_shade_list) if merged_shades.success else 0}"
-        )
-
-        # 3.4 Generate global biography
-        bio = l1_generator.gen_global_biography(
-            old_profile=Bio(
-                shadesList=merged_shades.merge_shade_list
-                if merged_shades.success
-                else []
-            ),
-            cluster_list=clusters.get("clusterList", []),
-        )
-        logger.info(f"Generated global biography: {bio}")
+        bio = merge_shades_into_biography(l1_generator, shades_merge_infos, clusters)
 
         # 4. Build result object
         result = L1GenerationResult(
-            bio=bio, clusters=clusters, chunk_topics=chunk_topics
+            bio=bio,
+            clusters=clusters,
+            chunk_topics=chunk_topics,
+            document_ids=[note.id for note in notes_list],
+            embedding_model=embedding_model,
         )
 
         logger.info("L1 generation completed successfully")
@@ -163,7 +167,200 @@ def generate_l1_from_l0() -> L1GenerationResult:
         raise
 
 
+def merge_shades_into_biography(l1_generator, shades_merge_infos, clusters) -> Bio:
+    """Merge shades and generate the global biography from them"""
+    merged_shades = l1_generator.merge_shades(shades_merge_infos)
+    logger.info(f"Merged shades success: {merged_shades.success}")
+    logger.info(
+        f"Number of merged shades: {len(merged_shades.merge_shade_list) if merged_shades.success else 0}"
+    )
+
+    # Generate global biography
+    bio = l1_generator.gen_global_biography(
+        old_profile=Bio(
+            shadesList=merged_shades.merge_shade_list
+            if merged_shades.success
+            else []
+        ),
+        cluster_list=clusters.get("clusterList", []),
+    )
+    logger.info(f"Generated global biography: {bio}")
+    return bio
+
+
+def load_incremental_l1_base(memory_list: list, embedding_model: str) -> Optional[dict]:
+    """Load the latest L1 version as base for an incremental update
+
+    Returns None, meaning a full rebuild, if incremental L1 is disabled, there is
+    no previous version, or a document of the previous version changed, was
+    re-chunked with other chunk parameters, is gone, or was embedded with another
+    embedding model than the memories now.
+
+    Args:
+        memory_list: Memories of all current documents
+        embedding_model: Key of the embedding model of the memories
+
+    Returns:
+        Optional[dict]: previous clusters with their shades, outliers and chunk topics plus
+            the memories to add
+    """
+    config = Config.from_env()
+    if str(config.get("L1_INCREMENTAL", "true")).lower() != "true":
+        return None
+
+    version = get_latest_l1_version()
+    if version is None:
+        return None
+
+    entries = DocumentManifest().get_entries()
+    memories_by_id = {str(memory["memoryId"]): memory for memory in memory_list}
+    included_ids = {
+        str(document_id)
+        for document_id, entry in entries.items()
+        if entry["l1_fingerprint"]
+    }
+    unchanged_ids = {
+        str(document_id)
+        for document_id, entry in entries.items()
+        # Re-chunking replaces the chunk ids the previous clusters and chunk topics refer to,
+        # and cluster centers of another embedding model cannot be compared with the memories
+        if entry["l1_fingerprint"]
+        and entry["chunk_fingerprint"]
+        and entry["l1_fingerprint"]
+        == DocumentManifest.embedding_fingerprint(entry["chunk_fingerprint"], embedding_model)
+    }
+    if not included_ids or included_ids != unchanged_ids or not included_ids <= memories_by_id.keys():
+        logger.info("Documents or the embedding model of the previous L1 version changed, regenerating L1 from scratch")
+        return None
+
+    with DatabaseSession.session() as session:
+        cluster_records = (
+            session.query(L1Cluster).filter(L1Cluster.version == version).all()
+        )
+        chunk_topic_records = (
+            session.query(L1ChunkTopic).filter(L1ChunkTopic.version == version).all()
+        )
+
+        old_cluster_list = []
+        for index, record in enumerate(cluster_records):
+            memory_ids = [str(memory_id) for memory_id in record.memory_ids or []]
+            if not memory_ids or not set(memory_ids) <= included_ids:
+                return None
+            memories = [memories_by_id[memory_id] for memory_id in memory_ids]
+            center = record.cluster_center or np.mean(
+                [memory["embedding"] for memory in memories], axis=0
+            ).tolist()
+            old_cluster_list.append(
+                {
+                    "clusterId": record.cluster_id or f"{version}-{index}",
+                    "memoryList": memories,
+                    "centerEmbedding": center,
+                    "shade": record.shade,
+                }
+            )
+        if not old_cluster_list:
+            return None
+        if not any(cluster["shade"] for cluster in old_cluster_list):
+            # Versions stored before shades were kept per cluster cannot be updated
+            logger.info("Previous L1 version has no cluster shades, regenerating L1 from scratch")
+            return None
+
+        clustered_ids = {
+            str(memory["memoryId"])
+            for cluster in old_cluster_list
+            for memory in cluster["memoryList"]
+        }
+        old_chunk_topics = {
+            f"previous-{index}": {
+                "chunkIds": [record.chunk_id],
+                "topic": record.topic,
+                "tags": record.tags,
+            }
+            for index, record in enumerate(chunk_topic_records)
+        }
+
+    logger.info(
+        f"Updating L1 version {version} incrementally: "
+        f"{len(memories_by_id) - len(included_ids)} new documents"
+    )
+    return {
+        "cluster_list": old_cluster_list,
+        "outlier_memory_list": [
+            memories_by_id[memory_id] for memory_id in sorted(included_ids - clustered_ids)
+        ],
+        "new_memory_list": [
+            memory for memory_id, memory in memories_by_id.items() if memory_id not in included_ids
+        ],
+        "chunk_topics": old_chunk_topics,
+    }
+
+
+def generate_l1_incremental(
+    l1_generator, notes_list, memory_list, previous_l1, embedding_model
+) -> L1GenerationResult:
+    """Fold new documents into the previous L1 version
+
+    Only the clusters touched by the new memories get new shades and only the
+    chunks of new notes get topics, everything else is carried over. The shades
+    of replaced clusters are dropped, the merge input is the shade of every
+    cluster in the updated cluster list.
+    """
+    delta = l1_generator.gen_topics_for_shades(
+        old_cluster_list=previous_l1["cluster_list"],
+        old_outlier_memory_list=previous_l1["outlier_memory_list"],
+        new_memory_list=previous_l1["new_memory_list"],
+    )
+    delta_cluster_list = delta.get("clusterList", [])
+    replaced_cluster_ids = {
+        cluster_id
+        for cluster in delta_cluster_list
+        for cluster_id in [cluster.get("clusterId"), *cluster.get("mergeList", [])]
+        if cluster_id is not None
+    }
+    unchanged_cluster_list = [
+        cluster
+        for cluster in previous_l1["cluster_list"]
+        if cluster["clusterId"] not in replaced_cluster_ids
+    ]
+    clusters = {
+        "clusterList": unchanged_cluster_list + delta_cluster_list,
+        "outlierMemoryList": delta.get("outlierMemoryList", []),
+    }
+    logger.info(
+        f"Updated {len(delta_cluster_list)} clusters, kept {len(unchanged_cluster_list)} unchanged"
+    )
+
+    new_memory_ids = {str(memory["memoryId"]) for memory in previous_l1["new_memory_list"]}
+    new_notes = [note for note in notes_list if str(note.id) in new_memory_ids]
+    chunk_topics = dict(previous_l1["chunk_topics"])
+    if new_notes:
+        chunk_topics.update(l1_generator.generate_topics(new_notes) or {})
+
+    shades = generate_shades(delta, l1_generator, notes_list)
+    logger.info(f"Generated {len(shades)} shades for updated clusters")
+    shades_merge_infos = [
+        ShadeMergeInfo(**cluster["shade"])
+        for cluster in unchanged_cluster_list
+        if cluster.get("shade")
+    ] + convert_from_shades_to_merge_info(shades)
+    bio = merge_shades_into_biography(l1_generator, shades_merge_infos, clusters)
+
+    logger.info("Incremental L1 generation completed successfully")
+    return L1GenerationResult(
+        bio=bio,
+        clusters=clusters,
+        chunk_topics=chunk_topics,
+        document_ids=[note.id for note in notes_list],
+        embedding_model=embedding_model,
+    )
+
+
 def generate_shades(clusters, l1_generator, notes_list):
+    """Generate a shade for every cluster
+
+    Each cluster keeps its shade under "shade", stored with the cluster so that
+    incremental updates can reuse the shades of unchanged clusters.
+    """
     shades = []
     if clusters and "clusterList" in clusters:
         for cluster in clusters.get("clusterList", []):
@@ -181,6 +378,7 @@ def generate_shades(clusters, l1_generator, notes_list):
                 shade = l1_generator.gen_shade_for_cluster([], cluster_notes, [])
                 if shade:
                     shades.append(shade)
+                    cluster["shade"] = vars(convert_from_shades_to_merge_info([shade])[0])
                     logger.info(
                         f"Generated shade for cluster: {shade.name if hasattr(shade, 'name') else 'Unknown'}"
                     )
@@ -284,6 +482,109 @@ def get_latest_global_bio() -> Optional[GlobalBioDTO]:
         return None
 
 
+def shade_embedding_text(name: str, description: str) -> str:
+    """Build the text a shade is embedded from"""
+    return f"{name or ''} - {description or ''}"
+
+
+def current_embedding_model() -> str:
+    """Key of the configured embedding model, stored with shade embeddings"""
+    from lpm_kernel.api.services.user_llm_config_service import UserLLMConfigService
+
+    return embedding_model_key(UserLLMConfigService().get_available_llm())
+
+
+def compute_shade_embeddings(shades_list: list) -> List[Optional[list]]:
+    """Embed shades with a single batched request
+
+    Args:
+        shades_list: ShadeInfo objects of a global biography
+
+    Returns:
+        List[Optional[list]]: embedding per shade, all None if embedding failed,
+            computed with current_embedding_model()
+    """
+    if not shades_list:
+        return []
+    try:
+        texts = [
+            shade_embedding_text(shade.name, shade.desc_third_view)
+            for shade in shades_list
+        ]
+        embeddings = LLMClient().get_embedding(texts)
+        return [embedding.tolist() for embedding in embeddings]
+    except Exception as e:
+        logger.error(f"Error computing shade embeddings: {str(e)}", exc_info=True)
+        return [None] * len(shades_list)
+
+
+def get_latest_l1_version() -> Optional[int]:
+    """Get the latest L1 version number, None if no L1 data exists"""
+    try:
+        with DatabaseSession.session() as session:
+            latest_version = (
+                session.query(L1Version.version)
+                .order_by(L1Version.version.desc())
+                .first()
+            )
+            return latest_version[0] if latest_version else None
+    except Exception as e:
+        logger.error(f"Error getting latest L1 version: {str(e)}", exc_info=True)
+        return None
+
+
+def get_shades_with_embeddings(
+    version: int,
+) -> tuple[List[dict], List[Optional[list]], List[Optional[str]]]:
+    """Get the shades of an L1 version together with their stored embeddings
+
+    Args:
+        version: L1 version number
+
+    Returns:
+        tuple: (shades, embeddings, embedding_models), embeddings[i] is None if
+            shade i has none stored, embedding_models[i] is the model it was
+            computed with, None for embeddings stored before models were recorded
+    """
+    with DatabaseSession.session() as session:
+        shade_records = (
+            session.query(L1Shade)
+            .filter(L1Shade.version == version)
+            .order_by(L1Shade.id)
+            .all()
+        )
+        shades = [
+            {
+                "id": record.id,
+                "name": record.name,
+                "aspect": record.aspect,
+                "icon": record.icon,
+                "desc_third_view": record.desc_third_view,
+                "content_third_view": record.content_third_view,
+            }
+            for record in shade_records
+        ]
+        embeddings = [record.embedding for record in shade_records]
+        embedding_models = [record.embedding_model for record in shade_records]
+        return shades, embeddings, embedding_models
+
+
+def update_shade_embeddings(shade_embeddings: dict, embedding_model: str) -> None:
+    """Persist embeddings for existing shades
+
+    Args:
+        shade_embeddings: mapping of shade id to embedding
+        embedding_model: key of the model the embeddings were computed with
+    """
+    with DatabaseSession.session() as session:
+        for shade_id, embedding in shade_embeddings.items():
+            shade = session.get(L1Shade, shade_id)
+            if shade:
+                shade.embedding = embedding
+                shade.embedding_model = embedding_model
+        session.commit()
+
+
 def generate_and_store_status_bio() -> Bio:
     """Generate and store status biography
 
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, func
+from lpm_kernel.common.repository.database_session import Base
+
+
+class DocumentFingerprint(Base):
+    """Content fingerprints of the training steps a document has been through"""
+
+    __tablename__ = "document_fingerprints"
+
+    document_id = Column(Integer, primary_key=True)
+    content_hash = Column(String(64), nullable=False)
+    chunk_params = Column(String(100))
+    embedding_model = Column(String(500))
+    # Fingerprint of the inputs each step last succeeded with, NULL if never
+    chunk_fingerprint = Column(String(64))
+    embedding_fingerprint = Column(String(64))
+    l1_fingerprint = Column(String(64))
+    update_time = Column(
+        DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
+    )
@@ -2,7 +2,7 @@ from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey
 from sqlalchemy.orm import relationship
 from lpm_kernel.common.repository.database_session import Base
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from lpm_kernel.L1.bio import Bio
 
@@ -49,6 +49,8 @@ class L1Shade(Base):
     content_third_view = Column(String(2000))
     desc_second_view = Column(String(1000))
     content_second_view = Column(String(2000))
+    embedding = Column(JSON)
+    embedding_model = Column(String(500))  # "endpoint|model name" the embedding was computed with
     create_time = Column(DateTime, nullable=False, default=datetime.now)
 
     # add relationship
@@ -63,6 +65,7 @@ class L1Cluster(Base):
     cluster_id = Column(String(100))
     memory_ids = Column(JSON)
     cluster_center = Column(JSON)
+    shade = Column(JSON)  # shade generated for the cluster, before merging
     create_time = Column(DateTime, nullable=False, default=datetime.now)
 
     # add relationship
@@ -110,6 +113,8 @@ class L1GenerationResult:
     clusters: Dict[str, List]  # {"clusterList": [...]}
     chunk_topics: Dict[str, Dict]  # {cluster_id: {"indices": [], "docIds": [], ...}}
     generate_time: datetime = datetime.now()
+    document_ids: List[int] = field(default_factory=list)  # documents the data was built from
+    embedding_model: Optional[str] = None  # embedding model key of the clustered memories
 
     def to_dict(self) -> dict:
         """Convert to dictionary format"""
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, UniqueConstraint, func
+from lpm_kernel.common.repository.database_session import Base
+
+
+class TrainStepJob(Base):
+    """One step of a model's training pipeline as a job of the step queue"""
+
+    __tablename__ = "train_step_jobs"
+    __table_args__ = (UniqueConstraint("model_name", "step"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    model_name = Column(String(200), nullable=False)
+    step = Column(String(100), nullable=False)
+    # pending, in_progress, completed, failed or suspended, see progress_enum.Status
+    status = Column(String(50), nullable=False, default="pending")
+    depends_on = Column(JSON, nullable=False, default=list)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker = Column(String(200))
+    error = Column(Text)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    update_time = Column(
+        DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Embedding Chunk Grouping Microbenchmark
+
+Measures how long L1 cold start takes to group note chunks and build the embedding
+matrix, compared with the previous per-note scan over all chunks.
+
+Usage:
+    python scripts/benchmark_build_embedding_chunks.py [--notes 5000] [--chunks-per-note 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = str(Path(__file__).parent.parent)
+sys.path.insert(0, project_root)
+
+from lpm_kernel.L1.bio import Chunk, Note
+from lpm_kernel.L1.clustering import group_note_chunks, stack_embeddings
+
+
+def make_notes(note_n: int, chunks_per_note: int, dim: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    notes = []
+    chunk_id = 0
+    for note_id in range(note_n):
+        chunks = []
+        for _ in range(chunks_per_note):
+            chunks.append(
+                Chunk(
+                    id=chunk_id,
+                    document_id=note_id,
+                    content="",
+                    embedding=rng.normal(size=(1, dim)),
+                )
+            )
+            chunk_id += 1
+        notes.append(Note(noteId=note_id, chunks=chunks))
+    return notes
+
+
+def previous_build_embedding_chunks(notes_list):
+    """The per-note scan TopicsGenerator used before chunks were grouped by document id"""
+    all_chunks = [chunk for note in notes_list for chunk in note.chunks]
+    all_chunks = [chunk for chunk in all_chunks if chunk.embedding is not None]
+    all_note_ids = [note.id for note in notes_list]
+    clean_chunks = []
+    clean_notes_lst = []
+    for note_id in all_note_ids:
+        tmp_chunks_set = [chunk for chunk in all_chunks if chunk.document_id == note_id]
+        if len(tmp_chunks_set) == 0:
+            continue
+        # the note lookup result was only kept in an unused list
+        clean_notes_lst.append([note for note in notes_list if note.id == note_id][0])
+        clean_chunks.extend(tmp_chunks_set)
+    embedding_matrix = [clean_chunk.embedding for clean_chunk in clean_chunks]
+    return embedding_matrix, clean_chunks, all_note_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark L1 embedding chunk grouping")
+    parser.add_argument("--notes", type=int, nargs="+", default=[500, 2000, 5000])
+    parser.add_argument("--chunks-per-note", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=1536)
+    args = parser.parse_args()
+
+    print(f"{'notes':>7} {'chunks':>8} {'previous s':>11} {'current s':>10} {'speedup':>8}")
+    for note_n in args.notes:
+        notes = make_notes(note_n, args.chunks_per_note, args.dim)
+
+        start = time.perf_counter()
+        previous_matrix, previous_chunks, _ = previous_build_embedding_chunks(notes)
+        previous_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        clean_chunks = group_note_chunks(notes)
+        embedding_matrix = stack_embeddings(
+            [chunk.embedding for chunk in clean_chunks], dtype=np.float32
+        )
+        current_seconds = time.perf_counter() - start
+
+        assert [c.id for c in clean_chunks] == [c.id for c in previous_chunks]
+        assert np.allclose(embedding_matrix, np.vstack(previous_matrix), atol=1e-6)
+        print(
+            f"{note_n:>7} {len(clean_chunks):>8} {previous_seconds:>11.3f} "
+            f"{current_seconds:>10.3f} {previous_seconds / current_seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
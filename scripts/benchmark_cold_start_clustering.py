@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Cold Start Clustering Benchmark
+
+Compares wall time and peak memory of the exact complete linkage used by L1 cold
+start clustering with the partitioned mode on synthetic embeddings.
+
+Usage:
+    python scripts/benchmark_cold_start_clustering.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from scipy.cluster.hierarchy import linkage
+
+# Add project root to path
+project_root = str(Path(__file__).parent.parent)
+sys.path.insert(0, project_root)
+
+from lpm_kernel.L1.clustering import (
+    collect_cluster_indices,
+    partitioned_complete_linkage_clusters,
+)
+
+THRESHOLD = 0.85
+# The exact path needs n*(n-1)/2 float64 distances, skip it beyond this budget
+EXACT_MEMORY_BUDGET_BYTES = 8 * 1024 ** 3
+
+
+def make_embeddings(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    """Generate clustered synthetic embeddings, roughly one topic per 50 chunks"""
+    rng = np.random.default_rng(seed)
+    topic_n = max(1, n // 50)
+    topics = rng.normal(size=(topic_n, dim))
+    assignments = rng.integers(0, topic_n, size=n)
+    return topics[assignments] + rng.normal(scale=0.6, size=(n, dim))
+
+
+def measure(func, *args):
+    """Run func and return (result, seconds, peak MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 ** 2
+
+
+def exact_clusters(embedding_matrix: np.ndarray) -> dict:
+    Z = linkage(embedding_matrix, method="complete", metric="cosine")
+    return collect_cluster_indices(Z, THRESHOLD)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark L1 cold start clustering")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--partition-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'chunks':>8} {'mode':>12} {'seconds':>10} {'peak MB':>10} {'clusters':>9}")
+    for n in args.sizes:
+        embedding_matrix = make_embeddings(n, args.dim)
+
+        condensed_bytes = n * (n - 1) // 2 * 8
+        if condensed_bytes <= EXACT_MEMORY_BUDGET_BYTES:
+            clusters, seconds, peak_mb = measure(exact_clusters, embedding_matrix)
+            print(f"{n:>8} {'exact':>12} {seconds:>10.2f} {peak_mb:>10.1f} {len(clusters):>9}")
+        else:
+            print(
+                f"{n:>8} {'exact':>12} {'skipped':>10} "
+                f"{condensed_bytes / 1024 ** 2:>10.1f} {'-':>9}  (distance matrix alone)"
+            )
+
+        clusters, seconds, peak_mb = measure(
+            partitioned_complete_linkage_clusters,
+            embedding_matrix,
+            THRESHOLD,
+            args.partition_size,
+        )
+        print(f"{n:>8} {'partitioned':>12} {seconds:>10.2f} {peak_mb:>10.1f} {len(clusters):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Local Embedding Throughput Benchmark
+
+Measures CPU throughput of the in-process SentenceTransformer embedding strategy
+for several batch sizes, on synthetic chunk-sized texts.
+
+Usage:
+    python scripts/benchmark_local_embedding.py --model sentence-transformers/all-MiniLM-L6-v2 \
+        [--texts 2000] [--batch-sizes 16 64 128] [--threads 4]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = str(Path(__file__).parent.parent)
+sys.path.insert(0, project_root)
+
+from lpm_kernel.common.local_embedding import LocalEmbeddingModel
+
+WORDS = (
+    "memory note meeting travel project weekend family music coffee research "
+    "reading idea design plan review garden recipe running market city"
+).split()
+
+
+def make_texts(text_n: int, words_per_text: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(words_per_text // 2, words_per_text)))
+        for _ in range(text_n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local embedding throughput")
+    parser.add_argument("--model", required=True, help="SentenceTransformer model name or path")
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--words-per-text", type=int, default=120)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64, 128])
+    parser.add_argument("--threads", type=int, default=0, help="torch threads, 0 keeps the default")
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts, args.words_per_text)
+    chars = sum(len(text) for text in texts)
+
+    start = time.perf_counter()
+    model = LocalEmbeddingModel(args.model, batch_size=args.batch_sizes[0], threads=args.threads)
+    print(f"model load: {time.perf_counter() - start:.2f}s")
+    # Warm up so the first batch size does not pay one-off allocation costs
+    model.encode(texts[: args.batch_sizes[0]])
+
+    print(f"{'batch':>6} {'texts':>7} {'seconds':>9} {'texts/s':>9} {'chars/s':>10}")
+    for batch_size in args.batch_sizes:
+        model.batch_size = batch_size
+        start = time.perf_counter()
+        embeddings = model.encode(texts)
+        seconds = time.perf_counter() - start
+        assert embeddings.shape[0] == len(texts)
+        print(
+            f"{batch_size:>6} {len(texts):>7} {seconds:>9.2f} "
+            f"{len(texts) / seconds:>9.1f} {chars / seconds:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Near Duplicate Removal Benchmark
+
+Compares wall time of the exhaustive SequenceMatcher scan that L2 data
+synthesis used to deduplicate notes with the MinHash LSH index, on synthetic
+notes of which a share are edited copies of others, and checks that both keep
+the same notes.
+
+Usage:
+    python scripts/benchmark_near_duplicates.py [--sizes 1000 10000 100000] [--threshold 0.9]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = str(Path(__file__).parent.parent)
+sys.path.insert(0, project_root)
+
+from lpm_kernel.L2.data_pipeline.data_prep.diversity.utils import string_similarity
+from lpm_kernel.L2.data_pipeline.data_prep.near_duplicates import remove_near_duplicates
+
+
+def make_notes(note_n: int, duplicate_share: float, seed: int = 0):
+    """Notes over a Zipf distributed vocabulary, duplicates copy an original with up to 30% word edits"""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+        for _ in range(20000)
+    ]
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+
+    def words(n):
+        return rng.choices(vocabulary, weights=weights, k=n)
+
+    originals, notes = [], []
+    for _ in range(note_n):
+        if originals and rng.random() < duplicate_share:
+            edit_rate = rng.choice([0.01, 0.03, 0.05, 0.1, 0.2, 0.3])
+            edited = []
+            for word in rng.choice(originals).split():
+                roll = rng.random()
+                if roll < edit_rate / 3:
+                    continue
+                edited.append(words(1)[0] if roll < 2 * edit_rate / 3 else word)
+                if roll < edit_rate and roll >= 2 * edit_rate / 3:
+                    edited.extend(words(1))
+            notes.append(" ".join(edited))
+        else:
+            note = " ".join(words(rng.randint(10, 80)))
+            originals.append(note)
+            notes.append(note)
+    return notes
+
+
+def exhaustive(notes, threshold):
+    """The previous remove_similar_dicts loop, every note against every kept note"""
+    kept = []
+    for note in notes:
+        if not any(string_similarity(note, other) > threshold for other in kept):
+            kept.append(note)
+    return kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark near duplicate removal")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--duplicate-share", type=float, default=0.2)
+    parser.add_argument(
+        "--exhaustive-max", type=int, default=1000,
+        help="largest size the exhaustive scan runs for, it grows quadratically",
+    )
+    args = parser.parse_args()
+
+    print(f"{'notes':>8} {'mode':>11} {'seconds':>10} {'kept':>8} {'same':>6}")
+    for n in args.sizes:
+        notes = make_notes(n, args.duplicate_share)
+
+        start = time.perf_counter()
+        kept, _ = remove_near_duplicates(notes, key=lambda note: note, threshold=args.threshold)
+        seconds = time.perf_counter() - start
+
+        if n <= args.exhaustive_max:
+            start = time.perf_counter()
+            expected = exhaustive(notes, args.threshold)
+            exhaustive_seconds = time.perf_counter() - start
+            print(f"{n:>8} {'exhaustive':>11} {exhaustive_seconds:>10.2f} {len(expected):>8} {'-':>6}")
+            same = "yes" if kept == expected else "no"
+        else:
+            print(f"{n:>8} {'exhaustive':>11} {'skipped':>10} {'-':>8} {'-':>6}")
+            same = "-"
+        print(f"{n:>8} {'minhash':>11} {seconds:>10.2f} {len(kept):>8} {same:>6}")
+
+
+if __name__ == "__main__":
+    main()
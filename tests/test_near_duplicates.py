@@ -0,0 +1,44 @@
+import random
+
+from lpm_kernel.L2.data_pipeline.data_prep.diversity.utils import (
+    remove_similar_dicts,
+    string_similarity,
+)
+
+
+def make_notes(note_n, duplicate_share=0.3, seed=0):
+    """Notes of random words, duplicates copy an earlier note with a few word edits"""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+        for _ in range(2000)
+    ]
+    notes = []
+    for _ in range(note_n):
+        if notes and rng.random() < duplicate_share:
+            words = rng.choice(notes).split()
+            for _ in range(rng.randint(0, max(1, len(words) // 4))):
+                words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            notes.append(" ".join(words))
+        else:
+            notes.append(" ".join(rng.choices(vocabulary, k=rng.randint(3, 30))))
+    return notes
+
+
+def exhaustive(notes, threshold):
+    """Every note against every kept note, what remove_similar_dicts used to do"""
+    kept = []
+    for note in notes:
+        if not any(string_similarity(note, other) > threshold for other in kept):
+            kept.append(note)
+    return kept
+
+
+def test_remove_similar_dicts_keeps_the_exhaustive_scan_notes():
+    notes = make_notes(120)
+
+    kept, duplicates = remove_similar_dicts([{"content": note} for note in notes])
+
+    expected = exhaustive(notes, 0.6)
+    assert [item["content"] for item in kept] == expected
+    assert duplicates == len(notes) - len(expected)